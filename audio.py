@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# Galactic Defenders - Audio Module
+# Preloaded sound samples mixed on a background thread
+
+import atexit
+import math
+import os
+import random
+import shutil
+import subprocess
+import threading
+import time
+import wave
+from array import array
+from collections import deque
+
+SAMPLE_RATE = 22050
+BLOCK_FRAMES = 512            # ~23 ms of audio per mixed block
+MAX_VOICES = 8                # Sounds that can play at the same time
+
+# Environment variable choosing the output: "device", "null" or "wav:<path>"
+AUDIO_SINK_ENV = "GALACTIC_AUDIO"
+
+def _sweep(start_hz, end_hz, duration, volume=0.3, square=True):
+    """Synthesize a pitch sweep with a linear fade-out as 16-bit samples."""
+    count = int(SAMPLE_RATE * duration)
+    samples = array("h", bytes(2 * count))
+    phase = 0.0
+    for i in range(count):
+        t = i / count
+        phase += 2 * math.pi * (start_hz + (end_hz - start_hz) * t) / SAMPLE_RATE
+        wave_value = math.sin(phase)
+        if square:
+            wave_value = 1.0 if wave_value >= 0 else -1.0
+        samples[i] = int(wave_value * volume * (1 - t) * 32767)
+    return samples
+
+def _noise(duration, volume=0.4, seed=7):
+    """Synthesize a decaying noise burst as 16-bit samples."""
+    rng = random.Random(seed)
+    count = int(SAMPLE_RATE * duration)
+    return array("h", (int(rng.uniform(-1, 1) * volume * (1 - i / count) ** 2 * 32767)
+                       for i in range(count)))
+
+def build_samples():
+    """Synthesize every game sound once. Returns {name: array of 16-bit samples}."""
+    return {
+        "player_shoot": _sweep(1200, 600, 0.08),
+        "enemy_shoot": _sweep(500, 300, 0.10, volume=0.2),
+        "enemy_descend": _sweep(110, 90, 0.12, volume=0.25),
+        "player_hit": _sweep(220, 60, 0.25, volume=0.35, square=False),
+        "explosion": _noise(0.3),
+    }
+
+class NullSink:
+    """Discards audio (used when no output device is available)."""
+
+    def __init__(self):
+        self.frames_written = 0
+
+    def write(self, block):
+        self.frames_written += len(block)
+
+    def close(self):
+        pass
+
+class WavFileSink:
+    """Records the mixed audio to a mono 16-bit WAV file."""
+
+    def __init__(self, path):
+        self.frames_written = 0
+        self._wav = wave.open(path, "wb")
+        self._wav.setnchannels(1)
+        self._wav.setsampwidth(2)
+        self._wav.setframerate(SAMPLE_RATE)
+
+    def write(self, block):
+        self._wav.writeframes(block.tobytes())
+        self.frames_written += len(block)
+
+    def close(self):
+        self._wav.close()
+
+class AplayDeviceSink:
+    """Streams raw PCM to the ALSA `aplay` command (Linux)."""
+
+    def __init__(self):
+        self.frames_written = 0
+        self._process = subprocess.Popen(
+            ["aplay", "-q", "-t", "raw", "-f", "S16_LE", "-r", str(SAMPLE_RATE), "-c", "1"],
+            stdin=subprocess.PIPE, stderr=subprocess.DEVNULL
+        )
+
+    def write(self, block):
+        self._process.stdin.write(block.tobytes())
+        self.frames_written += len(block)
+
+    def close(self):
+        try:
+            self._process.stdin.close()
+        except OSError:
+            pass
+        self._process.wait(timeout=2)
+
+def open_default_sink():
+    """
+    Pick an audio output from $GALACTIC_AUDIO ("device", "null" or "wav:<path>").
+
+    Without the variable, `aplay` is used when available and audio is
+    otherwise discarded.
+    """
+    choice = os.environ.get(AUDIO_SINK_ENV, "device")
+    if choice.startswith("wav:"):
+        return WavFileSink(choice[4:])
+    if choice == "device" and shutil.which("aplay"):
+        try:
+            return AplayDeviceSink()
+        except OSError:
+            pass
+    return NullSink()
+
+class SoundMixer:
+    """
+    Mixes sound effects on a dedicated thread.
+
+    play() is all the game loop calls: it checks the per-sound rate limit
+    and appends the name to a deque (append/popleft are atomic, so no lock
+    is taken), which costs a few microseconds. The mixer thread drains the
+    deque once per block, mixes the active voices and writes the block to
+    the sink at real-time pace.
+
+    Example usage:
+        mixer = SoundMixer(build_samples(), NullSink())
+        mixer.start()
+        mixer.play("player_shoot")
+    """
+
+    def __init__(self, samples, sink, min_interval=0.04, max_per_sound=3):
+        """
+        Initialize the mixer.
+
+        Args:
+            samples (dict): Sound name -> array of 16-bit samples
+            sink: Object with write(block) and close()
+            min_interval (float): Seconds before the same sound may start again
+            max_per_sound (int): Copies of one sound that may overlap
+        """
+        self.samples = samples
+        self.sink = sink
+        self.min_interval = min_interval
+        self.max_per_sound = max_per_sound
+
+        self._triggers = deque()
+        self._last_trigger = {}
+        self._voices = []         # [name, samples, position] being played
+        self._running = False
+        self._thread = None
+
+        self.triggered = 0        # Sounds accepted by play()
+        self.rate_limited = 0     # Sounds rejected by the rate limit
+
+    def start(self):
+        """Start the mixing thread."""
+        if self._thread is None:
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name="sound-mixer", daemon=True)
+            self._thread.start()
+        return self
+
+    def play(self, name):
+        """
+        Trigger a sound from the game loop.
+
+        Returns:
+            bool: False if the sound is unknown or was rate-limited
+        """
+        if name not in self.samples:
+            return False
+        now = time.monotonic()
+        if now - self._last_trigger.get(name, -1.0) < self.min_interval:
+            self.rate_limited += 1
+            return False
+        self._last_trigger[name] = now
+        self._triggers.append(name)
+        self.triggered += 1
+        return True
+
+    def mix_block(self, frames=BLOCK_FRAMES):
+        """Start queued sounds, mix one block of audio and return it."""
+        # Start triggered sounds, respecting the overlap limits
+        while self._triggers:
+            name = self._triggers.popleft()
+            playing = sum(1 for voice in self._voices if voice[0] == name)
+            if playing < self.max_per_sound and len(self._voices) < MAX_VOICES:
+                self._voices.append([name, self.samples[name], 0])
+
+        mixed = [0] * frames
+        still_playing = []
+        for voice in self._voices:
+            name, samples, position = voice
+            chunk = samples[position:position + frames]
+            for i, value in enumerate(chunk):
+                mixed[i] += value
+            voice[2] = position + len(chunk)
+            if voice[2] < len(samples):
+                still_playing.append(voice)
+        self._voices = still_playing
+
+        # Clip to the 16-bit range
+        return array("h", (32767 if v > 32767 else -32768 if v < -32768 else v for v in mixed))
+
+    def _run(self):
+        """Mixer thread: produce one block per block duration."""
+        block_seconds = BLOCK_FRAMES / SAMPLE_RATE
+        next_block = time.monotonic()
+        while self._running:
+            try:
+                self.sink.write(self.mix_block())
+            except (OSError, ValueError):
+                # Output went away (e.g. device unplugged) - keep mixing silently
+                self.sink = NullSink()
+            next_block += block_seconds
+            delay = next_block - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_block = time.monotonic()  # Fell behind; don't try to catch up
+
+    def close(self):
+        """Stop the mixing thread and close the sink."""
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.sink.close()
+
+_mixer = None
+_mixer_lock = threading.Lock()
+
+def get_mixer():
+    """
+    Return the game's shared SoundMixer, creating and starting it on first use.
+
+    Samples are synthesized once here; the splash screen calls this on a
+    background thread so the work is done before the game starts.
+    """
+    global _mixer
+    with _mixer_lock:
+        if _mixer is None:
+            _mixer = SoundMixer(build_samples(), open_default_sink()).start()
+            atexit.register(_mixer.close)
+        return _mixer
@@ -0,0 +1,571 @@
+#!/usr/bin/env python3
+# Galactic Defenders - Batching Canvas Module
+# Canvas wrapper that sends a frame's item updates to Tcl in one script
+
+import re
+import tkinter
+
+# Options that only change colours, so they don't move an item's bounding box
+_COSMETIC_OPTIONS = {"fill", "activefill", "disabledfill", "stipple", "activestipple",
+                     "disabledstipple", "activeoutline", "disabledoutline"}
+
+# Canvas methods that change which items carry which tags
+_TAG_CHANGING = {"addtag", "addtag_above", "addtag_all", "addtag_below", "addtag_closest",
+                 "addtag_enclosed", "addtag_overlapping", "addtag_withtag", "dtag"}
+
+# Options measured in pixels, which are scaled along with the coordinates
+# (line/outline width and text wrap length; fonts have their own rule)
+_SIZE_OPTIONS = {"width", "font"}
+
+_TCL_SPECIAL = re.compile(r'([\\\[\]{}$"; \t])')
+_TCL_PLAIN = re.compile(r"^[\w#%+,\-./:@=]+$")
+
+class _Item:
+    """What the wrapper knows about one canvas item."""
+    __slots__ = ("type", "coords", "options", "tags", "bbox", "sizes")
+
+    def __init__(self, item_type, coords, options, tags):
+        self.type = item_type
+        self.coords = coords      # List of floats, or None if unknown
+        self.options = options    # Option name -> value as Tk would return it
+        self.tags = tags          # Tuple of tags, or None if unknown
+        self.bbox = None          # Cached bbox() answer (None = ask Tk)
+        self.sizes = None         # World font/width options to rescale, if any
+
+class BatchingCanvas:
+    """
+    Drop-in wrapper around tk.Canvas that batches item updates.
+
+    move/coords/itemconfig/delete calls on item ids are queued and sent at
+    the end of the frame as a single Tcl script (one Python->Tcl round trip
+    instead of hundreds). Several updates to the same item are merged into
+    one: moves add up, the last coords wins and options are merged. The flush
+    happens when flush() is called, or automatically when Tk goes idle.
+
+    Reads of coords, bbox, type, gettags and itemcget are answered from a
+    shadow copy of each item when possible. Anything the wrapper doesn't
+    batch or cache (tag-wide operations, find_*, widget methods) first
+    flushes the queue and then goes straight to the real canvas, so the
+    order of operations is always preserved.
+
+    The caller works in world coordinates. With a world_size, fit() maps the
+    world onto the real canvas size (uniform scale, centered), e.g. an
+    800x600 world on a 1920x1080 display. Tk rescales the existing items
+    itself (one `scale all` command); after that the transform is applied
+    to the numbers while the batch script is formatted, so a frame costs
+    the same at any resolution and the shadow copies stay in world units.
+
+    Example usage:
+        canvas = BatchingCanvas(tk.Canvas(master, width=800, height=600))
+        canvas.move(bullet_id, 0, -10)       # queued
+        canvas.coords(bullet_id)             # answered from the shadow copy
+        canvas.flush()                       # one Tcl script for the frame
+    """
+
+    def __init__(self, canvas, world_size=None):
+        """
+        Wrap a canvas.
+
+        Args:
+            canvas: A tk.Canvas, or any object with the same item methods
+                (e.g. headless.HeadlessCanvas, which gets the updates replayed
+                as ordinary method calls)
+            world_size (tuple): (width, height) of the world coordinates that
+                fit() scales to the canvas, or None to draw 1:1
+        """
+        self.canvas = canvas
+        self.world_size = world_size
+        self.view_scale = 1.0       # Screen pixels per world unit
+        self.view_x = 0.0           # Screen position of the world's origin
+        self.view_y = 0.0
+        self._items = {}            # item id -> _Item
+        self._pending = {}          # item id -> [dx, dy, coords, options]
+        self._deleted = []          # item ids to delete
+        self._flush_scheduled = False
+        self._tcl = getattr(canvas, "tk", None)
+        self._path = str(canvas)
+        self.stats = {"queued": 0, "sent": 0, "flushes": 0, "cached_reads": 0, "tk_reads": 0}
+
+    def __str__(self):
+        return str(self.canvas)
+
+    # Item creation (immediate: the caller needs the new id)
+
+    def _create(self, item_type, args, options):
+        coords = [float(value) for value in _flatten(args)]
+        if self._scaled():
+            item_id = getattr(self.canvas, "create_" + item_type)(
+                *self._to_screen(coords), **self._screen_options(options))
+        else:
+            item_id = getattr(self.canvas, "create_" + item_type)(*args, **options)
+        tags = options.get("tags", ())
+        item = self._items[item_id] = _Item(
+            item_type,
+            coords,
+            {name: value for name, value in options.items() if isinstance(value, str)},
+            tuple(tags.split()) if isinstance(tags, str) else tuple(tags)
+        )
+        _remember_sizes(item, options)
+        return item_id
+
+    def create_arc(self, *args, **options):
+        return self._create("arc", args, options)
+
+    def create_line(self, *args, **options):
+        return self._create("line", args, options)
+
+    def create_oval(self, *args, **options):
+        return self._create("oval", args, options)
+
+    def create_polygon(self, *args, **options):
+        return self._create("polygon", args, options)
+
+    def create_rectangle(self, *args, **options):
+        return self._create("rectangle", args, options)
+
+    def create_text(self, *args, **options):
+        return self._create("text", args, options)
+
+    def create_window(self, *args, **options):
+        return self._create("window", args, options)
+
+    def create_image(self, *args, **options):
+        return self._create("image", args, options)
+
+    # Batched writes
+
+    def _queue(self, item_id):
+        """Return the pending update for an item, scheduling a flush if needed."""
+        self.stats["queued"] += 1
+        update = self._pending.get(item_id)
+        if update is None:
+            update = self._pending[item_id] = [0, 0, None, None]
+            if not self._flush_scheduled:
+                self._flush_scheduled = True
+                self.canvas.after_idle(self._idle_flush)
+        return update
+
+    def move(self, tag_or_id, dx, dy):
+        item_id = _item_id(tag_or_id)
+        if item_id is None:
+            return self._tag_write("move", tag_or_id, dx, dy)
+        update = self._queue(item_id)
+        item = self._items.get(item_id)
+        if item is not None:
+            item.bbox = None   # Even when the coords aren't cached
+        if item is not None and item.coords is not None:
+            coords = item.coords
+            for i in range(0, len(coords) - 1, 2):
+                coords[i] += dx
+                coords[i + 1] += dy
+            if update[2] is not None:
+                update[2] = list(coords)   # Fold the move into the queued coords
+                return
+        update[0] += dx
+        update[1] += dy
+
+    def coords(self, tag_or_id, *args):
+        item_id = _item_id(tag_or_id)
+        if not args:
+            item = self._items.get(item_id) if item_id is not None else None
+            if item is not None and item.coords is not None:
+                self.stats["cached_reads"] += 1
+                return list(item.coords)
+            self.flush()
+            self.stats["tk_reads"] += 1
+            coords = self.canvas.coords(tag_or_id)
+            if self._scaled():
+                coords = self._to_world(coords)
+            if item is not None:
+                item.coords = list(coords)
+            return coords
+        if item_id is None:
+            return self._tag_write("coords", tag_or_id, *args)
+
+        coords = [float(value) for value in _flatten(args)]
+        update = self._queue(item_id)
+        update[0] = update[1] = 0     # Earlier moves are superseded
+        update[2] = coords
+        item = self._items.get(item_id)
+        if item is not None:
+            item.coords = list(coords)
+            item.bbox = None
+
+    def itemconfig(self, tag_or_id, cnf=None, **options):
+        if cnf:
+            options = dict(cnf, **options)
+        item_id = _item_id(tag_or_id)
+        if not options or item_id is None:
+            # Queries and tag-wide changes go to Tk directly
+            return self._tag_write("itemconfig", tag_or_id, **options) if options \
+                else self._passthrough("itemconfig", tag_or_id)
+
+        update = self._queue(item_id)
+        update[3] = dict(update[3] or {}, **options)
+        item = self._items.get(item_id)
+        if item is not None:
+            _remember_sizes(item, options)
+            for name, value in options.items():
+                name = name.rstrip("_")
+                old = item.options.get(name)
+                if name not in _COSMETIC_OPTIONS and not (
+                        name == "outline" and old and isinstance(value, str) and value):
+                    item.bbox = None
+                if name == "tags":
+                    item.tags = tuple(value.split()) if isinstance(value, str) else tuple(value)
+                if isinstance(value, str):
+                    item.options[name] = value
+                else:
+                    item.options.pop(name, None)   # Tk may format it differently; ask it
+
+    itemconfigure = itemconfig
+
+    def delete(self, *tags_or_ids):
+        for tag_or_id in tags_or_ids:
+            item_id = _item_id(tag_or_id)
+            if item_id is None:
+                self._tag_write("delete", tag_or_id)
+                continue
+            self._pending.pop(item_id, None)
+            self._items.pop(item_id, None)
+            self._deleted.append(item_id)
+            self.stats["queued"] += 1
+            if not self._flush_scheduled:
+                self._flush_scheduled = True
+                self.canvas.after_idle(self._idle_flush)
+
+    # Cached reads
+
+    def bbox(self, *tags_or_ids):
+        item_id = _item_id(tags_or_ids[0]) if len(tags_or_ids) == 1 else None
+        item = self._items.get(item_id) if item_id is not None else None
+        if item is not None and item.bbox is not None:
+            self.stats["cached_reads"] += 1
+            return item.bbox
+        self.flush()
+        self.stats["tk_reads"] += 1
+        bbox = self.canvas.bbox(*tags_or_ids)
+        if bbox and self._scaled():
+            bbox = tuple(self._to_world(bbox))
+        if item is not None and bbox:
+            item.bbox = bbox
+        return bbox
+
+    def type(self, tag_or_id):
+        item_id = _item_id(tag_or_id)
+        item = self._items.get(item_id) if item_id is not None else None
+        if item is not None:
+            self.stats["cached_reads"] += 1
+            return item.type
+        self.flush()
+        self.stats["tk_reads"] += 1
+        return self.canvas.type(tag_or_id)
+
+    def gettags(self, tag_or_id):
+        item_id = _item_id(tag_or_id)
+        item = self._items.get(item_id) if item_id is not None else None
+        if item is not None and item.tags is not None:
+            self.stats["cached_reads"] += 1
+            return item.tags
+        self.flush()
+        self.stats["tk_reads"] += 1
+        return self.canvas.gettags(tag_or_id)
+
+    def itemcget(self, tag_or_id, option):
+        item_id = _item_id(tag_or_id)
+        item = self._items.get(item_id) if item_id is not None else None
+        if item is not None and option in item.options:
+            self.stats["cached_reads"] += 1
+            return item.options[option]
+        self.flush()
+        self.stats["tk_reads"] += 1
+        value = self.canvas.itemcget(tag_or_id, option)
+        if item is not None and isinstance(value, str):
+            item.options[option] = value
+        return value
+
+    # Flushing
+
+    def _idle_flush(self):
+        self.flush()
+
+    def flush(self):
+        """Send every queued update to the canvas."""
+        # The next write schedules a new idle flush, even if the pending one
+        # was cancelled (e.g. by a restart cancelling every after() callback)
+        self._flush_scheduled = False
+        if not self._pending and not self._deleted:
+            return
+        pending, deleted = self._pending, self._deleted
+        self._pending = {}
+        self._deleted = []
+        self.stats["flushes"] += 1
+
+        if self._tcl is None or not hasattr(self._tcl, "eval"):
+            self._replay(pending, deleted)
+            return
+
+        path = self._path
+        scaled = self._scaled()
+        scale = self.view_scale
+        commands = []
+        for item_id, (dx, dy, coords, options) in pending.items():
+            if coords is not None:
+                if scaled:
+                    coords = self._to_screen(coords)
+                commands.append(f"{path} coords {item_id} {_tcl_numbers(coords)}")
+            if dx or dy:
+                if scaled:
+                    dx, dy = dx * scale, dy * scale
+                commands.append(f"{path} move {item_id} {_tcl_number(dx)} {_tcl_number(dy)}")
+            if options:
+                if scaled:
+                    options = self._screen_options(options)
+                commands.append(f"{path} itemconfigure {item_id} {_tcl_options(options)}")
+        if deleted:
+            commands.append(f"{path} delete {' '.join(map(str, deleted))}")
+        self.stats["sent"] += len(commands)
+
+        try:
+            self._tcl.eval("\n".join(commands))
+        except tkinter.TclError:
+            # The canvas was destroyed with updates still queued: drop them
+            try:
+                exists = self.canvas.winfo_exists()
+            except tkinter.TclError:
+                exists = False
+            if not exists:
+                return
+            raise
+
+    def _replay(self, pending, deleted):
+        """Apply queued updates through ordinary method calls (canvases without Tcl)."""
+        canvas = self.canvas
+        scaled = self._scaled()
+        scale = self.view_scale
+        for item_id, (dx, dy, coords, options) in pending.items():
+            if coords is not None:
+                canvas.coords(item_id, *(self._to_screen(coords) if scaled else coords))
+                self.stats["sent"] += 1
+            if dx or dy:
+                canvas.move(item_id, dx * scale, dy * scale)
+                self.stats["sent"] += 1
+            if options:
+                canvas.itemconfig(item_id, **(self._screen_options(options) if scaled else options))
+                self.stats["sent"] += 1
+        if deleted:
+            canvas.delete(*deleted)
+            self.stats["sent"] += 1
+
+    # World -> screen transform
+
+    def _scaled(self):
+        return self.view_scale != 1.0 or self.view_x or self.view_y
+
+    def _to_screen(self, coords):
+        """Map a flat list of world x, y values to screen pixels."""
+        scale, x0, y0 = self.view_scale, self.view_x, self.view_y
+        screen = []
+        pairs = iter(coords)
+        for x, y in zip(pairs, pairs):
+            screen += (x0 + x * scale, y0 + y * scale)
+        return screen
+
+    def _to_world(self, coords):
+        """Map a flat list of screen x, y values back to world units."""
+        scale, x0, y0 = self.view_scale, self.view_x, self.view_y
+        return [(value - (x0 if i % 2 == 0 else y0)) / scale for i, value in enumerate(coords)]
+
+    def _screen_options(self, options):
+        """Scale the font size and pixel widths in a set of item options."""
+        if not _SIZE_OPTIONS.intersection(options):
+            return options
+        options = dict(options)
+        for name in _SIZE_OPTIONS.intersection(options):
+            options[name] = _scale_size(name, options[name], self.view_scale)
+        return options
+
+    def to_screen(self, x, y):
+        """The screen pixel position of a world point (e.g. to place a widget)."""
+        return (self.view_x + x * self.view_scale, self.view_y + y * self.view_scale)
+
+    def to_world(self, x, y):
+        """The world position of a screen pixel (e.g. a mouse event)."""
+        return ((x - self.view_x) / self.view_scale, (y - self.view_y) / self.view_scale)
+
+    def set_view(self, scale, x=0.0, y=0.0):
+        """
+        Change the world -> screen transform: screen = (x, y) + world * scale.
+
+        Existing items are moved and scaled by Tk in two tag-wide commands;
+        only items with a font or a pixel width get their options rescaled.
+
+        Args:
+            scale (float): Screen pixels per world unit
+            x, y (float): Screen position of the world's origin
+        """
+        if (scale, x, y) == (self.view_scale, self.view_x, self.view_y):
+            return
+        self.flush()
+        ratio = scale / self.view_scale
+        # new = (x, y) + (old - (view_x, view_y)) * ratio
+        self.canvas.scale("all", 0, 0, ratio, ratio)
+        self.canvas.move("all", x - self.view_x * ratio, y - self.view_y * ratio)
+        self.view_scale, self.view_x, self.view_y = scale, x, y
+        for item_id, item in self._items.items():
+            item.bbox = None
+            if item.sizes:
+                update = self._queue(item_id)
+                update[3] = dict(update[3] or {}, **item.sizes)
+        self.flush()
+
+    def fit(self, width, height):
+        """
+        Scale the world to fill a canvas of width x height pixels.
+
+        The scale is uniform, so the world keeps its aspect ratio and is
+        centered with black bars on the longer side.
+        """
+        if self.world_size is None or width <= 1 or height <= 1:
+            return
+        world_width, world_height = self.world_size
+        scale = min(width / world_width, height / world_height)
+        self.set_view(scale, (width - world_width * scale) / 2, (height - world_height * scale) / 2)
+
+    # Everything else
+
+    def _tag_write(self, method, tag_or_id, *args, **options):
+        """Run a write that may touch several items, keeping the shadow copies honest."""
+        self.flush()
+        if self._scaled():
+            # Send screen units to Tk; the shadow copies below stay in world units
+            if method == "move":
+                screen_args = (args[0] * self.view_scale, args[1] * self.view_scale)
+            elif method == "coords":
+                screen_args = self._to_screen([float(value) for value in _flatten(args)])
+            else:
+                screen_args = args
+            result = getattr(self.canvas, method)(tag_or_id, *screen_args,
+                                                  **self._screen_options(options))
+        else:
+            result = getattr(self.canvas, method)(tag_or_id, *args, **options)
+        if tag_or_id == "all":
+            items = list(self._items)
+        else:
+            items = [item_id for item_id, item in self._items.items()
+                     if item.tags is None or tag_or_id in item.tags]
+        for item_id in items:
+            if method == "delete":
+                del self._items[item_id]
+                continue
+            item = self._items[item_id]
+            item.bbox = None
+            if method == "move" and item.tags is not None and item.coords is not None:
+                for i in range(0, len(item.coords) - 1, 2):
+                    item.coords[i] += args[0]
+                    item.coords[i + 1] += args[1]
+            elif method == "itemconfig":
+                # Forget the options; they will be read back from Tk
+                item.options = {}
+                _remember_sizes(item, options)
+                if "tags" in options:
+                    item.tags = None
+            else:
+                item.coords = None
+        return result
+
+    def _passthrough(self, method, *args, **options):
+        self.flush()
+        if method in _TAG_CHANGING:
+            for item in self._items.values():
+                item.tags = None
+        return getattr(self.canvas, method)(*args, **options)
+
+    def __getattr__(self, name):
+        attribute = getattr(self.canvas, name)
+        if not callable(attribute):
+            return attribute
+
+        def call(*args, **options):
+            return self._passthrough(name, *args, **options)
+        return call
+
+def _remember_sizes(item, options):
+    """Keep the world value of an item's font and width options for rescaling."""
+    for name in _SIZE_OPTIONS.intersection(options):
+        if item.sizes is None:
+            item.sizes = {}
+        item.sizes[name] = options[name]
+
+def _scale_size(name, value, scale):
+    """Scale a font (family, size, ...) or a pixel width."""
+    if name == "font":
+        if isinstance(value, (list, tuple)) and len(value) > 1 and isinstance(value[1], int):
+            # Negative sizes are pixels, positive are points; both scale
+            size = round(value[1] * scale) or (1 if value[1] > 0 else -1)
+            return (value[0], size) + tuple(value[2:])
+        return value
+    if isinstance(value, (int, float)):
+        return value * scale
+    if isinstance(value, str):
+        try:
+            return float(value) * scale
+        except ValueError:
+            return value
+    return value
+
+def _item_id(tag_or_id):
+    """Return the item id if tag_or_id names a single item, else None."""
+    if isinstance(tag_or_id, int):
+        return tag_or_id
+    if isinstance(tag_or_id, str) and tag_or_id.isdigit():
+        return int(tag_or_id)
+    return None
+
+def _flatten(values):
+    for value in values:
+        if isinstance(value, (list, tuple)):
+            yield from _flatten(value)
+        else:
+            yield value
+
+def _tcl_number(value):
+    return repr(float(value)) if isinstance(value, float) else str(int(value))
+
+def _tcl_numbers(values):
+    return " ".join(_tcl_number(value) for value in values)
+
+def _tcl_element(value):
+    """Quote one value as a Tcl word."""
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, (int, float)):
+        return _tcl_number(value)
+    if isinstance(value, (list, tuple)):
+        return _tcl_element(" ".join(_tcl_list_element(v) for v in value))
+    value = str(value)
+    if _TCL_PLAIN.match(value):
+        return value
+    if not value:
+        return "{}"
+    return _TCL_SPECIAL.sub(r"\\\1", value).replace("\n", "\\n")
+
+def _tcl_list_element(value):
+    """Quote one element of a Tcl list (e.g. a font family with spaces)."""
+    if isinstance(value, (int, float, bool)):
+        return _tcl_element(value)
+    value = str(value)
+    if _TCL_PLAIN.match(value):
+        return value
+    if "{" in value or "}" in value or "\\" in value:
+        return _TCL_SPECIAL.sub(r"\\\1", value)
+    return "{" + value + "}"
+
+def _tcl_options(options):
+    words = []
+    for name, value in options.items():
+        if value is None:
+            continue
+        words.append("-" + name.rstrip("_"))
+        words.append(_tcl_element(value))
+    return " ".join(words)
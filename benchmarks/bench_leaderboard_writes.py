@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# Galactic Defenders - Leaderboard Write Benchmark
+# Measures score submissions per second with and without write-behind
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from leaderboard import LeaderboardManager
+
+def run_writers(lm, writers, scores_per_writer, seed=1234):
+    """Submit scores from several threads at once, like cabinets finishing together."""
+    def writer(index):
+        rng = random.Random(seed + index)
+        for i in range(scores_per_writer):
+            lm.submit_score(f"Cab{index}P{i}", rng.randint(0, 50000), rng.randint(1, 20))
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    submitted = time.perf_counter() - start
+
+    # Time until every score is durable on disk
+    lm.flush()
+    durable = time.perf_counter() - start
+    return submitted, durable
+
+def bench(write_behind, writers, scores_per_writer):
+    """Run one configuration against a fresh database and return its results."""
+    with tempfile.TemporaryDirectory() as tmp:
+        lm = LeaderboardManager(os.path.join(tmp, "bench.db"), write_behind=write_behind)
+        submitted, durable = run_writers(lm, writers, scores_per_writer)
+        total = writers * scores_per_writer
+        stored = sum(1 for _ in lm.iter_scores())
+        lm.close()
+
+    assert stored == total, f"expected {total} rows, found {stored}"
+    return {
+        "mode": "write-behind" if write_behind else "synchronous",
+        "scores": total,
+        "submit_per_sec": total / submitted,
+        "durable_per_sec": total / durable,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Leaderboard write throughput benchmark")
+    parser.add_argument("--writers", type=int, default=8, help="concurrent submitting threads")
+    parser.add_argument("--scores", type=int, default=250, help="scores per writer")
+    args = parser.parse_args()
+
+    print(f"{'mode':<14} {'scores':>7} {'submit/s':>12} {'durable/s':>12}")
+    for write_behind in (False, True):
+        result = bench(write_behind, args.writers, args.scores)
+        print(f"{result['mode']:<14} {result['scores']:>7} "
+              f"{result['submit_per_sec']:>12.0f} {result['durable_per_sec']:>12.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# Galactic Defenders - Render Benchmark
+# Drives GameScreen on a real Tk canvas and reports FPS, frame latency and Tk calls
+#
+# Needs a display. On a headless Linux box it starts Xvfb itself when the
+# Xvfb binary is installed, or run it under xvfb-run:
+#   xvfb-run -s "-screen 0 1920x1080x24" python benchmarks/bench_render.py
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import tkinter as tk
+
+# Entity counts to escalate through: formation size and player bullets kept in flight
+STAGES = [
+    {"rows": 5, "cols": 10, "bullets": 5},
+    {"rows": 8, "cols": 15, "bullets": 10},
+    {"rows": 10, "cols": 20, "bullets": 20},
+    {"rows": 12, "cols": 30, "bullets": 40},
+]
+
+# Upper edges (ms) of the frame-time histogram buckets; the last bucket is open
+HISTOGRAM_BUCKETS = [8, 16, 20, 33, 50, 100]
+
+class _CountingTcl:
+    """Wraps a Tcl interpreter and counts the calls a canvas makes through it."""
+
+    def __init__(self, real, widget_path, counts):
+        self._real = real
+        self._path = widget_path
+        self._counts = counts
+
+    def call(self, *args):
+        if args and args[0] == self._path and len(args) > 1:
+            self._counts[args[1]] += 1      # e.g. "coords", "move", "itemconfigure"
+        else:
+            self._counts["other"] += 1
+        return self._real.call(*args)
+
+    def eval(self, script):
+        # A batched script from BatchingCanvas: one Tcl round trip
+        self._counts["eval"] += 1
+        return self._real.eval(script)
+
+    def __getattr__(self, name):
+        return getattr(self._real, name)
+
+class CountingCanvas(tk.Canvas):
+    """tk.Canvas that counts every Tcl command it sends, by canvas subcommand."""
+
+    def __init__(self, master=None, **options):
+        super().__init__(master, **options)
+        self.tk_calls = Counter()
+        self.tk = _CountingTcl(self.tk, self._w, self.tk_calls)
+
+    def item_count(self):
+        """Number of canvas items (not counted as a call)."""
+        return len(self.tk._real.splitlist(self.tk._real.call(self._w, "find", "all")))
+
+def start_virtual_display():
+    """
+    Start Xvfb if there is no display.
+
+    Returns:
+        subprocess.Popen: The Xvfb process to stop afterwards, or None
+    """
+    if os.environ.get("DISPLAY") or not sys.platform.startswith("linux"):
+        return None
+    if not shutil.which("Xvfb"):
+        sys.exit("No display and no Xvfb: install xvfb or run under xvfb-run")
+    display = ":%d" % (90 + os.getpid() % 100)
+    process = subprocess.Popen(["Xvfb", display, "-screen", "0", "1920x1080x24", "-nolisten", "tcp"],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.environ["DISPLAY"] = display
+    time.sleep(0.5)  # Give the server a moment to accept connections
+    return process
+
+def scripted_input(game, frame):
+    """Replay the same input every run: sweep left and right, firing constantly."""
+    if frame % 90 == 0:
+        game.set_key_state("left", (frame // 90) % 2 == 0)
+        game.set_key_state("right", (frame // 90) % 2 == 1)
+    if frame % 4 == 0:
+        game.last_shot_time = 0  # Ignore the cooldown so the bullet count stays high
+        game.shoot()
+
+def histogram(values_ms):
+    """Count frame times into HISTOGRAM_BUCKETS. Returns [(label, count)]."""
+    counts = [0] * (len(HISTOGRAM_BUCKETS) + 1)
+    for value in values_ms:
+        index = next((i for i, edge in enumerate(HISTOGRAM_BUCKETS) if value < edge),
+                     len(HISTOGRAM_BUCKETS))
+        counts[index] += 1
+    labels = [f"<{edge} ms" for edge in HISTOGRAM_BUCKETS] + [f">={HISTOGRAM_BUCKETS[-1]} ms"]
+    return list(zip(labels, counts))
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+def run_stage(root, stage, seconds, workdir):
+    """
+    Play one stage under the game's own 16 ms scheduler and measure it.
+
+    Returns:
+        dict: FPS, frame period and update latency statistics, Tk calls per frame
+    """
+    import ui
+    from leaderboard import LeaderboardManager
+
+    saved_canvas = tk.Canvas
+    tk.Canvas = CountingCanvas   # GameScreen looks up tk.Canvas when it builds its canvas
+    try:
+        game = ui.GameScreen(root, "Bench")
+    finally:
+        tk.Canvas = saved_canvas
+    game.leaderboard = LeaderboardManager(os.path.join(workdir, "render.db"))
+    game.player_hit = lambda: None   # Keep the player alive for the whole run
+
+    game.enemy_rows, game.enemy_cols = stage["rows"], stage["cols"]
+    game.enemy_spacing_x = min(game.enemy_spacing_x, 600 / stage["cols"])
+    game.enemy_spacing_y = min(game.enemy_spacing_y, 250 / stage["rows"])
+    game.spawn_enemies()
+    root.update()
+
+    starts, update_ms, items = [], [], []
+    original_update = game.update_game
+
+    def instrumented_update():
+        frame = len(starts)
+        scripted_input(game, frame)
+        # Keep the requested number of player bullets in flight
+        while len(game.bullets) < stage["bullets"] and frame % 4 == 0:
+            before = len(game.bullets)
+            game.last_shot_time = 0
+            game.shoot()
+            if len(game.bullets) == before:
+                break
+        start = time.perf_counter()
+        starts.append(start)
+        original_update()   # Reschedules game.update_game, i.e. this function
+        update_ms.append((time.perf_counter() - start) * 1000)
+        if frame % 30 == 0:
+            items.append(game.canvas.item_count())
+
+    # Swap the instrumented loop in for the one GameScreen already started
+    root.after_cancel(game.game_update_id)
+    game.update_game = instrumented_update
+    game.canvas.tk_calls.clear()
+    game.game_update_id = root.after(16, instrumented_update)
+
+    root.after(int(seconds * 1000), root.quit)
+    root.mainloop()
+
+    game.game_running = False
+    root.after_cancel(game.game_update_id)
+    game.leaderboard.close()
+
+    frames = len(starts)
+    periods_ms = [(b - a) * 1000 for a, b in zip(starts, starts[1:])]
+    calls = sum(game.canvas.tk_calls.values())
+    return {
+        "stage": stage,
+        "frames": frames,
+        "fps": round((frames - 1) / (starts[-1] - starts[0]), 2) if frames > 1 else 0.0,
+        "frame_ms": {"mean": round(sum(periods_ms) / len(periods_ms), 3) if periods_ms else 0.0,
+                     "p50": round(percentile(periods_ms, 0.5), 3),
+                     "p95": round(percentile(periods_ms, 0.95), 3),
+                     "p99": round(percentile(periods_ms, 0.99), 3)},
+        "update_ms": {"mean": round(sum(update_ms) / len(update_ms), 3) if update_ms else 0.0,
+                      "p95": round(percentile(update_ms, 0.95), 3)},
+        "histogram": histogram(periods_ms),
+        "items_per_frame": round(sum(items) / len(items), 1) if items else 0,
+        "tk_calls_per_frame": round(calls / frames, 1) if frames else 0,
+        "top_tk_calls": [(name, round(count / frames, 1))
+                         for name, count in game.canvas.tk_calls.most_common(6)] if frames else [],
+    }
+
+def print_report(results):
+    print(f"{'stage':<22} {'fps':>6} {'p50 ms':>8} {'p95 ms':>8} {'update':>8} "
+          f"{'items':>7} {'tk/frame':>9}")
+    for result in results:
+        stage = result["stage"]
+        label = f"{stage['rows']}x{stage['cols']} +{stage['bullets']} bullets"
+        print(f"{label:<22} {result['fps']:>6.1f} {result['frame_ms']['p50']:>8.2f} "
+              f"{result['frame_ms']['p95']:>8.2f} {result['update_ms']['mean']:>8.2f} "
+              f"{result['items_per_frame']:>7} {result['tk_calls_per_frame']:>9}")
+    for result in results:
+        stage = result["stage"]
+        print(f"\n{stage['rows']}x{stage['cols']}: frame period histogram "
+              f"({result['frames']} frames)")
+        widest = max(count for _, count in result["histogram"]) or 1
+        for label, count in result["histogram"]:
+            print(f"  {label:>9} {count:>6} {'#' * round(40 * count / widest)}")
+        print("  busiest Tk calls/frame: " +
+              ", ".join(f"{name} {count}" for name, count in result["top_tk_calls"]))
+
+def main():
+    parser = argparse.ArgumentParser(description="Tk canvas rendering benchmark")
+    parser.add_argument("--seconds", type=float, default=5.0, help="run time per stage")
+    parser.add_argument("--stages", type=int, default=len(STAGES), help="how many stages to run")
+    parser.add_argument("--resolution", default="800x600",
+                        help="window size, e.g. 1920x1080 (the game world is scaled to fit)")
+    parser.add_argument("--json", help="also write the results as JSON to this file")
+    args = parser.parse_args()
+
+    os.environ.setdefault("GALACTIC_AUDIO", "null")
+    xvfb = start_virtual_display()
+    try:
+        root = tk.Tk()
+        root.geometry(args.resolution)
+        results = []
+        with tempfile.TemporaryDirectory() as workdir:
+            for stage in STAGES[:args.stages]:
+                print(f"Running {stage['rows']}x{stage['cols']} for {args.seconds}s...",
+                      file=sys.stderr)
+                results.append(run_stage(root, stage, args.seconds, workdir))
+        root.destroy()
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+
+    print_report(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"seconds_per_stage": args.seconds, "resolution": args.resolution,
+                       "results": results}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
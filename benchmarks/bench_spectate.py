@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# Galactic Defenders - Spectator Stream Benchmark
+# Measures the bandwidth and per-tick cost of streaming a bot-played game to viewers
+#
+# Usage:
+#   python benchmarks/bench_spectate.py                   # 3 simulated minutes
+#   python benchmarks/bench_spectate.py --minutes 10 --keyframe-every 60 --json spectate.json
+#
+# Every tick is captured, encoded and decoded again, and the decoded frame
+# is checked against the captured one.
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import headless
+import snapshot
+import ui
+from bot import ReferenceBot
+from leaderboard import LeaderboardManager
+from spectate import DeltaDecoder, DeltaEncoder, FrameCapture, KEYFRAME, KEYFRAME_EVERY
+
+TICK_HZ = 60
+LENGTH_PREFIX = 2   # Bytes in front of every message on the wire
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))] if values else 0.0
+
+def run(frames, keyframe_every, seed):
+    """
+    Play a bot game for `frames` ticks and stream every tick.
+
+    Returns:
+        dict: Message sizes, bytes per second per viewer and timings in microseconds
+    """
+    random.seed(seed)
+    root = headless.HeadlessRoot()
+    capture = FrameCapture()
+    encoder = DeltaEncoder(keyframe_every)
+    decoder = DeltaDecoder()
+    keyframes, deltas = [], []
+    capture_us, encode_us, decode_us = [], [], []
+    snapshot_bytes = []
+    with headless.headless_tk(root), tempfile.TemporaryDirectory() as tmp:
+        game = ui.GameScreen(root, "Bench")
+        game.leaderboard = LeaderboardManager(os.path.join(tmp, "bench.db"))
+        game.set_controller(ReferenceBot())
+        for tick in range(frames):
+            if not game.game_running:
+                root.event("<space>")   # Keep playing after game over
+            root.advance(16)
+
+            started = time.perf_counter()
+            frame = capture.capture(game)
+            captured = time.perf_counter()
+            data = encoder.encode(frame)
+            encoded = time.perf_counter()
+            decoded = decoder.decode(data)
+            finished = time.perf_counter()
+            if decoded != frame:
+                raise AssertionError(f"Tick {tick} decoded as {decoded}, expected {frame}")
+
+            capture_us.append((captured - started) * 1e6)
+            encode_us.append((encoded - captured) * 1e6)
+            decode_us.append((finished - encoded) * 1e6)
+            (keyframes if data[0] == KEYFRAME else deltas).append(len(data))
+            if tick % TICK_HZ == 0:
+                snapshot_bytes.append(len(snapshot.encode(game.capture_state())))
+        level, score = game.level, game.score
+        game.leaderboard.close()
+
+    total = sum(keyframes) + sum(deltas) + LENGTH_PREFIX * frames
+    return {
+        "frames": frames,
+        "keyframe_every": keyframe_every,
+        "final_level": level,
+        "final_score": score,
+        "keyframes": len(keyframes),
+        "keyframe_bytes_mean": round(statistics.mean(keyframes), 1),
+        "delta_bytes_mean": round(statistics.mean(deltas), 1) if deltas else 0.0,
+        "delta_bytes_p99": percentile(deltas, 0.99),
+        "delta_bytes_max": max(deltas, default=0),
+        "bytes_per_tick": round(total / frames, 1),
+        "bytes_per_second": round(total / frames * TICK_HZ),
+        "snapshot_bytes_per_second": round(statistics.mean(snapshot_bytes) * TICK_HZ),
+        "capture_us_mean": round(statistics.mean(capture_us), 1),
+        "capture_us_p99": round(percentile(capture_us, 0.99), 1),
+        "encode_us_mean": round(statistics.mean(encode_us), 1),
+        "encode_us_p99": round(percentile(encode_us, 0.99), 1),
+        "decode_us_mean": round(statistics.mean(decode_us), 1),
+        "decode_us_p99": round(percentile(decode_us, 0.99), 1),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Spectator stream bandwidth and encode time")
+    parser.add_argument("--minutes", type=float, default=3.0, help="simulated minutes to play")
+    parser.add_argument("--keyframe-every", type=int, default=KEYFRAME_EVERY,
+                        help="ticks between keyframes")
+    parser.add_argument("--seed", type=int, default=1234, help="random seed")
+    parser.add_argument("--json", help="also write the results as JSON to this file")
+    args = parser.parse_args()
+
+    result = run(int(args.minutes * 60 * TICK_HZ), args.keyframe_every, args.seed)
+    print(f"{result['frames']} ticks (reached level {result['final_level']}), "
+          f"a keyframe every {result['keyframe_every']}")
+    print(f"  keyframes     {result['keyframe_bytes_mean']:>8} bytes")
+    print(f"  deltas        {result['delta_bytes_mean']:>8} bytes mean, "
+          f"{result['delta_bytes_p99']} p99, {result['delta_bytes_max']} max")
+    print(f"  per viewer    {result['bytes_per_second'] / 1024:>8.2f} KB/s at {TICK_HZ} Hz "
+          f"(full snapshots every tick: {result['snapshot_bytes_per_second'] / 1024:.1f} KB/s)")
+    print(f"  capture       {result['capture_us_mean']:>8} us mean, {result['capture_us_p99']} p99")
+    print(f"  encode        {result['encode_us_mean']:>8} us mean, {result['encode_us_p99']} p99")
+    print(f"  decode        {result['decode_us_mean']:>8} us mean, {result['decode_us_p99']} p99")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# Galactic Defenders - Startup Benchmark
+# Measures import time of the game modules and time to the first splash frame
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Child script: run main.py, but stop as soon as the first frame is drawn
+FIRST_FRAME_SCRIPT = """
+import runpy, sys, time, tkinter
+def first_frame_then_exit(self, n=0):
+    self.update()
+    print("FIRST_FRAME", time.time(), flush=True)
+    self.destroy()
+tkinter.Tk.mainloop = first_frame_then_exit
+sys.argv = ["main.py"]
+runpy.run_path("main.py", run_name="__main__")
+"""
+
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+def measure_imports(module="ui"):
+    """
+    Import `module` in a fresh interpreter with -X importtime.
+
+    Returns:
+        tuple: (total cumulative microseconds, list of (cumulative_us, name) for direct imports)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_DIR, capture_output=True, text=True, check=True
+    )
+    entries = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append((int(cumulative_us), len(indent), name))
+
+    # -X importtime prints children before their parent, one level (two
+    # spaces) deeper, so walk back from the module's line to find them
+    index = next(i for i, entry in enumerate(entries) if entry[2] == module)
+    total, depth = entries[index][0], entries[index][1]
+    children = []
+    for cumulative, child_depth, name in reversed(entries[:index]):
+        if child_depth <= depth:
+            break
+        if child_depth == depth + 2:
+            children.append((cumulative, name))
+    return total, sorted(children, reverse=True)
+
+def measure_first_frame():
+    """
+    Start the game and time how long it takes for the splash screen's first frame.
+
+    Returns:
+        float: Milliseconds from process launch to first frame, or None without a display
+    """
+    if sys.platform.startswith("linux") and not os.environ.get("DISPLAY"):
+        return None
+    start = time.time()
+    result = subprocess.run(
+        [sys.executable, "-c", FIRST_FRAME_SCRIPT],
+        cwd=REPO_DIR, capture_output=True, text=True
+    )
+    for line in result.stdout.splitlines():
+        if line.startswith("FIRST_FRAME"):
+            return (float(line.split()[1]) - start) * 1000
+    raise RuntimeError(f"Game did not draw a frame:\n{result.stderr}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Startup time benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="measurements to take (best is reported)")
+    parser.add_argument("--max-import-ms", type=float, default=None,
+                        help="fail if importing ui takes longer than this")
+    parser.add_argument("--max-first-frame-ms", type=float, default=None,
+                        help="fail if the first frame takes longer than this")
+    args = parser.parse_args()
+
+    imports = [measure_imports() for _ in range(args.runs)]
+    import_ms = min(total for total, _ in imports) / 1000
+    print(f"import ui: {import_ms:.1f} ms (best of {args.runs})")
+    for cumulative, name in imports[0][1][:8]:
+        print(f"  {cumulative / 1000:7.1f} ms  {name}")
+
+    frames = [measure_first_frame() for _ in range(args.runs)]
+    if frames[0] is None:
+        first_frame_ms = None
+        print("first frame: skipped (no display; run under xvfb-run)")
+    else:
+        first_frame_ms = min(frames)
+        print(f"first frame: {first_frame_ms:.1f} ms (best of {args.runs})")
+
+    failed = False
+    if args.max_import_ms is not None and import_ms > args.max_import_ms:
+        print(f"FAIL: import time above {args.max_import_ms} ms")
+        failed = True
+    if args.max_first_frame_ms is not None and first_frame_ms is not None \
+            and first_frame_ms > args.max_first_frame_ms:
+        print(f"FAIL: first frame above {args.max_first_frame_ms} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
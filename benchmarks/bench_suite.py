@@ -0,0 +1,459 @@
+#!/usr/bin/env python3
+# Galactic Defenders - Benchmark Suite
+# Times game-loop subsystems and leaderboard queries and checks them against a baseline
+#
+# Usage:
+#   python benchmarks/bench_suite.py                     # run and compare with baseline.json
+#   python benchmarks/bench_suite.py --json results.json # also write machine-readable results
+#   python benchmarks/bench_suite.py --save-baseline     # store this run as the new baseline
+#   xvfb-run python benchmarks/bench_suite.py -k render  # canvas-rendering cases need a display
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import headless
+import ui
+from entities import Bullet
+from leaderboard import LeaderboardManager
+
+BASELINE_PATH = os.path.join(REPO_DIR, "benchmarks", "baseline.json")
+
+# Registered cases: {"name", "function", "params", "needs_display"}
+CASES = []
+
+# Formation sizes the game-loop cases run at (the game itself uses 4-7 x 10)
+FORMATIONS = [{"rows": 5, "cols": 10}, {"rows": 10, "cols": 20}]
+
+def case(name, params=({},), needs_display=False):
+    """
+    Register a benchmark case.
+
+    The decorated function is called once per entry in `params` (as keyword
+    arguments) and returns the mean microseconds per operation.
+    """
+    def register(function):
+        CASES.append({"name": name, "function": function,
+                      "params": list(params), "needs_display": needs_display})
+        return function
+    return register
+
+def case_key(name, params):
+    """Stable identifier for one parameterization, e.g. "tick[cols=10,rows=5]"."""
+    if not params:
+        return name
+    return f"{name}[{','.join(f'{k}={v}' for k, v in sorted(params.items()))}]"
+
+def time_calls(function, iterations, between=None):
+    """
+    Time `iterations` calls of `function`.
+
+    Args:
+        function: Callable to time
+        iterations (int): Number of calls
+        between: Optional callable run (untimed) after every call
+
+    Returns:
+        float: Mean microseconds per call
+    """
+    total = 0.0
+    for _ in range(iterations):
+        start = time.perf_counter()
+        function()
+        total += time.perf_counter() - start
+        if between is not None:
+            between()
+    return total * 1e6 / iterations
+
+@contextlib.contextmanager
+def headless_game(rows=5, cols=10):
+    """
+    Start a GameScreen on a virtual clock with a rows x cols formation.
+
+    Wide formations are packed closer together so they still fit on screen.
+    """
+    root = headless.HeadlessRoot()
+    with headless.headless_tk(root), tempfile.TemporaryDirectory() as tmp:
+        game = ui.GameScreen(root, "Bench")
+        game.leaderboard = LeaderboardManager(os.path.join(tmp, "bench.db"))
+        if (rows, cols) != (game.enemy_rows, game.enemy_cols):
+            game.enemy_rows, game.enemy_cols = rows, cols
+            game.enemy_spacing_x = min(game.enemy_spacing_x, 600 / cols)
+            game.enemy_spacing_y = min(game.enemy_spacing_y, 250 / rows)
+            game.spawn_enemies()
+        try:
+            yield game, root
+        finally:
+            game.leaderboard.close()
+
+def add_player_bullets(game, count):
+    """Put `count` player bullets between the formation and the barriers."""
+    top = game.formation.lowest_y() + 30
+    bottom = game.player_y - 150
+    for _ in range(count):
+        x = random.uniform(20, 780)
+        y = random.uniform(top, bottom)
+        item = game.canvas.create_rectangle(x - 2, y - 10, x + 2, y, fill="#FF0000")
+        game.bullets.append(Bullet(item, 0, -game.player_bullet_speed))
+
+# Game-loop cases
+
+@case("tick", FORMATIONS)
+def bench_tick(rows, cols, ticks=120):
+    """A full simulated frame: every timer due in 16 ms, including update_game()."""
+    with headless_game(rows, cols) as (game, root):
+        total = 0.0
+        for frame in range(ticks):
+            if frame % 5 == 0:
+                root.event("<space>")
+            start = time.perf_counter()
+            root.advance(16)
+            total += time.perf_counter() - start
+        return total * 1e6 / ticks
+
+@case("collisions", [dict(formation, bullets=bullets)
+                     for formation in FORMATIONS for bullets in (5, 30)])
+def bench_collisions(rows, cols, bullets):
+    """check_collisions() with bullets in flight that miss every enemy."""
+    with headless_game(rows, cols) as (game, root):
+        add_player_bullets(game, bullets)
+        return time_calls(game.check_collisions, 20)
+
+@case("barrier_hits", [{"outcome": "miss"}, {"outcome": "hit"}])
+def bench_barrier_hits(outcome):
+    """check_bullet_hit_barrier() for a bullet that misses, or hits the last block."""
+    with headless_game() as (game, root):
+        if outcome == "miss":
+            coords = [400, 100, 404, 110]
+        else:
+            block = game.barrier_blocks[len(game.barrier_blocks) - 1]
+            block.health = 10 ** 6  # Never destroyed, so every call does the same work
+            coords = [block.x - 2, block.y - 2, block.x + 2, block.y + 2]
+        return time_calls(lambda: game.check_bullet_hit_barrier(coords), 200)
+
+@case("shooter_selection", FORMATIONS)
+def bench_shooter_selection(rows, cols):
+    """enemy_shoot(): finding the lowest enemy per column and rolling to fire."""
+    with headless_game(rows, cols) as (game, root):
+        def clear_enemy_bullets():
+            for bullet in game.enemy_bullets:
+                game.canvas.delete(bullet.id)
+            game.enemy_bullets.clear()
+        return time_calls(game.enemy_shoot, 100, between=clear_enemy_bullets)
+
+@case("hud")
+def bench_hud():
+    """update_hud(): refreshing the score, level and shields text."""
+    with headless_game() as (game, root):
+        def update():
+            game.score += 10
+            game.update_hud()
+        return time_calls(update, 1000)
+
+@case("spectate", [{"part": "capture"}, {"part": "encode"}])
+def bench_spectate(part, ticks=120):
+    """One tick of a spectator stream: reading the world, or delta-encoding it."""
+    from spectate import DeltaEncoder, FrameCapture
+    with headless_game() as (game, root):
+        capture = FrameCapture()
+        encoder = DeltaEncoder()
+        add_player_bullets(game, 5)
+        encoder.encode(capture.capture(game))
+        total = 0.0
+        for _ in range(ticks):
+            root.advance(16)
+            start = time.perf_counter()
+            frame = capture.capture(game)
+            if part == "encode":
+                start = time.perf_counter()
+                encoder.encode(frame)
+            total += time.perf_counter() - start
+        return total * 1e6 / ticks
+
+@case("render_tick", FORMATIONS, needs_display=True)
+def bench_render_tick(rows, cols, ticks=120):
+    """A full frame on a real Tk canvas, including drawing it (needs a display)."""
+    import tkinter as tk
+    root = tk.Tk()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            game = ui.GameScreen(root, "Bench")
+            game.leaderboard = LeaderboardManager(os.path.join(tmp, "bench.db"))
+            game.enemy_rows, game.enemy_cols = rows, cols
+            game.enemy_spacing_x = min(game.enemy_spacing_x, 600 / cols)
+            game.enemy_spacing_y = min(game.enemy_spacing_y, 250 / rows)
+            game.spawn_enemies()
+            root.after_cancel(game.game_update_id)  # We drive the loop ourselves
+            root.update()
+            total = 0.0
+            for frame in range(ticks):
+                if frame % 5 == 0:
+                    game.shoot()
+                start = time.perf_counter()
+                game.update_game()
+                root.after_cancel(game.game_update_id)
+                root.update()
+                total += time.perf_counter() - start
+            game.leaderboard.close()
+            return total * 1e6 / ticks
+    finally:
+        root.destroy()
+
+# Leaderboard cases
+
+_leaderboards = {}   # rows -> path of a filled database, shared by every query case
+
+def filled_leaderboard(rows, workdir):
+    """Return a database path holding `rows` deterministic scores from 500 players."""
+    if rows not in _leaderboards:
+        path = os.path.join(workdir, f"leaderboard-{rows}.db")
+        rng = random.Random(rows)
+        lm = LeaderboardManager(path, write_behind=True, batch_size=4096)
+        for i in range(rows):
+            lm.add_score(f"Player{rng.randrange(500)}", rng.randint(0, 50000), rng.randint(1, 20))
+        lm.close()
+        _leaderboards[rows] = path
+    return _leaderboards[rows]
+
+LEADERBOARD_QUERIES = {
+    "top": lambda lm, rng: lm.get_top_scores(10),
+    "rank": lambda lm, rng: lm.get_player_rank("Bench", rng.randint(0, 50000)),
+    "weekly": lambda lm, rng: lm.get_window_top_scores("weekly", 10),
+    "stats": lambda lm, rng: lm.get_player_stats(f"Player{rng.randrange(500)}"),
+    "submit": lambda lm, rng: lm.submit_score("Bench", rng.randint(0, 50000), 1),
+    "rank_index": lambda lm, rng: lm.get_rank_index(),
+}
+
+# Queries that add rows; they run against a throwaway copy of the database
+WRITING_QUERIES = {"submit"}
+
+@case("leaderboard", [{"rows": rows, "query": query}
+                      for rows in (1000, 20000) for query in LEADERBOARD_QUERIES])
+def bench_leaderboard(rows, query, workdir=None):
+    """One leaderboard call against a database of `rows` scores."""
+    path = filled_leaderboard(rows, workdir)
+    if query in WRITING_QUERIES:
+        # A fresh copy per run, so every repeat and every later case still
+        # measures exactly `rows` scores
+        scratch = os.path.join(workdir, f"scratch-{rows}.db")
+        for stale in (scratch, scratch + "-wal", scratch + "-shm"):
+            if os.path.exists(stale):
+                os.remove(stale)
+        shutil.copyfile(path, scratch)
+        path = scratch
+    lm = LeaderboardManager(path)
+    try:
+        rng = random.Random(0)
+        function = LEADERBOARD_QUERIES[query]
+        function(lm, rng)  # Warm the score cache so its one-off load isn't timed
+        return time_calls(lambda: function(lm, rng), 50 if query == "submit" else 200)
+    finally:
+        lm.close()
+
+@case("live_rank", [{"rows": rows} for rows in (1000, 20000)])
+def bench_live_rank(rows, workdir=None):
+    """The HUD's per-frame rank lookup in a copied rank index of `rows` scores."""
+    lm = LeaderboardManager(filled_leaderboard(rows, workdir))
+    try:
+        index = lm.get_rank_index()
+    finally:
+        lm.close()
+    rng = random.Random(0)
+    return time_calls(lambda: index.rank(rng.randint(0, 50000)), 1000)
+
+# Audio cases
+
+@case("audio_play")
+def bench_audio_play():
+    """SoundMixer.play() from the game loop: queueing a trigger for the mixer thread."""
+    from audio import NullSink, SoundMixer, build_samples
+    mixer = SoundMixer(build_samples(), NullSink(), min_interval=0)
+    try:
+        return time_calls(lambda: mixer.play("explosion"), 1000)
+    finally:
+        mixer.close()
+
+# Logging cases
+
+@case("gamelog_disabled")
+def bench_gamelog_disabled():
+    """A debug call in a category logging warnings only: the per-frame cost of leaving it in."""
+    import io
+    import gamelog
+    gamelog.configure("warning", stream=io.StringIO())
+    try:
+        log = gamelog.get_logger("game")
+        return time_calls(lambda: log.debug("frame %d", 1), 10000)
+    finally:
+        gamelog.shutdown()
+
+# Runner
+
+def has_display():
+    return not sys.platform.startswith("linux") or bool(os.environ.get("DISPLAY"))
+
+def run_suite(patterns=None, repeat=5, seed=1234):
+    """
+    Run the registered cases.
+
+    Args:
+        patterns (list): Only run cases whose key contains one of these strings
+        repeat (int): Runs per case; the median is what gets compared
+        seed (int): Seed for the random module before every run
+
+    Returns:
+        list: One result dict per case parameterization
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for entry in CASES:
+            for params in entry["params"]:
+                key = case_key(entry["name"], params)
+                if patterns and not any(pattern in key for pattern in patterns):
+                    continue
+                if entry["needs_display"] and not has_display():
+                    results.append({"key": key, "case": entry["name"], "params": params,
+                                    "skipped": "no display (run under xvfb-run)"})
+                    continue
+
+                kwargs = dict(params)
+                if entry["name"] in ("leaderboard", "live_rank"):
+                    kwargs["workdir"] = workdir
+                samples = []
+                for _ in range(repeat):
+                    random.seed(seed)
+                    samples.append(entry["function"](**kwargs))
+                results.append({
+                    "key": key,
+                    "case": entry["name"],
+                    "params": params,
+                    "median_us": round(statistics.median(samples), 3),
+                    "min_us": round(min(samples), 3),
+                    "max_us": round(max(samples), 3),
+                    "runs": repeat,
+                })
+                print(f"  {key:<48} {results[-1]['median_us']:>12.1f} us", file=sys.stderr)
+    return results
+
+def compare(results, baseline, threshold, case_thresholds=None):
+    """
+    Compare medians against a baseline run.
+
+    Args:
+        results (list): Output of run_suite()
+        baseline (dict): A previously saved report
+        threshold (float): Allowed slowdown, e.g. 0.25 for 25%
+        case_thresholds (dict): Per-case overrides, keyed by case name
+
+    Returns:
+        list: (key, median_us, baseline_us, change) for each regression
+    """
+    case_thresholds = case_thresholds or {}
+    baseline_by_key = {r["key"]: r for r in baseline.get("results", []) if "median_us" in r}
+    regressions = []
+    for result in results:
+        before = baseline_by_key.get(result["key"])
+        if before is None or "median_us" not in result:
+            continue
+        change = result["median_us"] / before["median_us"] - 1
+        result["baseline_us"] = before["median_us"]
+        result["change"] = round(change, 4)
+        allowed = case_thresholds.get(result["case"], threshold)
+        if change > allowed:
+            regressions.append((result["key"], result["median_us"], before["median_us"], change))
+    return regressions
+
+def build_report(results, seed, repeat):
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "seed": seed,
+            "repeat": repeat,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+def parse_case_thresholds(values):
+    thresholds = {}
+    for value in values:
+        name, _, limit = value.partition("=")
+        thresholds[name] = float(limit)
+    return thresholds
+
+def main():
+    parser = argparse.ArgumentParser(description="Game loop and leaderboard benchmark suite")
+    parser.add_argument("-k", dest="patterns", action="append",
+                        help="only run cases whose key contains this (repeatable)")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per case (median is compared)")
+    parser.add_argument("--seed", type=int, default=1234, help="random seed for every run")
+    parser.add_argument("--json", help="write results as JSON to this file ('-' for stdout)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline file to compare with")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown before failing, e.g. 0.25 = 25%%")
+    parser.add_argument("--case-threshold", action="append", default=[], metavar="CASE=LIMIT",
+                        help="per-case allowed slowdown, e.g. tick=0.5 (repeatable)")
+    parser.add_argument("--list", action="store_true", help="list case keys and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        for entry in CASES:
+            for params in entry["params"]:
+                print(case_key(entry["name"], params))
+        return
+
+    print("Running benchmarks...", file=sys.stderr)
+    results = run_suite(args.patterns, args.repeat, args.seed)
+    report = build_report(results, args.seed, args.repeat)
+
+    regressions = []
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold,
+                              parse_case_thresholds(args.case_threshold))
+
+    print(f"\n{'case':<48} {'median us':>12} {'baseline':>12} {'change':>8}")
+    for result in results:
+        if "skipped" in result:
+            print(f"{result['key']:<48} {'skipped: ' + result['skipped']}")
+            continue
+        baseline_us = result.get("baseline_us")
+        print(f"{result['key']:<48} {result['median_us']:>12.1f} "
+              f"{baseline_us if baseline_us is not None else '-':>12} "
+              f"{format(result['change'], '+.1%') if 'change' in result else '-':>8}")
+
+    if args.json == "-":
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    elif args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+
+    if regressions:
+        print(f"\nFAIL: {len(regressions)} regression(s)")
+        for key, median_us, baseline_us, change in regressions:
+            print(f"  {key}: {median_us:.1f} us vs {baseline_us:.1f} us ({change:+.1%})")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# Galactic Defenders - Session Load Generator
+# Ramps up game sessions on the session server and reports how many each core can tick at 60 Hz
+#
+# Usage:
+#   python benchmarks/session_load.py                        # local server, one worker per core
+#   python benchmarks/session_load.py --steps 4,8,16,32 --remote 4
+#   python benchmarks/session_load.py --connect 127.0.0.1:8766 --json load.json
+#
+# Most sessions are driven by the reference bot inside the server. --remote
+# sessions are driven from here instead: one TCP connection each, sending an
+# input every frame and reading the state back, as a real client would.
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from session_server import SessionManager, SessionServer, TICK_HZ, usable_cpus
+
+# A step holds 60 Hz if sessions get at least this share of their ticks
+# and few of them start late
+MIN_RATE = 0.97
+MAX_LATE = 0.02
+
+class Client:
+    """One JSON-lines connection to the session server."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.next_id = 0
+
+    @classmethod
+    async def connect(cls, host, port):
+        return cls(*await asyncio.open_connection(host, port))
+
+    async def call(self, op, **args):
+        """Send a request and wait for its reply. Raises RuntimeError on errors."""
+        self.next_id += 1
+        request = dict(args, id=self.next_id, op=op)
+        self.writer.write(json.dumps(request).encode("utf-8") + b"\n")
+        reply = json.loads(await self.reader.readline())
+        if not reply["ok"]:
+            raise RuntimeError(reply["error"])
+        return reply["result"]
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+async def remote_player(host, port, tick_hz, stats, stop):
+    """
+    Play a remote-controlled session: an input every frame, the state every second.
+
+    Input replies are counted in stats to check the server keeps up with
+    its clients as well as its games.
+    """
+    client = await Client.connect(host, port)
+    session = await client.call("create", controller="remote", name="Remote")
+    period = 1.0 / tick_hz
+    frame = 0
+    try:
+        while not stop.is_set():
+            started = time.perf_counter()
+            await client.call("input", session=session, left=random.random() < 0.3,
+                              right=random.random() < 0.3, fire=random.random() < 0.2)
+            stats["inputs"] += 1
+            stats["input_ms"].append((time.perf_counter() - started) * 1000)
+            frame += 1
+            if frame % tick_hz == 0:
+                state = await client.call("state", session=session)
+                if not state["running"]:
+                    await client.call("restart", session=session)
+            await asyncio.sleep(max(0.0, period - (time.perf_counter() - started)))
+        await client.call("close", session=session)
+    finally:
+        await client.close()
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+async def run_load(host, port, steps, remote, seconds, warmup, tick_hz, cores):
+    """
+    Ramp the session count through `steps` and measure each step.
+
+    Returns:
+        list: One dict per step with the server's metrics (see
+            session_server.summarize_metrics) plus client-side input latency
+            and whether the step held the tick rate
+    """
+    control = await Client.connect(host, port)
+    # Sessions the server already had count toward each step
+    existing = (await control.call("metrics"))["sessions"]
+    stop = asyncio.Event()
+    stats = {"inputs": 0, "input_ms": []}
+    players = [asyncio.create_task(remote_player(host, port, tick_hz, stats, stop))
+               for _ in range(remote)]
+    bots = []
+    results = []
+    try:
+        for count in steps:
+            while existing + remote + len(bots) < count:
+                bots.append(await control.call("create", controller="bot", name="Bot"))
+            await asyncio.sleep(warmup)
+            await control.call("metrics", reset=True)
+            stats["inputs"] = 0
+            stats["input_ms"] = []
+            await asyncio.sleep(seconds)
+            metrics = await control.call("metrics")
+            metrics.pop("per_worker")
+            rate = metrics["tick_hz_per_session"] / tick_hz
+            metrics.update(
+                cores=cores,
+                held=rate >= MIN_RATE and metrics["late_fraction"] <= MAX_LATE,
+                inputs_per_second=round(stats["inputs"] / seconds, 1),
+                input_ms_p50=round(percentile(stats["input_ms"], 0.5), 3),
+                input_ms_p99=round(percentile(stats["input_ms"], 0.99), 3),
+            )
+            results.append(metrics)
+            print(f"{metrics['sessions']:>5} sessions: {metrics['tick_hz_per_session']:6.2f} Hz, "
+                  f"{metrics['late_fraction']:6.1%} late, {metrics['cpu_ms_per_tick']:.3f} ms CPU/tick, "
+                  f"input p99 {metrics['input_ms_p99']:.1f} ms"
+                  f"{'' if metrics['held'] else '  <- below ' + str(tick_hz) + ' Hz'}",
+                  file=sys.stderr)
+            if not metrics["held"]:
+                break
+    finally:
+        stop.set()
+        await asyncio.gather(*players, return_exceptions=True)
+        for session in bots:
+            await control.call("close", session=session)
+        await control.close()
+    return results
+
+async def run(args):
+    steps = sorted(int(step) for step in args.steps.split(","))
+    manager = server = None
+    if args.connect:
+        host, _, port = args.connect.rpartition(":")
+        port = int(port)
+        cores = args.cores or usable_cpus()
+    else:
+        manager = SessionManager(args.workers, args.tick_hz)
+        await manager.start()
+        server = SessionServer(manager, port=0)
+        await server.start()
+        host, port = server.host, server.port
+        cores = min(manager.worker_count, usable_cpus())
+        print(f"Local session server with {manager.worker_count} workers on {cores} cores",
+              file=sys.stderr)
+    try:
+        return await run_load(host, port, steps, args.remote, args.seconds, args.warmup,
+                              args.tick_hz, cores), cores
+    finally:
+        if server is not None:
+            await server.stop()
+            await manager.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generator for the session server")
+    parser.add_argument("--connect", metavar="HOST:PORT",
+                        help="load a running server (default: start one in this process)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes for the local server (default: one per core)")
+    parser.add_argument("--cores", type=int, default=None,
+                        help="cores the --connect server runs on (default: this machine's)")
+    parser.add_argument("--steps", default="1,2,4,6,8,12,16,24,32,48,64",
+                        help="session counts to ramp through; stops at the first that falls behind")
+    parser.add_argument("--remote", type=int, default=1,
+                        help="sessions driven over TCP from here (the rest are server-side bots)")
+    parser.add_argument("--seconds", type=float, default=5.0, help="measurement time per step")
+    parser.add_argument("--warmup", type=float, default=1.0, help="settling time before each step")
+    parser.add_argument("--tick-hz", type=int, default=TICK_HZ, help="ticks per second per session")
+    parser.add_argument("--json", help="also write the results as JSON to this file")
+    args = parser.parse_args()
+
+    results, cores = asyncio.run(run(args))
+    held = [result for result in results if result["held"]]
+    if held:
+        best = held[-1]
+        print(f"\nHeld {args.tick_hz} Hz with {best['sessions']} sessions on {cores} cores: "
+              f"{best['sessions'] / cores:.1f} sessions per core")
+        print(f"CPU per tick {best['cpu_ms_per_tick']:.3f} ms: "
+              f"~{best['sessions_per_core']} sessions per fully busy core")
+    else:
+        print(f"\nCould not hold {args.tick_hz} Hz even with {results[0]['sessions']} sessions")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"tick_hz": args.tick_hz, "cores": cores, "steps": results}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
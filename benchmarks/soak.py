@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+# Galactic Defenders - Soak Test
+# Plays thousands of automated games headless and fails if memory or resources keep growing
+#
+# Usage:
+#   python benchmarks/soak.py                      # 1000 games, up to 5 simulated seconds each
+#   python benchmarks/soak.py --games 5000 --json soak.json
+#   python benchmarks/soak.py --games 100 --frames 120   # quick check
+#   python benchmarks/soak.py --trace-all          # tracemalloc throughout (much slower)
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import headless
+import ui
+from bot import ReferenceBot
+from entities import Bullet
+from leaderboard import LeaderboardManager
+
+# Growth allowed between the start and the end of the run (after warm-up)
+# before a metric counts as trending upward
+DEFAULT_TOLERANCES = {
+    "heap_blocks": 5000,    # Live small Python objects (sys.getallocatedblocks)
+    "rss_kb": 8192,         # Resident memory, including Tcl/Tk and SQLite (Linux only)
+    "traced_kb": 512.0,     # Python heap traced by tracemalloc (with --trace-all)
+    "canvas_items": 10,     # Canvas items alive between games
+    "widgets": 0,           # Tk widgets (frames, buttons...)
+    "after_timers": 2,      # Pending after() callbacks
+}
+
+# Tk canvas item ids are a C int that only ever counts up
+MAX_ITEM_ID = 2 ** 31 - 1
+
+def resident_kb():
+    """Current resident set size in KB, or 0 where /proc isn't available."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, IndexError):
+        return 0
+
+def count_widgets(widget):
+    """Number of widgets below `widget`, recursively."""
+    children = widget.winfo_children()
+    return len(children) + sum(count_widgets(child) for child in children)
+
+def clear_wave(game):
+    """Shoot down every enemy at once, as if the player had cleared the level."""
+    for enemy in list(game.enemies):
+        x, y = game.formation.position(enemy.row, enemy.col)
+        item = game.canvas.create_rectangle(x - 2, y - 10, x + 2, y, fill="#FF0000")
+        bullet = Bullet(item, 0, -game.player_bullet_speed)
+        game.bullets.append(bullet)
+        game.handle_enemy_hit(enemy, bullet)
+
+def play_game(game, root, rng, max_frames):
+    """
+    Play one automated game until it is lost or `max_frames` frames pass.
+
+    The reference bot plays; some games also clear a wave at once (level
+    transition timers and messages) or pause for a moment, so every screen
+    the kiosk shows is exercised.
+
+    Returns:
+        int: Frames played
+    """
+    clear_at = rng.randrange(max_frames) if rng.random() < 0.3 else -1
+    pause_at = rng.randrange(max_frames) if rng.random() < 0.2 else -1
+    game.set_controller(ReferenceBot())
+    frame = 0
+    while frame < max_frames and game.game_running:
+        if frame == clear_at and game.enemies:
+            clear_wave(game)
+        if frame == pause_at:
+            game.toggle_pause()
+            root.advance(500)
+            game.toggle_pause()
+        root.advance(16)
+        frame += 1
+
+    if game.game_running:
+        game.game_over(invasion=rng.random() < 0.5)
+    game.set_controller(None)
+    return frame
+
+def take_sample(game, root, games):
+    """Measure everything that must stay flat, between two games."""
+    sample = {
+        "games": games,
+        "simulated_s": root.now_ms / 1000,
+        "heap_blocks": sys.getallocatedblocks(),
+        "rss_kb": resident_kb(),
+        "traced_kb": round(tracemalloc.get_traced_memory()[0] / 1024, 1),
+        "canvas_items": len(game.canvas.find_all()),
+        "widgets": count_widgets(root),
+        "after_timers": root.pending_timers(),
+    }
+    # Live items are mostly old ones, so probe for the id Tk would hand out next
+    sample["next_item_id"] = game.canvas.create_line(0, 0, 0, 0)
+    game.canvas.delete(sample["next_item_id"])
+    game.canvas.flush()
+    return sample
+
+def slope(values):
+    """Least-squares slope of `values` against their index."""
+    n = len(values)
+    if n < 2:
+        return 0.0
+    mean_x = (n - 1) / 2
+    mean_y = sum(values) / n
+    numerator = sum((i - mean_x) * (value - mean_y) for i, value in enumerate(values))
+    denominator = sum((i - mean_x) ** 2 for i in range(n))
+    return numerator / denominator
+
+def find_trends(samples, tolerances):
+    """
+    Decide which metrics trend upward.
+
+    A metric trends upward when the median of the last third of the samples
+    exceeds the median of the first third by more than its tolerance and the
+    fitted slope is positive, so one-off spikes (a dict resizing, bullets in
+    flight) don't fail the run but steady growth does.
+
+    Returns:
+        list: One dict per metric with start, end, growth, slope and verdict
+    """
+    third = max(1, len(samples) // 3)
+    trends = []
+    for metric, tolerance in tolerances.items():
+        values = [sample[metric] for sample in samples]
+        start = statistics.median(values[:third])
+        end = statistics.median(values[-third:])
+        per_sample = slope(values)
+        games_per_sample = ((samples[-1]["games"] - samples[0]["games"]) / (len(samples) - 1)
+                            if len(samples) > 1 else 1)
+        trends.append({
+            "metric": metric,
+            "start": start,
+            "end": end,
+            "growth": round(end - start, 1),
+            "per_1000_games": round(per_sample / games_per_sample * 1000, 2),
+            "tolerance": tolerance,
+            "leaking": end - start > tolerance and per_sample > 0,
+        })
+    return trends
+
+def top_allocations(before, after, limit):
+    """The source lines whose allocations grew most between two snapshots."""
+    filters = [
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        tracemalloc.Filter(False, "<unknown>"),
+    ]
+    before = before.filter_traces(filters)
+    after = after.filter_traces(filters)
+    return [{"site": str(stat.traceback),
+             "size_kb": round(stat.size_diff / 1024, 1),
+             "count": stat.count_diff}
+            for stat in after.compare_to(before, "lineno")[:limit]]
+
+def run_soak(games, max_frames, sample_every, warmup, trace_from, seed, workdir,
+             trace_frames=1, progress=True):
+    """
+    Play `games` automated games on one GameScreen, restarting after each.
+
+    tracemalloc slows the game down several times over, so it only runs
+    from game `trace_from` onwards; the cheap metrics are sampled from the
+    end of warm-up.
+
+    Returns:
+        dict: Samples taken after warm-up, simulated time and the tracemalloc
+            snapshots at the start and end of the traced games
+    """
+    rng = random.Random(seed)
+    random.seed(seed)
+    root = headless.HeadlessRoot()
+    samples = []
+    frames = 0
+    with headless.headless_tk(root):
+        game = ui.GameScreen(root, "Soak")
+        game.leaderboard = LeaderboardManager(os.path.join(workdir, "soak.db"))
+        first_snapshot = None
+        started = time.perf_counter()
+        try:
+            for played in range(1, games + 1):
+                frames += play_game(game, root, rng, max_frames)
+                root.advance(16)
+                root.event("<space>")   # Restart from the game over screen
+                root.advance(100)       # Let the new game's loop start
+
+                if played == trace_from:
+                    tracemalloc.start(trace_frames)
+                    first_snapshot = tracemalloc.take_snapshot()
+                if played >= warmup and (played - warmup) % sample_every == 0:
+                    samples.append(take_sample(game, root, played))
+                    if progress:
+                        sample = samples[-1]
+                        print(f"  game {played:>6}: {sample['heap_blocks']:>9} blocks, "
+                              f"{sample['canvas_items']} items, {sample['widgets']} widgets, "
+                              f"{sample['after_timers']} timers "
+                              f"({time.perf_counter() - started:.0f}s)", file=sys.stderr)
+            last_snapshot = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
+            game.wait_for_results()
+            game.leaderboard.close()
+    return {
+        "samples": samples,
+        "frames": frames,
+        "simulated_s": root.now_ms / 1000,
+        "snapshots": (first_snapshot, last_snapshot),
+    }
+
+def print_report(trends, allocations, item_ids_per_hour):
+    print(f"\n{'metric':<14} {'start':>10} {'end':>10} {'growth':>9} {'/1000 games':>12} "
+          f"{'allowed':>8}  verdict")
+    for trend in trends:
+        print(f"{trend['metric']:<14} {trend['start']:>10} {trend['end']:>10} "
+              f"{trend['growth']:>+9} {trend['per_1000_games']:>+12} {trend['tolerance']:>8}  "
+              f"{'LEAK' if trend['leaking'] else 'ok'}")
+
+    if item_ids_per_hour:
+        hours = MAX_ITEM_ID / item_ids_per_hour
+        print(f"\nCanvas item ids: {item_ids_per_hour:,.0f} per hour of play "
+              f"(Tk never reuses ids; the counter lasts {hours / 24:,.0f} days)")
+
+    print("\nTop allocation growth over the traced games:")
+    for allocation in allocations:
+        print(f"  {allocation['size_kb']:>+9.1f} KB {allocation['count']:>+7}  {allocation['site']}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Soak test: many automated games, leak detection")
+    parser.add_argument("--games", type=int, default=1000, help="games to play")
+    parser.add_argument("--frames", type=int, default=300,
+                        help="frames per game before it is ended (60 frames = 1 simulated second)")
+    parser.add_argument("--samples", type=int, default=50, help="measurements to take after warm-up")
+    parser.add_argument("--warmup", type=int, default=20,
+                        help="games to play before measuring (pools and caches fill up)")
+    parser.add_argument("--seed", type=int, default=1234, help="random seed")
+    parser.add_argument("--top", type=int, default=10, help="allocation sites to report")
+    parser.add_argument("--trace-games", type=int, default=None,
+                        help="trace allocations over the last N games (default: 10%% of them)")
+    parser.add_argument("--trace-all", action="store_true",
+                        help="trace allocations from the end of warm-up and check traced_kb too")
+    parser.add_argument("--trace-frames", type=int, default=1,
+                        help="stack frames tracemalloc keeps per allocation (more is slower)")
+    parser.add_argument("--tolerance", action="append", default=[], metavar="METRIC=LIMIT",
+                        help="allowed growth for a metric, e.g. traced_kb=1024 (repeatable)")
+    parser.add_argument("--json", help="also write samples and trends as JSON to this file")
+    args = parser.parse_args()
+
+    if args.games <= args.warmup:
+        sys.exit("--games must be larger than --warmup")
+    tolerances = dict(DEFAULT_TOLERANCES)
+    if args.trace_all:
+        trace_from = args.warmup
+    else:
+        del tolerances["traced_kb"]   # Only meaningful when tracing all along
+        trace_games = args.trace_games or max(1, args.games // 10)
+        trace_from = max(args.warmup, args.games - trace_games)
+    for value in args.tolerance:
+        metric, _, limit = value.partition("=")
+        if metric not in tolerances:
+            sys.exit(f"Unknown metric {metric!r}; choose from {', '.join(tolerances)}")
+        tolerances[metric] = float(limit)
+    sample_every = max(1, (args.games - args.warmup) // args.samples)
+
+    print(f"Playing {args.games} games...", file=sys.stderr)
+    with tempfile.TemporaryDirectory() as workdir:
+        result = run_soak(args.games, args.frames, sample_every, args.warmup, trace_from,
+                          args.seed, workdir, args.trace_frames)
+
+    samples = result["samples"]
+    trends = find_trends(samples, tolerances)
+    allocations = top_allocations(*result["snapshots"], args.top)
+    first, last = samples[0], samples[-1]
+    simulated_hours = (last["simulated_s"] - first["simulated_s"]) / 3600
+    item_ids_per_hour = ((last["next_item_id"] - first["next_item_id"]) / simulated_hours
+                         if simulated_hours else 0)
+    print(f"\n{args.games} games, {result['frames']} frames, "
+          f"{result['simulated_s'] / 60:.0f} simulated minutes")
+    print_report(trends, allocations, item_ids_per_hour)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"games": args.games, "frames": result["frames"],
+                       "simulated_s": result["simulated_s"], "samples": samples,
+                       "trends": trends, "top_allocations": allocations}, f, indent=2)
+
+    leaking = [trend["metric"] for trend in trends if trend["leaking"]]
+    if leaking:
+        print(f"\nFAIL: upward trend in {', '.join(leaking)}")
+        sys.exit(1)
+    print("\nOK: no upward trends")
+
+if __name__ == "__main__":
+    main()
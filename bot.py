@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+# Galactic Defenders - Bot Module
+# Programmatic player input and a reference bot that plays headless at full speed
+#
+# Usage:
+#   python bot.py --games 20                  # play 20 games, print score/level stats
+#   python bot.py --games 5 --max-minutes 10 --json bot.json
+
+import argparse
+import bisect
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+
+# Player ship geometry (see GameScreen.player_ship_coords)
+SHIP_HALF_WIDTH = 25
+SHIP_TOP = 520
+SHIP_BOTTOM = 550
+
+# Frames per second of game time (the game loop runs every 16 ms)
+FRAME_MS = 16
+
+class PlayerInput:
+    """The controls for one frame: hold left and/or right, and fire."""
+    __slots__ = ("left", "right", "fire")
+
+    def __init__(self, left=False, right=False, fire=False):
+        self.left = left
+        self.right = right
+        self.fire = fire
+
+    def __repr__(self):
+        return f"PlayerInput(left={self.left}, right={self.right}, fire={self.fire})"
+
+class ReferenceBot:
+    """
+    A simple but competent player: dodge enemy bullets, shoot the lowest aliens.
+
+    Each frame it predicts where every enemy bullet will cross the ship's
+    row and tries a few short movement plans (stay, or move left/right for
+    a few frames and then stop). It picks the plan that gets hit least,
+    breaking ties by how close the plan ends to its target: the lowest
+    alien it can shoot without a barrier in the way (nearest first), led by
+    how far the formation will have moved by the time a bullet gets there.
+    It fires whenever it is lined up with a clear shot.
+
+    Example usage:
+        game.set_controller(ReferenceBot())
+    """
+
+    # Frames to hold a direction before stopping, for each movement plan
+    PLAN_FRAMES = (1, 2, 4, 8, 16, 32)
+
+    def __init__(self, horizon=40, margin=6, aim_tolerance=8):
+        """
+        Initialize the bot.
+
+        Args:
+            horizon (int): How many frames ahead to look for incoming bullets
+            margin (float): Extra clearance (pixels) kept around the ship
+            aim_tolerance (float): How close to the target x counts as lined up
+        """
+        self.horizon = horizon
+        self.margin = margin
+        self.aim_tolerance = aim_tolerance
+        self.ticks = 0
+
+    def tick(self, game):
+        """Decide this frame's controls for a GameScreen."""
+        self.ticks += 1
+        x = game.player_x
+        cover = self.barrier_cover(game)
+        target = self.target_x(game, cover)
+        threats = self.threats(game)
+
+        best = None
+        for direction in (0, -1, 1):
+            for frames in (self.PLAN_FRAMES if direction else (0,)):
+                hits, first_hit = self.plan_hits(game, x, direction, frames, threats)
+                end_x = self.ship_x(game, x, direction, frames, frames)
+                distance = abs(end_x - target) if target is not None else 0
+                # Fewest hits, then the latest first hit, then closest to the target
+                key = (hits, -first_hit, distance, frames)
+                if best is None or key < best[0]:
+                    best = (key, direction)
+        direction = best[1]
+
+        aligned = target is not None and abs(x - target) <= self.aim_tolerance
+        fire = aligned and not self.blocked(x, cover)
+        return PlayerInput(left=direction < 0, right=direction > 0, fire=fire)
+
+    def threats(self, game):
+        """
+        Enemy bullets that can reach the ship's row within the horizon.
+
+        Returns:
+            list: (first frame, last frame, x, dx) for each bullet, where the
+                frames are when its center is between the ship's top and bottom
+        """
+        threats = []
+        for bullet in game.enemy_bullets:
+            coords = game.canvas.coords(bullet.id)
+            if len(coords) < 4 or bullet.dy <= 0:
+                continue
+            center_x = (coords[0] + coords[2]) / 2
+            center_y = (coords[1] + coords[3]) / 2
+            first = (SHIP_TOP - center_y) / bullet.dy
+            last = (SHIP_BOTTOM - center_y) / bullet.dy
+            if last < 0 or first > self.horizon:
+                continue
+            threats.append((max(0, int(first)), int(last) + 1,
+                            center_x, bullet.dx))
+        return threats
+
+    def ship_x(self, game, x, direction, frames, frame):
+        """Where the ship will be after `frame` frames of a movement plan."""
+        moved = x + direction * game.player_speed * min(frame, frames)
+        # The ship stops at the screen edges (see update_player_position)
+        return max(SHIP_HALF_WIDTH + 1, min(800 - SHIP_HALF_WIDTH - 1, moved))
+
+    def plan_hits(self, game, x, direction, frames, threats):
+        """
+        Count the bullets that would hit the ship following a movement plan.
+
+        Returns:
+            tuple: (hits, frame of the first hit, or the horizon if none)
+        """
+        hits = 0
+        first_hit = self.horizon
+        reach = SHIP_HALF_WIDTH + self.margin
+        for first, last, bullet_x, dx in threats:
+            for frame in range(first, last + 1):
+                if abs(self.ship_x(game, x, direction, frames, frame) -
+                       (bullet_x + dx * frame)) <= reach:
+                    hits += 1
+                    first_hit = min(first_hit, frame)
+                    break
+        return hits, first_hit
+
+    def barrier_cover(self, game):
+        """Sorted x centers of the barrier blocks still standing."""
+        return sorted(block.x for block in game.barrier_blocks)
+
+    def blocked(self, x, cover):
+        """Whether a bullet fired from x would hit one of our own barrier blocks."""
+        # A player bullet is stopped when its center enters a block (8 px wide)
+        index = bisect.bisect_left(cover, x - 5)
+        return index < len(cover) and cover[index] <= x + 5
+
+    def target_x(self, game, cover=()):
+        """
+        The x to line up with: the lowest alien in each column is a candidate,
+        and the bot prefers a clear shot, then the lowest row, then the nearest.
+
+        Returns:
+            float: Target x (led by the formation's drift), or None when
+                there are no enemies
+        """
+        formation = game.formation
+        if not game.enemies or not len(formation):
+            return None
+
+        # Only the lowest alien in a column can be hit from below
+        lowest = {}
+        for enemy in game.enemies:
+            if enemy.col not in lowest or enemy.row > lowest[enemy.col].row:
+                lowest[enemy.col] = enemy
+
+        x = game.player_x
+        best = None
+        for enemy in lowest.values():
+            enemy_x, enemy_y = formation.position(enemy.row, enemy.col)
+            # Lead the target by the formation's drift while our bullet flies
+            flight_frames = max(0, (SHIP_TOP - enemy_y) / game.player_bullet_speed)
+            drift = (flight_frames / max(1, game.enemy_move_delay) *
+                     game.enemy_speed * game.enemy_direction)
+            candidate = enemy_x + drift
+            key = (self.blocked(candidate, cover), -enemy.row, abs(candidate - x))
+            if best is None or key < best[0]:
+                best = (key, candidate)
+        return best[1]
+
+def run_headless(games=1, max_frames=60 * 60 * 5, seed=None, bot_factory=ReferenceBot,
+                 db_path=None, on_frame=None):
+    """
+    Play games with a bot on the headless canvas, as fast as the CPU allows.
+
+    The game's timers run on a virtual clock, so nothing waits for real time.
+    Each game ends at game over or after `max_frames` frames; the next one
+    starts with the game's own restart.
+
+    Args:
+        games (int): Number of games to play
+        max_frames (int): Frame limit per game
+        seed: Seed for the random module (enemy fire), or None
+        bot_factory: Called with no arguments to make each game's controller
+        db_path (str): Leaderboard database (default: a temporary file)
+        on_frame: Optional callable(game, frame) run before every frame
+
+    Returns:
+        list: One dict per game with score, level, shields, frames, whether
+            it ended in game over, and the wall-clock seconds it took
+    """
+    import headless
+    import ui
+    from leaderboard import LeaderboardManager
+
+    if seed is not None:
+        random.seed(seed)
+    root = headless.HeadlessRoot()
+    results = []
+    with headless.headless_tk(root), tempfile.TemporaryDirectory() as tmp:
+        game = ui.GameScreen(root, "Bot")
+        game.leaderboard = LeaderboardManager(db_path or os.path.join(tmp, "bot.db"))
+        try:
+            for number in range(games):
+                if number:
+                    root.event("<space>")   # Restart from the game over screen
+                    root.advance(100)       # Let the new game's loop start
+                game.set_controller(bot_factory())
+                started = time.perf_counter()
+                frame = 0
+                while game.game_running and frame < max_frames:
+                    if on_frame is not None:
+                        on_frame(game, frame)
+                    root.advance(FRAME_MS)
+                    frame += 1
+                results.append({
+                    "score": game.score,
+                    "level": game.level,
+                    "shields": game.shields,
+                    "frames": frame,
+                    "game_over": not game.game_running,
+                    "seconds": round(time.perf_counter() - started, 3),
+                })
+                if game.game_running:
+                    game.game_over()
+                game.set_controller(None)
+        finally:
+            game.wait_for_results()
+            game.leaderboard.close()
+    return results
+
+def summarize(results):
+    """Mean and median score, level reached and speed over several games."""
+    frames = sum(result["frames"] for result in results)
+    seconds = sum(result["seconds"] for result in results)
+    return {
+        "games": len(results),
+        "mean_score": round(statistics.mean(r["score"] for r in results), 1),
+        "median_score": statistics.median(r["score"] for r in results),
+        "mean_level": round(statistics.mean(r["level"] for r in results), 2),
+        "max_level": max(r["level"] for r in results),
+        "game_overs": sum(r["game_over"] for r in results),
+        "mean_minutes": round(frames * FRAME_MS / 60000 / len(results), 2),
+        "frames_per_second": round(frames / seconds) if seconds else 0,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Play Galactic Defenders headless with a bot")
+    parser.add_argument("--games", type=int, default=10, help="games to play")
+    parser.add_argument("--max-minutes", type=float, default=5.0,
+                        help="game time after which a game is ended")
+    parser.add_argument("--seed", type=int, default=1234, help="random seed")
+    parser.add_argument("--json", help="also write per-game results as JSON to this file")
+    args = parser.parse_args()
+
+    max_frames = int(args.max_minutes * 60000 / FRAME_MS)
+    results = run_headless(args.games, max_frames, args.seed)
+    for number, result in enumerate(results, 1):
+        print(f"game {number:>3}: score {result['score']:>6}  level {result['level']:>2}  "
+              f"{result['frames'] * FRAME_MS / 1000:>6.0f}s  "
+              f"{'game over' if result['game_over'] else 'time limit'}")
+    summary = summarize(results)
+    print(f"\n{summary['games']} games: mean score {summary['mean_score']}, "
+          f"median {summary['median_score']}, mean level {summary['mean_level']} "
+          f"(best {summary['max_level']}), {summary['game_overs']} game overs, "
+          f"{summary['frames_per_second']} frames/s")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"summary": summary, "games": results}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# Galactic Defenders - Entities Module
+# Compact game entity types and the list that tracks them
+
+class Enemy:
+    """An alien in the formation (its position lives in the Formation grid)."""
+    __slots__ = ("id", "row", "col", "type", "points", "parts", "index")
+
+    def __init__(self, id, row, col, type, points, parts=()):
+        self.id = id            # Canvas item id of the body
+        self.row = row
+        self.col = col
+        self.type = type        # Shape name, e.g. "alien1"
+        self.points = points
+        self.parts = parts      # Ids of extra detail items (eyes etc.) drawn with the body
+        self.index = -1         # Position in its EntityList (-1 when not in one)
+
+class Bullet:
+    """A bullet fired by the player or an enemy, moving by (dx, dy) each frame."""
+    __slots__ = ("id", "dx", "dy", "index")
+
+    def __init__(self, id, dx, dy):
+        self.id = id
+        self.dx = dx
+        self.dy = dy
+        self.index = -1
+
+class BarrierBlock:
+    """One destructible block of a protective barrier."""
+    __slots__ = ("id", "x", "y", "health", "index")
+
+    def __init__(self, id, x, y, health=3):
+        self.id = id
+        self.x = x
+        self.y = y
+        self.health = health    # Hits left before the block is destroyed
+        self.index = -1
+
+class EntityList:
+    """
+    An unordered list of entities with O(1) membership and removal.
+
+    Each entity remembers its own position (entity.index), so removal swaps
+    the last entity into the hole instead of shifting the whole list, and
+    membership is an identity check rather than an equality scan.
+
+    Example usage:
+        enemies = EntityList()
+        enemies.append(enemy)
+        if enemy in enemies:
+            enemies.remove(enemy)
+    """
+    __slots__ = ("_items",)
+
+    def __init__(self, entities=()):
+        """Initialize the list, optionally with some entities."""
+        self._items = []
+        for entity in entities:
+            self.append(entity)
+
+    def append(self, entity):
+        """Add an entity to the end of the list."""
+        entity.index = len(self._items)
+        self._items.append(entity)
+
+    def extend(self, entities):
+        """Add several entities."""
+        for entity in entities:
+            self.append(entity)
+
+    def remove(self, entity):
+        """
+        Remove an entity (no-op if it isn't in the list).
+
+        The last entity takes the removed one's place, so order is not kept.
+        """
+        if entity not in self:
+            return
+        index = entity.index
+        last = self._items.pop()
+        if last is not entity:
+            self._items[index] = last
+            last.index = index
+        entity.index = -1
+
+    def clear(self):
+        """Remove every entity."""
+        for entity in self._items:
+            entity.index = -1
+        self._items = []
+
+    def __contains__(self, entity):
+        index = getattr(entity, "index", -1)
+        return 0 <= index < len(self._items) and self._items[index] is entity
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __bool__(self):
+        return bool(self._items)
+
+    def __getitem__(self, index):
+        return self._items[index]
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# Galactic Defenders - Formation Module
+# Structure-of-arrays store for the rows x cols enemy grid
+
+from array import array
+
+class Formation:
+    """
+    The enemy formation as flat arrays indexed by slot (row * cols + col).
+
+    The whole grid moves together, so positions are stored once per column
+    (x) and per row (y) plus a shared offset. Alive counts per row and per
+    column let the formation bounds (leftmost/rightmost column, lowest row)
+    be kept up to date in O(1) amortized time as enemies die, instead of
+    scanning every enemy each move.
+
+    Example usage:
+        formation = Formation(rows=5, cols=10, origin_x=100, origin_y=80,
+                              spacing_x=60, spacing_y=50)
+        formation.shift(3, 0)
+        if formation.rightmost_x() + 20 >= 800:
+            ...
+        formation.kill(row, col)
+    """
+
+    def __init__(self, rows=0, cols=0, origin_x=0, origin_y=0, spacing_x=0, spacing_y=0):
+        """Create a formation with every slot alive (see reset())."""
+        self.reset(rows, cols, origin_x, origin_y, spacing_x, spacing_y)
+
+    def reset(self, rows, cols, origin_x, origin_y, spacing_x, spacing_y, type_indexes=None):
+        """
+        Fill the grid with live enemies at their starting positions.
+
+        Args:
+            rows, cols (int): Grid size
+            origin_x, origin_y (float): Center of the top-left enemy
+            spacing_x, spacing_y (float): Distance between neighbouring enemies
+            type_indexes (list): Enemy type index for each row (defaults to 0)
+        """
+        self.rows = rows
+        self.cols = cols
+        self.x = array("d", (origin_x + col * spacing_x for col in range(cols)))   # Column centers
+        self.y = array("d", (origin_y + row * spacing_y for row in range(rows)))   # Row centers
+        self.offset_x = 0.0
+        self.offset_y = 0.0
+
+        # Per-slot arrays
+        self.alive = bytearray(b"\x01" * (rows * cols))
+        row_types = type_indexes or [0] * rows
+        self.type_index = array("b", (row_types[row] for row in range(rows) for _ in range(cols)))
+
+        # Alive counts and bounds
+        self.row_alive = [cols] * rows
+        self.col_alive = [rows] * cols
+        self.alive_count = rows * cols
+        self.min_col = 0
+        self.max_col = cols - 1
+        self.max_row = rows - 1
+
+    def clear(self):
+        """Mark every slot dead."""
+        self.reset(0, 0, 0, 0, 0, 0)
+
+    def slot(self, row, col):
+        """Return the flat index of a grid cell."""
+        return row * self.cols + col
+
+    def is_alive(self, row, col):
+        """Check whether the enemy in a grid cell is still alive."""
+        return bool(self.alive[row * self.cols + col])
+
+    def kill(self, row, col):
+        """
+        Mark an enemy dead and shrink the bounds if its row or column emptied.
+
+        Returns:
+            bool: True if the enemy was alive
+        """
+        index = row * self.cols + col
+        if not self.alive[index]:
+            return False
+        self.alive[index] = 0
+        self.alive_count -= 1
+        self.row_alive[row] -= 1
+        self.col_alive[col] -= 1
+
+        if self.alive_count == 0:
+            self.min_col, self.max_col, self.max_row = 0, -1, -1
+            return True
+
+        # Each bound only ever moves inwards, so these loops are O(1) amortized
+        while self.col_alive[self.min_col] == 0:
+            self.min_col += 1
+        while self.col_alive[self.max_col] == 0:
+            self.max_col -= 1
+        while self.row_alive[self.max_row] == 0:
+            self.max_row -= 1
+        return True
+
+    def shift(self, dx, dy):
+        """Move the whole formation."""
+        self.offset_x += dx
+        self.offset_y += dy
+
+    def position(self, row, col):
+        """Return the current (x, y) center of a grid cell."""
+        return self.x[col] + self.offset_x, self.y[row] + self.offset_y
+
+    def leftmost_x(self):
+        """Center x of the leftmost column that still has a live enemy."""
+        return self.x[self.min_col] + self.offset_x
+
+    def rightmost_x(self):
+        """Center x of the rightmost column that still has a live enemy."""
+        return self.x[self.max_col] + self.offset_x
+
+    def lowest_y(self):
+        """Center y of the lowest row that still has a live enemy."""
+        return self.y[self.max_row] + self.offset_y
+
+    def __len__(self):
+        return self.alive_count
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# Galactic Defenders - Logging Module
+# Leveled, per-category logging with rate-limited errors and a background writer
+
+import os
+import threading
+import time
+
+# Same numbers as the logging module's levels
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+CRITICAL = 50
+OFF = CRITICAL + 10   # A category at this level logs nothing
+
+LEVEL_NAMES = {"DEBUG": DEBUG, "INFO": INFO, "WARNING": WARNING, "WARN": WARNING,
+               "ERROR": ERROR, "CRITICAL": CRITICAL, "OFF": OFF}
+
+# Records go to standard-library loggers under this name, e.g. "galactic.collision"
+ROOT_LOGGER = "galactic"
+
+# Environment variable with the log settings, e.g. "info,collision=debug,audio=off"
+LOG_ENV = "GALACTIC_LOG"
+
+DEFAULT_FORMAT = "%(asctime)s %(levelname)-7s %(name)s: %(message)s"
+
+_default_level = WARNING
+_category_levels = {}       # Overrides from configure() / set_category_level()
+_loggers = {}               # category -> GameLogger
+_output = {"stream": None, "path": None, "burst": 5, "interval": 10.0}
+_listener = None            # Background writer, started by the first record
+_rate_limit = None
+_lock = threading.RLock()
+
+class GameLogger:
+    """
+    Logger for one category ("game", "collision", "audio", ...).
+
+    The level check is a single integer comparison on this object, so a
+    disabled call costs next to nothing and the standard logging module is
+    not even imported until the first record is actually emitted. Pass
+    arguments separately (log.debug("x=%s", x)) so they are only formatted
+    when the record is kept.
+    """
+    __slots__ = ("category", "level", "_logger")
+
+    def __init__(self, category):
+        self.category = category
+        self.level = _category_levels.get(category, _default_level)
+        self._logger = None
+
+    def is_enabled_for(self, level):
+        return level >= self.level
+
+    def debug(self, msg, *args, exc_info=None):
+        if DEBUG >= self.level:
+            self._emit(DEBUG, msg, args, exc_info)
+
+    def info(self, msg, *args, exc_info=None):
+        if INFO >= self.level:
+            self._emit(INFO, msg, args, exc_info)
+
+    def warning(self, msg, *args, exc_info=None):
+        if WARNING >= self.level:
+            self._emit(WARNING, msg, args, exc_info)
+
+    def error(self, msg, *args, exc_info=None):
+        if ERROR >= self.level:
+            self._emit(ERROR, msg, args, exc_info)
+
+    def _emit(self, level, msg, args, exc_info):
+        if self._logger is None:
+            self._logger = _install().getChild(self.category)
+        self._logger.log(level, msg, *args, exc_info=exc_info)
+
+def get_logger(category):
+    """Return the (shared) logger for a category."""
+    with _lock:
+        logger = _loggers.get(category)
+        if logger is None:
+            logger = _loggers[category] = GameLogger(category)
+        return logger
+
+def _parse_level(name):
+    """Turn "debug", "off" or "20" into a level number."""
+    if isinstance(name, int):
+        return name
+    name = name.strip().upper()
+    if name.isdigit():
+        return int(name)
+    if name not in LEVEL_NAMES:
+        raise ValueError(f"Unknown log level: {name}")
+    return LEVEL_NAMES[name]
+
+def set_category_level(category, level):
+    """
+    Set the level of one category ("off" silences it).
+
+    Args:
+        category (str): Category name as passed to get_logger()
+        level: Level name ("debug", "warning", "off", ...) or number
+    """
+    with _lock:
+        _category_levels[category] = _parse_level(level)
+        get_logger(category).level = _category_levels[category]
+
+def configure(settings=None, stream=None, path=None, burst=5, interval=10.0):
+    """
+    Set levels and outputs. Later calls replace the earlier configuration.
+
+    Nothing is imported or started here; the background writer starts with
+    the first record that passes its level.
+
+    Args:
+        settings (str): Default level plus per-category overrides, e.g.
+            "info,collision=debug,audio=off". Defaults to $GALACTIC_LOG, or "warning".
+        stream: Stream to write to (defaults to stderr)
+        path (str): Optional log file, written in addition to the stream
+        burst (int): Identical warnings/errors allowed per interval
+        interval (float): Rate-limit window in seconds
+    """
+    global _default_level
+    if settings is None:
+        settings = os.environ.get(LOG_ENV, "warning")
+
+    with _lock:
+        shutdown()
+        _default_level = WARNING
+        _category_levels.clear()
+        for part in filter(None, (p.strip() for p in settings.split(","))):
+            if "=" in part:
+                category, level = part.split("=", 1)
+                _category_levels[category.strip()] = _parse_level(level)
+            else:
+                _default_level = _parse_level(part)
+        for category, logger in _loggers.items():
+            logger.level = _category_levels.get(category, _default_level)
+            logger._logger = None
+        _output.update(stream=stream, path=path, burst=burst, interval=interval)
+
+def _install():
+    """Start the background writer and return the root game logger."""
+    # Imported here so that importing this module (and ui) stays cheap
+    import atexit
+    import logging
+    import queue
+    from logging.handlers import QueueListener
+
+    global _listener, _rate_limit
+    with _lock:
+        root = logging.getLogger(ROOT_LOGGER)
+        if _listener is not None:
+            return root
+
+        handlers = [logging.StreamHandler(_output["stream"])]
+        if _output["path"]:
+            handlers.append(logging.FileHandler(_output["path"]))
+        for handler in handlers:
+            handler.setFormatter(logging.Formatter(DEFAULT_FORMAT))
+
+        records = queue.SimpleQueue()
+        _rate_limit = RateLimiter(_output["burst"], _output["interval"])
+        queue_handler = _make_queue_handler(records)
+        queue_handler.addFilter(_rate_limit.filter)
+
+        # Levels are checked by GameLogger, so the stdlib loggers pass everything
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(queue_handler)
+        root.setLevel(1)
+        root.propagate = False
+
+        _listener = QueueListener(records, *handlers)
+        _listener.start()
+        if not getattr(_install, "atexit_registered", False):
+            atexit.register(shutdown)
+            _install.atexit_registered = True
+        return root
+
+def suppressed_count():
+    """Number of warnings/errors dropped by rate limiting since the writer started."""
+    return _rate_limit.suppressed if _rate_limit is not None else 0
+
+def shutdown():
+    """Write out every queued record and stop the background writer."""
+    global _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            for handler in _listener.handlers:
+                handler.close()
+            _listener = None
+            for logger in _loggers.values():
+                logger._logger = None
+
+class RateLimiter:
+    """
+    Lets through at most `burst` identical warnings/errors per `interval` seconds.
+
+    Records are identical when they come from the same logger with the same
+    message template. The first record after a quiet period notes how many
+    were suppressed. Records below WARNING are never limited.
+    """
+
+    def __init__(self, burst=5, interval=10.0):
+        self.burst = burst
+        self.interval = interval
+        self._windows = {}    # (logger, template) -> [window start, count, suppressed]
+        self.suppressed = 0   # Total records dropped
+
+    def filter(self, record):
+        """logging filter: return False to drop the record."""
+        if record.levelno < WARNING:
+            return True
+        key = (record.name, record.msg)
+        now = time.monotonic()
+        window = self._windows.get(key)
+        if window is None or now - window[0] >= self.interval:
+            dropped = window[2] if window is not None else 0
+            self._windows[key] = [now, 1, 0]
+            if dropped:
+                record.msg = f"{record.msg} ({dropped} similar messages suppressed)"
+            return True
+        if window[1] < self.burst:
+            window[1] += 1
+            return True
+        window[2] += 1
+        self.suppressed += 1
+        return False
+
+def _make_queue_handler(records):
+    """
+    Create the logging handler that passes records to the background writer.
+
+    Only the cheap %-formatting of the message happens on the calling
+    thread; timestamps, tracebacks and the actual writes are done by the
+    listener thread, so the game loop never waits on terminal or file I/O.
+    """
+    import logging
+
+    class BackgroundQueueHandler(logging.Handler):
+        def emit(self, record):
+            try:
+                # Freeze the message now in case its arguments change later
+                record.msg = record.getMessage()
+                record.args = None
+                records.put_nowait(record)
+            except Exception:
+                self.handleError(record)
+
+    return BackgroundQueueHandler()
@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+# Galactic Defenders - Headless Module
+# Display-free stand-ins for the Tk root window and canvas
+
+import heapq
+import itertools
+import os
+import time
+import tkinter
+from contextlib import contextmanager
+
+class HeadlessCanvas:
+    """
+    A pure-Python canvas that keeps item coordinates and options in memory.
+
+    Implements the subset of tk.Canvas that the game uses, so GameScreen can
+    run (and be benchmarked or soak-tested) without a display.
+    """
+
+    def __init__(self, master=None, width=800, height=600, **options):
+        self.master = master
+        _add_child(master, self)
+        self.width = width
+        self.height = height
+        self.options = dict(options, width=width, height=height)
+        self._items = {}   # id -> [type, coords, options, tags]
+        self._next_id = itertools.count(1)
+        self.bindings = {}
+        self.calls = 0     # Number of canvas calls made (a stand-in for Tcl calls)
+
+    # Widget management (no-ops without a display)
+    def pack(self, **kwargs):
+        pass
+
+    def place(self, **kwargs):
+        pass
+
+    def destroy(self):
+        self._items.clear()
+        _remove_child(self.master, self)
+
+    def winfo_children(self):
+        return []
+
+    def configure(self, **options):
+        self.options.update(options)
+
+    config = configure
+
+    def update(self):
+        pass
+
+    def update_idletasks(self):
+        pass
+
+    def after_idle(self, callback, *args):
+        return self.master.after_idle(callback, *args)
+
+    def winfo_exists(self):
+        return True
+
+    def bind(self, sequence, func=None, add=None):
+        self.bindings[sequence] = func
+
+    def resize(self, width, height):
+        """Change the canvas size and fire <Configure>, as a window resize would."""
+        self.width, self.height = width, height
+        self.options.update(width=width, height=height)
+        handler = self.bindings.get("<Configure>")
+        if handler is not None:
+            handler(_ConfigureEvent(self, width, height))
+
+    # Item creation
+    def _create(self, item_type, args, options):
+        self.calls += 1
+        coords = [float(value) for value in _flatten(args)]
+        tags = options.pop("tags", ())
+        if isinstance(tags, str):
+            tags = (tags,)
+        item_id = next(self._next_id)
+        self._items[item_id] = [item_type, coords, options, tuple(tags)]
+        return item_id
+
+    def create_oval(self, *args, **options):
+        return self._create("oval", args, options)
+
+    def create_rectangle(self, *args, **options):
+        return self._create("rectangle", args, options)
+
+    def create_polygon(self, *args, **options):
+        return self._create("polygon", args, options)
+
+    def create_line(self, *args, **options):
+        return self._create("line", args, options)
+
+    def create_text(self, *args, **options):
+        return self._create("text", args, options)
+
+    def create_window(self, *args, **options):
+        return self._create("window", args, options)
+
+    # Item lookup
+    def _resolve(self, tag_or_id):
+        """Return the ids matching an item id, a tag or "all"."""
+        if tag_or_id == "all":
+            return list(self._items)
+        if isinstance(tag_or_id, int) or (isinstance(tag_or_id, str) and tag_or_id.isdigit()):
+            item_id = int(tag_or_id)
+            return [item_id] if item_id in self._items else []
+        return [item_id for item_id, item in self._items.items() if tag_or_id in item[3]]
+
+    def find_all(self):
+        self.calls += 1
+        return tuple(self._items)
+
+    def find_withtag(self, tag_or_id):
+        self.calls += 1
+        return tuple(self._resolve(tag_or_id))
+
+    def type(self, tag_or_id):
+        self.calls += 1
+        ids = self._resolve(tag_or_id)
+        return self._items[ids[0]][0] if ids else None
+
+    def gettags(self, tag_or_id):
+        self.calls += 1
+        ids = self._resolve(tag_or_id)
+        return self._items[ids[0]][3] if ids else ()
+
+    # Item geometry
+    def coords(self, tag_or_id, *args):
+        self.calls += 1
+        ids = self._resolve(tag_or_id)
+        if not ids:
+            return []
+        item = self._items[ids[0]]
+        if args:
+            item[1] = [float(value) for value in _flatten(args)]
+            return None
+        return list(item[1])
+
+    def move(self, tag_or_id, dx, dy):
+        self.calls += 1
+        for item_id in self._resolve(tag_or_id):
+            coords = self._items[item_id][1]
+            for i in range(0, len(coords) - 1, 2):
+                coords[i] += dx
+                coords[i + 1] += dy
+
+    def scale(self, tag_or_id, x_origin, y_origin, x_scale, y_scale):
+        self.calls += 1
+        for item_id in self._resolve(tag_or_id):
+            coords = self._items[item_id][1]
+            for i in range(0, len(coords) - 1, 2):
+                coords[i] = x_origin + (coords[i] - x_origin) * x_scale
+                coords[i + 1] = y_origin + (coords[i + 1] - y_origin) * y_scale
+
+    def bbox(self, tag_or_id):
+        self.calls += 1
+        xs, ys = [], []
+        for item_id in self._resolve(tag_or_id):
+            item_type, coords, options, tags = self._items[item_id]
+            if options.get("state") == "hidden":
+                continue
+            if item_type in ("text", "window") and len(coords) == 2:
+                # Rough text extent so bbox is never empty for labels
+                half = max(1, len(str(options.get("text", "")))) * 4
+                xs += [coords[0] - half, coords[0] + half]
+                ys += [coords[1] - 8, coords[1] + 8]
+            else:
+                xs += coords[0::2]
+                ys += coords[1::2]
+        if not xs:
+            return None
+        return (int(min(xs)) - 1, int(min(ys)) - 1, int(max(xs)) + 1, int(max(ys)) + 1)
+
+    # Item options
+    def itemconfig(self, tag_or_id, **options):
+        self.calls += 1
+        for item_id in self._resolve(tag_or_id):
+            self._items[item_id][2].update(options)
+
+    itemconfigure = itemconfig
+
+    def itemcget(self, tag_or_id, option):
+        self.calls += 1
+        ids = self._resolve(tag_or_id)
+        if not ids:
+            raise KeyError(tag_or_id)
+        value = self._items[ids[0]][2].get(option, "")
+        return "" if value is None else str(value)
+
+    def tag_raise(self, tag_or_id, above=None):
+        self.calls += 1
+
+    tag_lower = tag_raise
+    lift = tag_raise
+
+    def delete(self, *tags_or_ids):
+        self.calls += 1
+        for tag_or_id in tags_or_ids:
+            for item_id in self._resolve(tag_or_id):
+                del self._items[item_id]
+
+class HeadlessWidget:
+    """Stand-in for Frame/Button/Entry widgets when there is no display."""
+
+    def __init__(self, master=None, **options):
+        self.master = master
+        self.options = options
+        self.children = []
+        self.placed = None   # Keyword arguments of the last place() call
+        _add_child(master, self)
+
+    def pack(self, **kwargs):
+        pass
+
+    def pack_forget(self):
+        pass
+
+    def place(self, **kwargs):
+        self.placed = kwargs
+
+    def lift(self):
+        pass
+
+    def winfo_children(self):
+        return list(self.children)
+
+    def destroy(self):
+        for child in self.winfo_children():
+            child.destroy()
+        _remove_child(self.master, self)
+
+    def configure(self, **options):
+        self.options.update(options)
+
+    config = configure
+
+class _HeadlessTcl:
+    """Answers the few raw Tcl calls GameScreen makes."""
+
+    def __init__(self, root):
+        self.root = root
+
+    def call(self, *args):
+        if args[:2] == ("after", "info"):
+            return tuple(self.root._timers_by_id)
+        return ""
+
+class HeadlessRoot:
+    """
+    Stand-in for tk.Tk with a virtual clock.
+
+    after() callbacks are queued against simulated milliseconds and only run
+    when advance() or run_until() is called, so a game can be stepped as fast
+    as the CPU allows.
+    """
+
+    def __init__(self):
+        self.now_ms = 0
+        self._timers = []          # heap of (due_ms, seq, after_id)
+        self._timers_by_id = {}    # after_id -> callback
+        self._seq = itertools.count()
+        self.bindings = {}
+        self.children = []         # Live widgets, like Tk's winfo_children()
+        self.tk = _HeadlessTcl(self)
+        self.clock = _VirtualTime(self)   # GameScreen's time source (see GameScreen.clock)
+
+    # Tk root API used by the game
+    def after(self, delay_ms, callback=None, *args):
+        seq = next(self._seq)
+        after_id = f"after#{seq}"
+        if args:
+            callback = _bind_args(callback, args)
+        self._timers_by_id[after_id] = callback
+        heapq.heappush(self._timers, (self.now_ms + int(delay_ms), seq, after_id))
+        return after_id
+
+    def after_idle(self, callback, *args):
+        return self.after(0, callback, *args)
+
+    def after_cancel(self, after_id):
+        self._timers_by_id.pop(after_id, None)
+
+    def bind(self, sequence, func=None, add=None):
+        self.bindings[sequence] = func
+
+    def unbind(self, sequence, funcid=None):
+        self.bindings.pop(sequence, None)
+
+    def winfo_children(self):
+        return list(self.children)
+
+    def title(self, text=None):
+        pass
+
+    def geometry(self, spec=None):
+        pass
+
+    def resizable(self, width=None, height=None):
+        pass
+
+    def update(self):
+        pass
+
+    def update_idletasks(self):
+        pass
+
+    def destroy(self):
+        for child in self.winfo_children():
+            child.destroy()
+        self._timers.clear()
+        self._timers_by_id.clear()
+
+    # Simulation control
+    def pending_timers(self):
+        """Number of scheduled after() callbacks that haven't run or been cancelled."""
+        return len(self._timers_by_id)
+
+    def advance(self, ms):
+        """Run every callback due within the next `ms` simulated milliseconds."""
+        end = self.now_ms + ms
+        while self._timers and self._timers[0][0] <= end:
+            due_ms, _, after_id = heapq.heappop(self._timers)
+            callback = self._timers_by_id.pop(after_id, None)
+            if callback is None:
+                continue  # Cancelled
+            self.now_ms = max(self.now_ms, due_ms)
+            callback()
+        self.now_ms = end
+
+    def event(self, sequence):
+        """Fire a key binding as if the key had been pressed."""
+        handler = self.bindings.get(sequence)
+        if handler is not None:
+            handler(None)
+
+class _ConfigureEvent:
+    """The fields of a Tk <Configure> event that handlers read."""
+
+    def __init__(self, widget, width, height):
+        self.widget = widget
+        self.width = width
+        self.height = height
+
+def _add_child(master, widget):
+    if master is not None and hasattr(master, "children"):
+        master.children.append(widget)
+
+def _remove_child(master, widget):
+    if master is not None and widget in getattr(master, "children", ()):
+        master.children.remove(widget)
+
+def _bind_args(callback, args):
+    return lambda: callback(*args)
+
+def _flatten(values):
+    for value in values:
+        if isinstance(value, (list, tuple)):
+            yield from _flatten(value)
+        else:
+            yield value
+
+class _VirtualTime:
+    """Stands in for the time module: time() follows a HeadlessRoot's clock."""
+
+    def __init__(self, root):
+        self._root = root
+
+    def time(self):
+        return self._root.now_ms / 1000.0
+
+    def __getattr__(self, name):
+        # perf_counter(), sleep() etc. stay real
+        return getattr(time, name)
+
+@contextmanager
+def headless_tk(root):
+    """
+    Run the game's screens on a HeadlessRoot.
+
+    While active, tkinter's Canvas, Frame and Button are replaced by the
+    headless stand-ins. A GameScreen on a HeadlessRoot takes its time from
+    the root's virtual clock (root.clock), so cooldowns and timers behave as
+    they would in real time, and games on different roots don't share it. Sound
+    goes to the null sink unless $GALACTIC_AUDIO says otherwise.
+
+    Example usage:
+        root = HeadlessRoot()
+        with headless_tk(root):
+            game = ui.GameScreen(root, "Tester")
+            root.event("<space>")
+            root.advance(1000)
+    """
+    os.environ.setdefault("GALACTIC_AUDIO", "null")
+    saved = (tkinter.Canvas, tkinter.Frame, tkinter.Button)
+    tkinter.Canvas = HeadlessCanvas
+    tkinter.Frame = HeadlessWidget
+    tkinter.Button = HeadlessWidget
+    try:
+        yield root
+    finally:
+        tkinter.Canvas, tkinter.Frame, tkinter.Button = saved
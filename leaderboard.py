@@ -4,29 +4,100 @@
 
 import sqlite3
 import os
+import json
 import random
-from datetime import datetime
+import atexit
+import threading
+from bisect import bisect_right
+from collections import deque
+from datetime import datetime, timedelta
+from gamelog import get_logger
+from rankindex import RankIndex
+
+log = get_logger("leaderboard")
+
+# Time-windowed leaderboards and the bucket column each one is indexed by
+WINDOW_COLUMNS = {
+    "daily": "day_bucket",      # YYYYMMDD
+    "weekly": "week_bucket",    # YYYYMMDD of the week's Monday
+    "monthly": "month_bucket",  # YYYYMM
+}
+
+# SQLite expressions deriving each bucket from the date_time text (?4)
+_BUCKET_EXPRESSIONS = {
+    "day_bucket": "CAST(strftime('%Y%m%d', {0}) AS INTEGER)",
+    "week_bucket": "CAST(strftime('%Y%m%d', {0}, 'weekday 0', '-6 days') AS INTEGER)",
+    "month_bucket": "CAST(strftime('%Y%m', {0}) AS INTEGER)",
+}
+
+# Every insert goes through this statement so the buckets are always filled
+_INSERT_SCORE_SQL = (
+    "INSERT INTO leaderboard (player_name, score, level, date_time, "
+    "day_bucket, week_bucket, month_bucket) VALUES (?1, ?2, ?3, ?4, "
+    + ", ".join(_BUCKET_EXPRESSIONS[column].format("?4") for column in WINDOW_COLUMNS.values())
+    + ")"
+)
 
 class LeaderboardManager:
     """Manages the leaderboard database and space facts for Galactic Defenders."""
     
-    def __init__(self, db_path=None):
-        """Initialize the leaderboard manager with a database path."""
+    def __init__(self, db_path=None, cache_size=10, write_behind=False,
+                 flush_interval=0.05, batch_size=256):
+        """
+        Initialize the leaderboard manager with a database path.
+        
+        Args:
+            db_path (str): SQLite file to use (defaults to gamedata.db next to this file)
+            cache_size (int): Number of top rows kept in memory
+            write_behind (bool): Queue add_score calls and commit them in batches
+                from a background thread instead of committing each one
+            flush_interval (float): Seconds between background flushes
+            batch_size (int): Queue length that triggers an early flush
+        """
         # Use default path if none provided
         if db_path is None:
             self.db_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gamedata.db")
         else:
             self.db_path = db_path
             
+        # Keep one connection open for the lifetime of the manager so that
+        # PRAGMA data_version can tell our own writes apart from writes made
+        # by other processes sharing the same database file
+        # The write-behind thread shares it, so every use goes through _lock
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._lock = threading.RLock()
+        
         # Initialize database
         self._init_database()
         
+        # In-memory score cache (filled lazily on first read)
+        self.cache_size = cache_size
+        self._top_cache = None       # Top rows, highest score first
+        self._top_keys = None        # Negated scores of _top_cache, for bisect
+        self._rank_index = None      # RankIndex of every score, for ranks
+        self._data_version = None    # data_version the cache was built at
+        
+        # Write-behind queue of rows that are cached but not committed yet
+        self.write_behind = write_behind
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._pending = deque()
+        self._pending_ready = threading.Condition(self._lock)
+        self._writer = None
+        self._stopping = False
+        if write_behind:
+            self._start_writer()
+        
         # Load space facts
         self.space_facts = self._get_space_facts()
         
+        # Load the scores now, so the first rank lookup doesn't have to
+        with self._lock:
+            self._ensure_cache()
+        
     def _init_database(self):
         """Initialize the SQLite database with the required tables."""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._conn
         cursor = conn.cursor()
         
         # Create leaderboard table if it doesn't exist
@@ -36,71 +107,476 @@ class LeaderboardManager:
             player_name TEXT NOT NULL,
             score INTEGER NOT NULL,
             level INTEGER NOT NULL,
-            date_time TEXT NOT NULL
+            date_time TEXT NOT NULL,
+            day_bucket INTEGER,
+            week_bucket INTEGER,
+            month_bucket INTEGER
+        )
+        ''')
+        
+        # Older databases lack the bucket columns - add and backfill them
+        columns = {row[1] for row in cursor.execute("PRAGMA table_info(leaderboard)")}
+        for column, expression in _BUCKET_EXPRESSIONS.items():
+            if column not in columns:
+                cursor.execute(f"ALTER TABLE leaderboard ADD COLUMN {column} INTEGER")
+                cursor.execute(f"UPDATE leaderboard SET {column} = {expression.format('date_time')}")
+                
+        # (window, score) indexes so windowed top-N and rank queries are index
+        # range scans rather than full scans that parse date strings
+        for column in WINDOW_COLUMNS.values():
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_leaderboard_{column} ON leaderboard ({column}, score DESC)"
+            )
+        
+        # Index used to fetch a player's recent games
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_leaderboard_player ON leaderboard (player_name, id)"
+        )
+        
+        # Per-player summary kept up to date by a trigger, so stats are a
+        # single primary-key lookup instead of an aggregate over every game
+        has_stats = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'player_stats'"
+        ).fetchone()
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS player_stats (
+            player_name TEXT PRIMARY KEY,
+            games_played INTEGER NOT NULL,
+            total_score INTEGER NOT NULL,
+            best_score INTEGER NOT NULL,
+            max_level INTEGER NOT NULL,
+            last_played TEXT NOT NULL
         )
         ''')
         
+        # The trigger runs inside the INSERT's own transaction, so add_score,
+        # write-behind batches and bulk imports all keep the summary in step
+        cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_leaderboard_stats AFTER INSERT ON leaderboard
+        BEGIN
+            INSERT OR IGNORE INTO player_stats
+                (player_name, games_played, total_score, best_score, max_level, last_played)
+                VALUES (NEW.player_name, 0, 0, NEW.score, NEW.level, NEW.date_time);
+            UPDATE player_stats SET
+                games_played = games_played + 1,
+                total_score = total_score + NEW.score,
+                best_score = MAX(best_score, NEW.score),
+                max_level = MAX(max_level, NEW.level),
+                last_played = MAX(last_played, NEW.date_time)
+            WHERE player_name = NEW.player_name;
+        END
+        ''')
+        
+        # Databases created before player_stats existed need a one-off backfill
+        if not has_stats:
+            cursor.execute('''
+            INSERT INTO player_stats
+                SELECT player_name, COUNT(*), SUM(score), MAX(score), MAX(level), MAX(date_time)
+                FROM leaderboard GROUP BY player_name
+            ''')
+        
         conn.commit()
-        conn.close()
+        
+    def close(self):
+        """Flush queued scores, stop the writer thread and close the database connection."""
+        if self._writer is not None:
+            with self._lock:
+                self._stopping = True
+                self._pending_ready.notify()
+            self._writer.join()
+            self._writer = None
+            atexit.unregister(self.close)
+            
+        with self._lock:
+            if self._conn is not None:
+                self._flush_pending()
+                self._conn.close()
+                self._conn = None
+            self._invalidate_cache()
+            
+    def _start_writer(self):
+        """Start the background thread that commits queued scores."""
+        self._writer = threading.Thread(
+            target=self._writer_loop,
+            name="leaderboard-writer",
+            daemon=True
+        )
+        self._writer.start()
+        
+        # Make sure queued scores reach the disk when the game exits
+        atexit.register(self.close)
+        
+    def _writer_loop(self):
+        """Commit queued scores in grouped transactions until close() is called."""
+        with self._lock:
+            while True:
+                self._pending_ready.wait_for(
+                    lambda: self._stopping or len(self._pending) >= self.batch_size,
+                    timeout=self.flush_interval
+                )
+                self._flush_pending()
+                if self._stopping:
+                    return
+                    
+    def _flush_pending(self):
+        """Commit every queued score in one transaction (caller holds _lock)."""
+        if not self._pending:
+            return
+            
+        batch = list(self._pending)
+        try:
+            with self._conn:
+                self._conn.executemany(
+                    _INSERT_SCORE_SQL,
+                    batch
+                )
+        except sqlite3.Error as e:
+            # Leave the batch queued and retry on the next flush
+            log.error("Error flushing scores: %s", e)
+            return
+            
+        for _ in batch:
+            self._pending.popleft()
+            
+    def flush(self):
+        """Commit all queued scores now. Returns once they are on disk."""
+        with self._lock:
+            self._flush_pending()
+        
+    def _invalidate_cache(self):
+        """Drop the cached scores so the next read reloads them."""
+        self._top_cache = None
+        self._top_keys = None
+        self._rank_index = None
+        self._data_version = None
+        
+    def _current_data_version(self):
+        """Return SQLite's data_version, which changes when another connection commits."""
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+        
+    def _ensure_cache(self, limit=None):
+        """Make sure the cache is loaded, current and holds at least `limit` top rows."""
+        version = self._current_data_version()
+        if version != self._data_version:
+            # Another process changed the database (or nothing is cached yet)
+            self._invalidate_cache()
+            
+        reloaded = self._rank_index is None
+        if reloaded:
+            self._rank_index = RankIndex.from_counts(
+                self._conn.execute("SELECT score, COUNT(*) FROM leaderboard GROUP BY score"))
+            
+        wanted = max(self.cache_size, limit or 0)
+        if self._top_cache is None or (len(self._top_cache) < wanted and
+                                       len(self._top_cache) < len(self._rank_index)):
+            cursor = self._conn.execute(
+                "SELECT player_name, score, level, date_time FROM leaderboard "
+                "ORDER BY score DESC, id ASC LIMIT ?",
+                (wanted,)
+            )
+            self._top_cache = cursor.fetchall()
+            self._top_keys = [-row[1] for row in self._top_cache]
+            self.cache_size = wanted
+            
+            # Queued rows aren't in the database yet; a top-N reload alone
+            # would re-add those already in _rank_index, so skip them then
+            if reloaded:
+                for row in self._pending:
+                    self._cache_insert(row)
+            else:
+                for row in self._pending:
+                    self._top_insert(row)
+            
+        self._data_version = version
         
     def add_score(self, player_name, score, level):
         """Add a new score to the leaderboard."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
         # Get current date and time
         current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        row = (player_name, score, level, current_time)
         
-        # Insert the new score
-        cursor.execute(
-            "INSERT INTO leaderboard (player_name, score, level, date_time) VALUES (?, ?, ?, ?)",
-            (player_name, score, level, current_time)
-        )
+        with self._lock:
+            if self.write_behind:
+                # Queue the row for the writer thread; it is visible to
+                # reads straight away through the cache
+                self._pending.append(row)
+                self._cache_insert(row)
+                if len(self._pending) >= self.batch_size:
+                    self._pending_ready.notify()
+                return
+                
+            conn = self._conn
+            cursor = conn.cursor()
+            
+            # Insert the new score
+            cursor.execute(
+                _INSERT_SCORE_SQL,
+                row
+            )
+            
+            conn.commit()
+            
+            # Write-through: our own commit does not change data_version on this
+            # connection, so update the cache in place instead of reloading it
+            self._cache_insert(row)
+            
+    def submit_score(self, player_name, score, level):
+        """
+        Add a score and return its rank right away.
         
-        conn.commit()
-        conn.close()
+        In write-behind mode the rank is provisional: it counts queued scores
+        that haven't been committed yet.
+        """
+        with self._lock:
+            self.add_score(player_name, score, level)
+            return self.get_player_rank(player_name, score)
         
-    def get_top_scores(self, limit=10):
-        """Get the top scores from the leaderboard."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def submit_scores(self, scores):
+        """
+        Add several scores in one transaction and return their ranks.
         
-        # Get top scores ordered by score (highest first)
-        cursor.execute(
-            "SELECT player_name, score, level, date_time FROM leaderboard ORDER BY score DESC LIMIT ?",
-            (limit,)
-        )
+        Args:
+            scores (list): (player_name, score, level) tuples
+            
+        Returns:
+            list: The rank of each score, counting the whole batch
+        """
+        current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        rows = [(name, score, level, current_time) for name, score, level in scores]
+        
+        with self._lock:
+            if self.write_behind:
+                for row in rows:
+                    self._pending.append(row)
+                    self._cache_insert(row)
+                if len(self._pending) >= self.batch_size:
+                    self._pending_ready.notify()
+            else:
+                # All or nothing: the trigger keeps player_stats in the same transaction
+                with self._conn:
+                    self._conn.executemany(_INSERT_SCORE_SQL, rows)
+                for row in rows:
+                    self._cache_insert(row)
+                    
+            return [self.get_player_rank(row[0], row[1]) for row in rows]
+        
+    def _cache_insert(self, row):
+        """Insert a freshly committed row into the cached scores."""
+        if self._rank_index is None:
+            return  # Nothing cached yet; the next read loads everything
+            
+        self._rank_index.add(row[1])
+        self._top_insert(row)
         
-        top_scores = cursor.fetchall()
-        conn.close()
+    def _top_insert(self, row):
+        """Insert a row into the cached top-N list if it qualifies."""
+        score = row[1]
         
-        return top_scores
+        # New rows have the highest id, so they go after equal scores
+        position = bisect_right(self._top_keys, -score)
+        if position < self.cache_size:
+            self._top_cache.insert(position, row)
+            self._top_keys.insert(position, -score)
+            del self._top_cache[self.cache_size:]
+            del self._top_keys[self.cache_size:]
+        
+    def get_top_scores(self, limit=10):
+        """Get the top scores from the leaderboard."""
+        # Top scores ordered by score (highest first), served from the cache
+        with self._lock:
+            self._ensure_cache(limit)
+            return self._top_cache[:limit]
         
     def get_player_rank(self, player_name, score):
         """Get the rank of a player based on their score."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._lock:
+            self._ensure_cache()
+            
+            # Count how many scores are higher than this one (O(log n))
+            higher = self._rank_index.count_above(score)
         
-        # Count how many scores are higher than this one
-        cursor.execute(
-            "SELECT COUNT(*) FROM leaderboard WHERE score > ?",
-            (score,)
-        )
+        return higher + 1  # Add 1 because ranks start at 1
+        
+    def get_rank_index(self):
+        """
+        Return a copy of the score index for ranking scores without a query.
+        
+        The copy doesn't see later scores; fetch a new one to catch up
+        (GameScreen does at the start of each level).
         
-        rank = cursor.fetchone()[0] + 1  # Add 1 because ranks start at 1
-        conn.close()
+        Returns:
+            RankIndex: Every score on the all-time leaderboard
+        """
+        with self._lock:
+            self._ensure_cache()
+            return self._rank_index.copy()
         
-        return rank
+    def get_window_top_scores(self, window, limit=10, when=None):
+        """
+        Get the top scores of a daily, weekly or monthly leaderboard.
+        
+        Args:
+            window (str): "daily", "weekly", "monthly" or "all-time"
+            limit (int): Maximum number of rows
+            when (datetime): Any moment inside the wanted window (defaults to now)
+        """
+        if window == "all-time":
+            return self.get_top_scores(limit)
+            
+        column = _window_column(window)
+        with self._lock:
+            self._flush_pending()
+            cursor = self._conn.execute(
+                f"SELECT player_name, score, level, date_time FROM leaderboard "
+                f"WHERE {column} = ? ORDER BY score DESC, id ASC LIMIT ?",
+                (window_bucket(window, when), limit)
+            )
+            return cursor.fetchall()
+            
+    def get_window_rank(self, window, score, when=None):
+        """Get the rank a score has within a daily, weekly, monthly or all-time leaderboard."""
+        if window == "all-time":
+            return self.get_player_rank(None, score)
+            
+        column = _window_column(window)
+        with self._lock:
+            self._flush_pending()
+            higher = self._conn.execute(
+                f"SELECT COUNT(*) FROM leaderboard WHERE {column} = ? AND score > ?",
+                (window_bucket(window, when), score)
+            ).fetchone()[0]
+            
+        return higher + 1
+        
+    def get_player_stats(self, player_name):
+        """
+        Get the summary statistics for one player.
+        
+        Returns:
+            dict: games_played, best_score, average_score, max_level and
+            last_played, or None if the player has no recorded games
+        """
+        with self._lock:
+            # Queued scores count too, so commit them first
+            self._flush_pending()
+            row = self._conn.execute(
+                "SELECT games_played, total_score, best_score, max_level, last_played "
+                "FROM player_stats WHERE player_name = ?",
+                (player_name,)
+            ).fetchone()
+            
+        if row is None:
+            return None
+            
+        games_played, total_score, best_score, max_level, last_played = row
+        return {
+            "games_played": games_played,
+            "best_score": best_score,
+            "average_score": total_score / games_played,
+            "max_level": max_level,
+            "last_played": last_played
+        }
+        
+    def get_personal_best(self, player_name):
+        """Get a player's highest score, or 0 if they have never played."""
+        stats = self.get_player_stats(player_name)
+        return stats["best_score"] if stats else 0
+        
+    def get_recent_games(self, player_name, limit=5):
+        """Get a player's most recent (score, level, date_time) rows, newest first."""
+        with self._lock:
+            self._flush_pending()
+            cursor = self._conn.execute(
+                "SELECT score, level, date_time FROM leaderboard "
+                "WHERE player_name = ? ORDER BY id DESC LIMIT ?",
+                (player_name, limit)
+            )
+            return cursor.fetchall()
         
     def clear_leaderboard(self):
         """Clear all entries from the leaderboard."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._lock:
+            # Queued scores were submitted before the clear, so drop them too
+            self._pending.clear()
+            
+            conn = self._conn
+            cursor = conn.cursor()
+            
+            cursor.execute("DELETE FROM leaderboard")
+            cursor.execute("DELETE FROM player_stats")
+            
+            conn.commit()
+            self._invalidate_cache()
         
-        cursor.execute("DELETE FROM leaderboard")
+    def import_json(self, json_path, chunk_size=65536):
+        """
+        Bulk-import scores from a leaderboard.json style file.
         
-        conn.commit()
-        conn.close()
+        The file is read incrementally and every record is inserted with a
+        single executemany inside one transaction. Accepts either a list of
+        records or an object whose "scores" key holds that list. Each record
+        needs "name" and "score"; "level" defaults to 1 and "timestamp" to now.
+        
+        Returns:
+            int: Number of scores imported
+        """
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        imported = 0
+        
+        def rows():
+            nonlocal imported
+            for record in _iter_json_records(json_path, chunk_size):
+                imported += 1
+                yield (
+                    record["name"],
+                    int(record["score"]),
+                    int(record.get("level", 1)),
+                    record.get("timestamp", now)
+                )
+                
+        with self._lock:
+            with self._conn:  # Commits once at the end, rolls back on error
+                self._conn.executemany(
+                    _INSERT_SCORE_SQL,
+                    rows()
+                )
+            
+            # Our own commit doesn't bump data_version, so drop the cache by hand
+            self._invalidate_cache()
+        return imported
+        
+    def iter_scores(self):
+        """Yield every (player_name, score, level, date_time) row, highest score first."""
+        self.flush()
+        
+        # A separate read connection keeps a long export from holding _lock
+        conn = sqlite3.connect(self.db_path)
+        try:
+            cursor = conn.execute(
+                "SELECT player_name, score, level, date_time FROM leaderboard ORDER BY score DESC, id ASC"
+            )
+            # Iterating the cursor fetches rows on demand instead of all at once
+            for row in cursor:
+                yield row
+        finally:
+            conn.close()
+            
+    def export_json(self, json_path):
+        """
+        Export all scores to a leaderboard.json style file without loading them into memory.
+        
+        Returns:
+            int: Number of scores exported
+        """
+        count = 0
+        with open(json_path, "w", encoding="utf-8") as f:
+            f.write('{\n  "scores": [')
+            for name, score, level, date_time in self.iter_scores():
+                record = {"name": name, "score": score, "level": level, "timestamp": date_time}
+                f.write(("\n    " if count == 0 else ",\n    ") + json.dumps(record))
+                count += 1
+            f.write("\n  ]\n}\n")
+        return count
         
     def get_random_space_fact(self):
         """Return a random space fact."""
@@ -141,6 +617,83 @@ class LeaderboardManager:
             "In 3.75 billion years, the Milky Way and Andromeda galaxies will collide."
         ]
         
+
+def window_bucket(window, when=None):
+    """Return the bucket number that `when` (default: now) falls into for a window."""
+    when = when or datetime.now()
+    if window == "daily":
+        return int(when.strftime("%Y%m%d"))
+    if window == "weekly":
+        monday = when - timedelta(days=when.weekday())
+        return int(monday.strftime("%Y%m%d"))
+    if window == "monthly":
+        return int(when.strftime("%Y%m"))
+    raise ValueError(f"Unknown leaderboard window: {window}")
+
+def _window_column(window):
+    """Return the bucket column for a window name, rejecting unknown names."""
+    if window not in WINDOW_COLUMNS:
+        raise ValueError(f"Unknown leaderboard window: {window}")
+    return WINDOW_COLUMNS[window]
+
+_JSON_WHITESPACE = " \t\n\r"
+
+# A record cut off by the end of a chunk fails to decode within this many
+# characters of the end (a split literal like "fals" or escape like "\u00e")
+_JSON_SPLIT_TAIL = 6
+
+def _iter_json_records(json_path, chunk_size=65536):
+    """
+    Yield the records of a JSON score array one at a time.
+    
+    Only one chunk of the file is held in memory at once. The records are
+    taken from the first array in the file, which is either the top-level
+    list or the "scores" list of a leaderboard.json file.
+    """
+    decoder = json.JSONDecoder()
+    with open(json_path, "r", encoding="utf-8") as f:
+        buffer = ""
+        
+        # Skip ahead to the opening bracket of the array
+        while "[" not in buffer:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return  # No array at all - nothing to import
+            buffer += chunk
+        pos = buffer.index("[") + 1
+        dropped = 0  # Characters of the file before the start of buffer
+        
+        while True:
+            # Skip whitespace and separators between records
+            while pos < len(buffer) and (buffer[pos] in _JSON_WHITESPACE or buffer[pos] == ","):
+                pos += 1
+            if pos < len(buffer) and buffer[pos] == "]":
+                return
+                
+            if pos < len(buffer):
+                try:
+                    record, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError as e:
+                    # Only an error at the very end of the buffer (or a string
+                    # running off it) can be a record split across chunks;
+                    # anything else is malformed however much more we read
+                    if not (e.pos >= len(buffer) - _JSON_SPLIT_TAIL or
+                            e.msg.startswith("Unterminated string")):
+                        raise ValueError(f"Malformed JSON record at character "
+                                         f"{dropped + e.pos} of {json_path}: {e.msg}") from None
+                else:
+                    pos = end
+                    yield record
+                    continue
+                    
+            # The record is split across chunks - read more and retry
+            chunk = f.read(chunk_size)
+            if not chunk:
+                raise ValueError(f"Unexpected end of JSON data in {json_path}")
+            dropped += pos
+            buffer = buffer[pos:] + chunk
+            pos = 0
+        
 # For testing purposes
 if __name__ == "__main__":
     # Test the leaderboard functionality
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+# Galactic Defenders - Leaderboard Service Module
+# Shares one leaderboard between cabinets over a small HTTP/JSON API
+
+import argparse
+import atexit
+import http.client
+import json
+import os
+import queue
+import random
+import sqlite3
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, urlsplit
+
+import gamelog
+from leaderboard import LeaderboardManager
+from rankindex import RankIndex
+
+# Environment variable that points the game at a leaderboard service
+LEADERBOARD_URL_ENV = "GALACTIC_LEADERBOARD_URL"
+
+class LeaderboardRequestHandler(BaseHTTPRequestHandler):
+    """Serves LeaderboardManager calls as JSON over keep-alive HTTP/1.1."""
+
+    # HTTP/1.1 keeps the connection open between requests
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        """Handle read requests."""
+        url = urlsplit(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        parts = [part for part in url.path.split("/") if part]
+        manager = self.server.manager
+
+        try:
+            if parts == ["top"]:
+                rows = manager.get_top_scores(int(params.get("limit", 10)))
+                self._send_json({"scores": [list(row) for row in rows]})
+            elif parts == ["rank"]:
+                rank = manager.get_player_rank(params.get("name"), int(params["score"]))
+                self._send_json({"rank": rank})
+            elif parts == ["scores"]:
+                # Every distinct score and how often it occurs, for a client-side RankIndex
+                self._send_json({"counts": list(manager.get_rank_index().items())})
+            elif len(parts) == 2 and parts[0] == "window":
+                rows = manager.get_window_top_scores(parts[1], int(params.get("limit", 10)))
+                self._send_json({"scores": [list(row) for row in rows]})
+            elif len(parts) == 2 and parts[0] == "players":
+                self._send_json({"stats": manager.get_player_stats(parts[1])})
+            elif parts == ["facts"]:
+                self._send_json({"facts": manager.space_facts})
+            else:
+                self._send_json({"error": "not found"}, status=404)
+        except (KeyError, ValueError) as e:
+            self._send_json({"error": f"bad request: {e}"}, status=400)
+
+    def do_POST(self):
+        """Handle score submissions. The body is {"scores": [[name, score, level], ...]}."""
+        url = urlsplit(self.path)
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+
+        if url.path != "/scores":
+            self._send_json({"error": "not found"}, status=404)
+            return
+
+        # Check every row before storing any, so a bad row can't leave half
+        # a batch committed (the client would resend the whole batch)
+        try:
+            scores = [
+                (str(name), int(score), int(level))
+                for name, score, level in json.loads(body)["scores"]
+            ]
+        except (KeyError, TypeError, ValueError) as e:
+            self._send_json({"error": f"bad request: {e}"}, status=400)
+            return
+
+        try:
+            ranks = self.server.manager.submit_scores(scores)
+        except sqlite3.Error as e:
+            self._send_json({"error": f"database error: {e}"}, status=500)
+            return
+
+        self._send_json({"ranks": ranks})
+
+    def _send_json(self, payload, status=200):
+        """Send a JSON response with an explicit length so the connection can be reused."""
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        """Keep per-request logging off the console."""
+        pass
+
+class LeaderboardServer(ThreadingHTTPServer):
+    """Threaded HTTP server in front of one shared LeaderboardManager."""
+
+    daemon_threads = True
+
+    def __init__(self, manager, host="127.0.0.1", port=8765):
+        """Bind the server; port 0 picks a free port (see self.port)."""
+        self.manager = manager
+        super().__init__((host, port), LeaderboardRequestHandler)
+        self.host, self.port = self.server_address[:2]
+        self._thread = None
+
+    @property
+    def url(self):
+        """Base URL clients should use."""
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, name="leaderboard-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the socket (the manager is left open)."""
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+class _ConnectionPool:
+    """A small pool of keep-alive HTTP connections to one server."""
+
+    def __init__(self, host, port, size=4, timeout=2.0):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._idle = queue.LifoQueue(maxsize=size)
+
+    def request(self, method, path, payload=None):
+        """Send a request and return the decoded JSON response."""
+        body = None if payload is None else json.dumps(payload).encode("utf-8")
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+
+        # A pooled connection may have been closed by the server; retry once
+        # on a fresh connection in that case
+        for attempt in range(2):
+            conn = self._acquire() if attempt == 0 else self._connect()
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                data = response.read()
+            except (http.client.HTTPException, OSError):
+                conn.close()
+                if attempt == 1:
+                    raise
+                continue
+            self._release(conn)
+
+            result = json.loads(data)
+            if response.status != 200:
+                raise RuntimeError(f"Leaderboard service error {response.status}: {result.get('error')}")
+            return result
+
+    def _connect(self):
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._connect()
+
+    def _release(self, conn):
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def close(self):
+        """Close every idle connection."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+class RemoteLeaderboard:
+    """
+    Drop-in replacement for LeaderboardManager that talks to a LeaderboardServer.
+
+    Scores are batched locally and sent in one request when the batch is full
+    or before the next read. Reads are cached for `cache_ttl` seconds and the
+    cache is dropped whenever we submit scores.
+    """
+
+    def __init__(self, url, pool_size=4, batch_size=16, cache_ttl=2.0, timeout=2.0):
+        """Create a client for the service at `url` (e.g. http://127.0.0.1:8765)."""
+        parts = urlsplit(url)
+        self.url = url
+        self.batch_size = batch_size
+        self.cache_ttl = cache_ttl
+        self._pool = _ConnectionPool(parts.hostname, parts.port or 80, pool_size, timeout)
+        self._lock = threading.RLock()
+        self._pending = []
+        self._cache = {}
+        self._last_ranks = []
+        self._space_facts = None
+
+        # Make sure batched scores are sent when the game exits
+        atexit.register(self.close)
+
+    def _cached_get(self, path):
+        """GET a path, answering from the local cache while the entry is fresh."""
+        with self._lock:
+            self._flush_pending()
+            entry = self._cache.get(path)
+            if entry is not None and entry[0] > time.monotonic():
+                return entry[1]
+
+        result = self._pool.request("GET", path)
+        with self._lock:
+            self._cache[path] = (time.monotonic() + self.cache_ttl, result)
+        return result
+
+    def _flush_pending(self):
+        """Send every batched score in one request (caller holds _lock)."""
+        if not self._pending:
+            return
+        # The batch stays queued until the service has stored it; if the
+        # request fails it goes again with the next flush
+        batch = list(self._pending)
+        self._last_ranks = self._pool.request("POST", "/scores", {"scores": batch})["ranks"]
+        del self._pending[:len(batch)]
+        self._cache.clear()
+
+    def flush(self):
+        """Send batched scores now."""
+        with self._lock:
+            self._flush_pending()
+
+    def add_score(self, player_name, score, level):
+        """Queue a score; it is sent with the next batch."""
+        with self._lock:
+            self._pending.append([str(player_name), int(score), int(level)])
+            if len(self._pending) >= self.batch_size:
+                self._flush_pending()
+
+    def submit_score(self, player_name, score, level):
+        """Send a score (with anything already batched) and return its rank."""
+        with self._lock:
+            self._pending.append([str(player_name), int(score), int(level)])
+            self._flush_pending()
+            return self._last_ranks[-1]
+
+    def get_top_scores(self, limit=10):
+        """Get the top scores as (player_name, score, level, date_time) tuples."""
+        rows = self._cached_get(f"/top?limit={int(limit)}")["scores"]
+        return [tuple(row) for row in rows]
+
+    def get_player_rank(self, player_name, score):
+        """Get the rank of a player based on their score."""
+        return self._cached_get(f"/rank?score={int(score)}")["rank"]
+
+    def get_rank_index(self):
+        """Fetch every score into a local RankIndex, so ranks need no request."""
+        return RankIndex.from_counts(self._cached_get("/scores")["counts"])
+
+    def get_window_top_scores(self, window, limit=10):
+        """Get the top scores of a daily, weekly, monthly or all-time leaderboard."""
+        rows = self._cached_get(f"/window/{quote(window)}?limit={int(limit)}")["scores"]
+        return [tuple(row) for row in rows]
+
+    def get_player_stats(self, player_name):
+        """Get the summary statistics for one player (None if unknown)."""
+        return self._cached_get(f"/players/{quote(player_name)}")["stats"]
+
+    def get_personal_best(self, player_name):
+        """Get a player's highest score, or 0 if they have never played."""
+        stats = self.get_player_stats(player_name)
+        return stats["best_score"] if stats else 0
+
+    def get_random_space_fact(self):
+        """Return a random space fact (the list is fetched once and kept)."""
+        if self._space_facts is None:
+            self._space_facts = self._pool.request("GET", "/facts")["facts"]
+        return random.choice(self._space_facts)
+
+    def close(self):
+        """Send any batched scores and close the pooled connections."""
+        try:
+            self.flush()
+        finally:
+            self._pool.close()
+            atexit.unregister(self.close)
+
+def connect_leaderboard(url=None):
+    """
+    Return the leaderboard the game should use.
+
+    Uses the service at `url` (or $GALACTIC_LEADERBOARD_URL) when given,
+    otherwise a local LeaderboardManager.
+    """
+    url = url or os.environ.get(LEADERBOARD_URL_ENV)
+    if url:
+        return RemoteLeaderboard(url)
+    return LeaderboardManager()
+
+def main():
+    """Run the leaderboard service from the command line."""
+    parser = argparse.ArgumentParser(description="Galactic Defenders leaderboard service")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("--port", type=int, default=8765, help="port to listen on")
+    parser.add_argument("--db", default=None, help="SQLite database path (defaults to gamedata.db)")
+    parser.add_argument("--write-behind", action="store_true", help="batch database commits")
+    args = parser.parse_args()
+    gamelog.configure()
+
+    manager = LeaderboardManager(args.db, write_behind=args.write_behind)
+    server = LeaderboardServer(manager, args.host, args.port)
+    print(f"Leaderboard service listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        manager.close()
+
+if __name__ == "__main__":
+    main()
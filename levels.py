@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# Galactic Defenders - Levels Module
+# Loads the difficulty curves from levels.json and compiles them into a per-level table
+
+import json
+import os
+import threading
+from gamelog import get_logger
+
+log = get_logger("game")
+
+# The level file used unless $GALACTIC_LEVELS names another one
+DEFAULT_LEVELS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "levels.json")
+
+# Tunable parameters and their types. The names are the GameScreen
+# attributes each one sets.
+LEVEL_PARAMETERS = {
+    "enemy_speed": float,                 # Pixels per formation move
+    "enemy_move_delay": int,              # Frames between formation moves
+    "enemy_descent_distance": int,        # Pixels the formation drops at an edge
+    "max_enemy_bullets_onscreen": int,    # Enemy bullets allowed at once
+    "enemy_shot_cooldown": int,           # Milliseconds between enemy shots
+    "enemy_rows": int,                    # Rows in the formation
+    "enemy_bullet_speed": int,            # Pixels per frame
+}
+
+class LevelSettings:
+    """Everything that changes from one level to the next."""
+    __slots__ = ("level", "bonus_shield", "difficulty") + tuple(LEVEL_PARAMETERS)
+
+    def __init__(self, level, values, bonus_shield, difficulty):
+        self.level = level
+        self.bonus_shield = bonus_shield  # Award an extra shield when the level starts
+        self.difficulty = difficulty      # Label shown with the level banner
+        for name in LEVEL_PARAMETERS:
+            setattr(self, name, values[name])
+
+    def __repr__(self):
+        values = ", ".join(f"{name}={getattr(self, name)}" for name in LEVEL_PARAMETERS)
+        return f"LevelSettings(level={self.level}, {values})"
+
+def curve_value(curve, level):
+    """
+    Evaluate a difficulty curve at a level.
+
+    A curve is {"start", "step", "every", "first", "min", "max"}: the value is
+    `start` at level `first` (default 1) and changes by `step` every `every`
+    levels (default 1), clamped to [min, max]. Only "start" is required.
+
+    Example:
+        curve_value({"start": 4, "step": 1, "every": 2, "max": 7}, 5)  # -> 6
+    """
+    steps = max(0, level - curve.get("first", 1)) // curve.get("every", 1)
+    value = curve["start"] + curve.get("step", 0) * steps
+    if "min" in curve:
+        value = max(curve["min"], value)
+    if "max" in curve:
+        value = min(curve["max"], value)
+    return value
+
+class LevelTable:
+    """
+    Per-level settings compiled from a level configuration.
+
+    The configuration has difficulty curves for every parameter in
+    LEVEL_PARAMETERS, optional per-level overrides, how often a bonus shield
+    is awarded and the difficulty labels. The first `table_levels` levels are
+    compiled when the table is built, so a level transition is one list
+    lookup; later levels are compiled the first time they are reached.
+
+    Example usage:
+        table = LevelTable.from_file("levels.json")
+        settings = table.settings(level)
+        game.enemy_speed = settings.enemy_speed
+    """
+
+    def __init__(self, config):
+        """
+        Compile a level configuration.
+
+        Args:
+            config (dict): Parsed level file (see levels.json)
+
+        Raises:
+            ValueError: If a parameter is missing, unknown or malformed
+        """
+        self.curves = config.get("curves", {})
+        missing = [name for name in LEVEL_PARAMETERS if name not in self.curves]
+        unknown = [name for name in self.curves if name not in LEVEL_PARAMETERS]
+        if missing or unknown:
+            raise ValueError(f"Bad level curves: missing {missing}, unknown {unknown}")
+        for name, curve in self.curves.items():
+            if "start" not in curve or curve.get("every", 1) < 1:
+                raise ValueError(f"Bad curve for {name}: {curve}")
+
+        self.overrides = {}
+        for level, values in config.get("levels", {}).items():
+            unknown = [name for name in values if name not in LEVEL_PARAMETERS]
+            if unknown:
+                raise ValueError(f"Unknown parameters for level {level}: {unknown}")
+            self.overrides[int(level)] = values
+
+        self.bonus_shield_every = config.get("bonus_shield_every", 0)
+        # (first level, label) pairs, checked from the hardest down
+        self.difficulty = sorted((int(first), label) for first, label in
+                                 config.get("difficulty", [[1, "NORMAL"]]))
+
+        self.levels = []
+        self.extend(config.get("table_levels", 50))
+
+    @classmethod
+    def from_file(cls, path):
+        """Load and compile a level file. Raises OSError or ValueError."""
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def compile_level(self, level):
+        """Work out one level's settings from the curves and overrides."""
+        overrides = self.overrides.get(level, {})
+        values = {}
+        for name, kind in LEVEL_PARAMETERS.items():
+            value = overrides[name] if name in overrides else curve_value(self.curves[name], level)
+            # Round away float noise (2.6 + 0.6 * 3 = 4.3999999999999995)
+            values[name] = round(value, 6) if kind is float else int(value)
+        bonus_shield = bool(self.bonus_shield_every) and level % self.bonus_shield_every == 0
+        difficulty = self.difficulty[0][1] if self.difficulty else ""
+        for first, label in self.difficulty:
+            if level >= first:
+                difficulty = label
+        return LevelSettings(level, values, bonus_shield, difficulty)
+
+    def extend(self, count):
+        """Compile levels up to `count`."""
+        while len(self.levels) < count:
+            self.levels.append(self.compile_level(len(self.levels) + 1))
+
+    def settings(self, level):
+        """
+        Return the LevelSettings for a level (1 is the first).
+
+        Args:
+            level (int): Level number; levels below 1 are treated as level 1
+        """
+        index = max(1, level) - 1
+        if index >= len(self.levels):
+            self.extend(index + 1)
+        return self.levels[index]
+
+class LevelConfig:
+    """
+    A level table that reloads itself when its file changes.
+
+    The file's modification time is checked by reload_if_changed(), which
+    the game calls between levels, so tuning can be edited while the game
+    runs. A file that fails to load is logged and the previous table is kept.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._stamp = None
+        self.table = None
+        self.reload_if_changed()
+        if self.table is None:
+            # Fall back to the bundled curves rather than leave the game without levels
+            self.table = LevelTable.from_file(DEFAULT_LEVELS_PATH)
+
+    def _file_stamp(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def reload_if_changed(self):
+        """
+        Reload the table if the file was modified since it was last loaded.
+
+        Returns:
+            bool: True if a new table was loaded
+        """
+        stamp = self._file_stamp()
+        if stamp is None or stamp == self._stamp:
+            return False
+        self._stamp = stamp
+        try:
+            self.table = LevelTable.from_file(self.path)
+        except (OSError, ValueError, TypeError, KeyError) as e:
+            log.warning("Keeping the previous level table; %s failed to load: %s", self.path, e)
+            return False
+        log.info("Loaded level table from %s", self.path)
+        return True
+
+    def settings(self, level):
+        """The LevelSettings for a level, from the current table."""
+        return self.table.settings(level)
+
+_config = None
+_config_lock = threading.Lock()
+
+def get_level_config():
+    """
+    Return the game's shared LevelConfig, loading it on first use.
+
+    The file is $GALACTIC_LEVELS if set, otherwise the bundled levels.json.
+    """
+    global _config
+    with _config_lock:
+        if _config is None:
+            _config = LevelConfig(os.environ.get("GALACTIC_LEVELS") or DEFAULT_LEVELS_PATH)
+        return _config
@@ -2,21 +2,42 @@
 # Galactic Defenders - Main Entry Point
 # Developed by Ilan Uzan
 
+import os
 import tkinter as tk
-from ui import SplashScreen
+import gamelog
+from snapshot import read_checkpoint
+from ui import GameScreen, SplashScreen, open_leaderboard
+from utils import BackgroundTask
 
 def main():
     """Main entry point for Galactic Defenders game."""
+    # Log in the background (level and categories come from $GALACTIC_LOG)
+    gamelog.configure()
+    
     # Create the root window
     root = tk.Tk()
     root.title("Galactic Defenders")
-    root.resizable(False, False)
     
-    # Set window size to match game canvas (800x600)
-    root.geometry("800x600")
+    # The game scales to any window size; $GALACTIC_RESOLUTION picks the
+    # starting size (e.g. "1920x1080") or "fullscreen" for cabinet displays
+    resolution = os.environ.get("GALACTIC_RESOLUTION", "800x600")
+    if resolution == "fullscreen":
+        root.attributes("-fullscreen", True)
+    else:
+        root.geometry(resolution)
     
-    # Start with the splash screen
-    game = SplashScreen(root)
+    # Resume the game a reboot or crash interrupted, if checkpoints are on
+    # ($GALACTIC_CHECKPOINT); otherwise start with the splash screen
+    checkpoint_path = os.environ.get("GALACTIC_CHECKPOINT")
+    state = read_checkpoint(checkpoint_path) if checkpoint_path else None
+    if state is not None:
+        # Open the leaderboard in the background, as the splash screen does,
+        # so the live rank shows up without blocking the first frames
+        leaderboard_task = BackgroundTask(open_leaderboard, name="leaderboard-init").start()
+        game = GameScreen(root, state.player_name, leaderboard_task=leaderboard_task)
+        game.restore_state(state)
+    else:
+        game = SplashScreen(root)
     
     # Start the Tkinter event loop
     root.mainloop()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# Galactic Defenders - Particle Module
+# Pooled, budget-capped particle engine ticked from the game loop
+
+import math
+import random
+from array import array
+
+class ParticleEngine:
+    """
+    Runs every particle effect from one update() call per frame.
+
+    Particle state lives in flat arrays; slots [0, active) are live and a
+    dead particle is swapped with the last live one. Canvas ovals are pooled:
+    they are created once, hidden when their particle dies and reused by
+    the next emit, so effects never create or delete canvas items per frame.
+    When the budget is used up, new emits are trimmed instead of queueing
+    more work, so explosion storms degrade gracefully.
+
+    Example usage:
+        particles = ParticleEngine(canvas, budget=200)
+        particles.emit_burst(x, y, count=8, colors=["#FFFFFF"], speed=5, life=10)
+        # In game loop:
+        particles.update()
+    """
+
+    def __init__(self, canvas, budget=200, rng=None):
+        """
+        Initialize the engine.
+
+        Args:
+            canvas: Canvas to draw on
+            budget (int): Maximum number of live particles
+            rng (random.Random): Generator for colors, sizes and directions
+                (default: a new one)
+        """
+        self.canvas = canvas
+        self.budget = budget
+        self.rng = rng if rng is not None else random.Random()
+        self.density = 1.0  # Fraction of requested particles actually emitted
+
+        self.active = 0
+        self.x = array("d", bytes(8 * budget))
+        self.y = array("d", bytes(8 * budget))
+        self.dx = array("d", bytes(8 * budget))
+        self.dy = array("d", bytes(8 * budget))
+        self.size = array("d", bytes(8 * budget))
+        self.shrink = array("d", bytes(8 * budget))
+        self.life = array("i", bytes(4 * budget))
+        self.items = [0] * budget   # Canvas oval for each slot (0 = not created yet)
+
+        self.dropped = 0  # Particles refused because the budget was full
+
+    def __len__(self):
+        return self.active
+
+    def _spawn(self, x, y, dx, dy, size, life, color, shrink):
+        """Start one particle. Returns False when the budget is exhausted."""
+        slot = self.active
+        if slot >= self.budget:
+            self.dropped += 1
+            return False
+
+        item = self.items[slot]
+        if not item:
+            item = self.canvas.create_oval(
+                x - size, y - size, x + size, y + size,
+                fill=color, outline="", tags="particle"
+            )
+            self.items[slot] = item
+        else:
+            self.canvas.coords(item, x - size, y - size, x + size, y + size)
+            self.canvas.itemconfig(item, fill=color, state="normal")
+
+        self.x[slot] = x
+        self.y[slot] = y
+        self.dx[slot] = dx
+        self.dy[slot] = dy
+        self.size[slot] = size
+        self.shrink[slot] = shrink
+        self.life[slot] = life
+        self.active = slot + 1
+        return True
+
+    def _scaled(self, count):
+        """Apply the density setting to a requested particle count."""
+        return max(1, int(round(count * self.density))) if count > 0 else 0
+
+    def emit_burst(self, x, y, count, colors, speed, life, size=3, shrink=0.2):
+        """Emit `count` particles evenly spaced around a circle at a fixed speed."""
+        count = self._scaled(count)
+        for i in range(count):
+            angle = 2 * math.pi * i / count
+            if not self._spawn(x, y, math.cos(angle) * speed, math.sin(angle) * speed,
+                               size, life, self.rng.choice(colors), shrink):
+                break
+
+    def emit_random(self, x, y, count, colors, max_speed, size_range, life):
+        """Emit `count` particles in random directions with random speeds and sizes."""
+        for _ in range(self._scaled(count)):
+            size = self.rng.randint(*size_range)
+            angle = self.rng.uniform(0, 2 * math.pi)
+            speed = self.rng.uniform(1, max_speed)
+            # Shrink to nothing over the particle's lifetime
+            if not self._spawn(x, y, math.cos(angle) * speed, math.sin(angle) * speed,
+                               size, life, self.rng.choice(colors), size / life):
+                break
+
+    def update(self):
+        """Advance every live particle by one frame and retire the dead ones."""
+        canvas = self.canvas
+        x, y, dx, dy = self.x, self.y, self.dx, self.dy
+        size, shrink, life, items = self.size, self.shrink, self.life, self.items
+
+        slot = 0
+        while slot < self.active:
+            life[slot] -= 1
+            if life[slot] <= 0 or size[slot] <= 0:
+                self._retire(slot)
+                continue  # The last live particle now sits in this slot
+
+            x[slot] += dx[slot]
+            y[slot] += dy[slot]
+            size[slot] -= shrink[slot]
+            s = size[slot]
+            canvas.coords(items[slot], x[slot] - s, y[slot] - s, x[slot] + s, y[slot] + s)
+            slot += 1
+
+    def _retire(self, slot):
+        """Hide a particle's oval and swap the last live particle into its slot."""
+        last = self.active - 1
+        self.canvas.itemconfig(self.items[slot], state="hidden")
+        if slot != last:
+            for values in (self.x, self.y, self.dx, self.dy, self.size, self.shrink, self.life):
+                values[slot] = values[last]
+            self.items[slot], self.items[last] = self.items[last], self.items[slot]
+        self.active = last
+
+    def clear(self):
+        """Hide every live particle (the pooled ovals are kept for reuse)."""
+        while self.active:
+            self._retire(self.active - 1)
+
+    def reset(self):
+        """Forget the pooled ovals, e.g. after canvas.delete("all") removed them."""
+        self.active = 0
+        self.items = [0] * self.budget
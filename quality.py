@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# Galactic Defenders - Quality Module
+# Sheds visual effects when frames run long and restores them with headroom
+
+import time
+
+# Quality tiers, best first. Each tier lists what the game should draw.
+#   flash_style: "stipple" (full-screen stippled overlay), "border" (cheap
+#                outline around the screen) or "none"
+#   muzzle_flash: draw the flash when the player shoots
+#   particle_density: fraction of particles emitted per effect
+#   outline_anim_every: animate enemy outlines every N formation moves (0 = off)
+QUALITY_TIERS = [
+    {"name": "high", "flash_style": "stipple", "muzzle_flash": True,
+     "particle_density": 1.0, "outline_anim_every": 1},
+    {"name": "medium", "flash_style": "border", "muzzle_flash": True,
+     "particle_density": 0.75, "outline_anim_every": 2},
+    {"name": "low", "flash_style": "border", "muzzle_flash": False,
+     "particle_density": 0.5, "outline_anim_every": 4},
+    {"name": "minimal", "flash_style": "none", "muzzle_flash": False,
+     "particle_density": 0.25, "outline_anim_every": 0},
+]
+
+class QualityGovernor:
+    """
+    Picks a quality tier from measured frame times.
+
+    Frame times are smoothed with an exponential moving average. When the
+    average stays above `degrade_at` of the frame budget for `degrade_frames`
+    frames, quality drops one tier; when it stays below `restore_at` for
+    `restore_frames` frames, it goes back up one tier. The gap between the
+    two thresholds (and the longer restore window) stops it from flapping.
+
+    Example usage:
+        governor = QualityGovernor(frame_budget_ms=16)
+        # In game loop:
+        governor.record_frame(frame_ms)
+        if governor.settings["muzzle_flash"]:
+            ...
+    """
+
+    def __init__(self, frame_budget_ms=16, degrade_at=0.9, restore_at=0.5,
+                 degrade_frames=30, restore_frames=180, smoothing=0.1, on_change=None):
+        """
+        Initialize the governor at the highest tier.
+
+        Args:
+            frame_budget_ms (float): Time available per frame
+            degrade_at (float): Fraction of the budget that counts as pressure
+            restore_at (float): Fraction of the budget that counts as headroom
+            degrade_frames (int): Frames of pressure before dropping a tier
+            restore_frames (int): Frames of headroom before raising a tier
+            smoothing (float): Weight of the newest frame in the moving average
+            on_change: Called with the governor after every tier change
+        """
+        self.frame_budget_ms = frame_budget_ms
+        self.degrade_at = degrade_at
+        self.restore_at = restore_at
+        self.degrade_frames = degrade_frames
+        self.restore_frames = restore_frames
+        self.smoothing = smoothing
+        self.on_change = on_change
+
+        self.tier = 0
+        self.locked = False       # set_tier(..., lock=True) stops automatic changes
+        self.average_ms = 0.0
+        self.frames = 0
+        self._pressure = 0        # Consecutive frames over the degrade threshold
+        self._headroom = 0        # Consecutive frames under the restore threshold
+        self.transitions = []     # Recent (time, from_tier, to_tier, average_ms)
+
+    @property
+    def settings(self):
+        """What the current tier allows (see QUALITY_TIERS)."""
+        return QUALITY_TIERS[self.tier]
+
+    def record_frame(self, frame_ms):
+        """Feed one frame's duration in milliseconds and adjust the tier if needed."""
+        self.frames += 1
+        if self.frames == 1:
+            self.average_ms = frame_ms
+        else:
+            self.average_ms += self.smoothing * (frame_ms - self.average_ms)
+
+        if self.locked:
+            return
+
+        if self.average_ms > self.frame_budget_ms * self.degrade_at:
+            self._pressure += 1
+            self._headroom = 0
+            if self._pressure >= self.degrade_frames and self.tier < len(QUALITY_TIERS) - 1:
+                self._change_tier(self.tier + 1)
+        elif self.average_ms < self.frame_budget_ms * self.restore_at:
+            self._headroom += 1
+            self._pressure = 0
+            if self._headroom >= self.restore_frames and self.tier > 0:
+                self._change_tier(self.tier - 1)
+        else:
+            self._pressure = 0
+            self._headroom = 0
+
+    def set_tier(self, tier, lock=False):
+        """Force a tier (e.g. from a debug key); lock=True disables automatic changes."""
+        self.locked = lock
+        tier = max(0, min(tier, len(QUALITY_TIERS) - 1))
+        if tier != self.tier:
+            self._change_tier(tier)
+
+    def _change_tier(self, tier):
+        self.transitions.append((time.time(), self.tier, tier, round(self.average_ms, 2)))
+        del self.transitions[:-20]  # Keep only recent history
+        self.tier = tier
+        self._pressure = 0
+        self._headroom = 0
+        if self.on_change is not None:
+            self.on_change(self)
+
+    def debug_info(self):
+        """
+        Describe the governor's current state.
+
+        Returns:
+            dict: tier number and name, the active settings, the smoothed frame
+            time and the recent tier transitions
+        """
+        return {
+            "tier": self.tier,
+            "name": self.settings["name"],
+            "locked": self.locked,
+            "settings": dict(self.settings),
+            "average_frame_ms": round(self.average_ms, 3),
+            "frame_budget_ms": self.frame_budget_ms,
+            "frames": self.frames,
+            "transitions": list(self.transitions),
+        }
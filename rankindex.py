@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# Galactic Defenders - Rank Index Module
+# In-memory order-statistic index of leaderboard scores (a Fenwick tree over score buckets)
+
+class RankIndex:
+    """
+    Counts how many scores beat a given score in O(log n).
+
+    Scores are grouped into buckets of 2**bucket_bits points. A Fenwick
+    (binary indexed) tree over the bucket counts answers "how many scores
+    are in buckets above this one" in O(log buckets), and the bucket the
+    score itself falls in is settled exactly from its few distinct scores
+    (game scores move in steps of 10, so a 64-point bucket holds at most 7).
+    Adding a score is O(log buckets) too; the tree doubles when a score
+    lands past its end, up to MAX_BUCKETS. Scores past that share the last
+    bucket (as negative scores share the first), so memory follows the
+    number of scores rather than the size of the biggest one.
+
+    Example usage:
+        index = RankIndex.from_counts([(500, 2), (1200, 1)])
+        index.add(800)
+        index.rank(900)    # -> 2
+    """
+
+    # 4 million points at 64 per bucket; the tree is then about 1 MB
+    MAX_BUCKETS = 1 << 16
+
+    def __init__(self, bucket_bits=6, capacity=64):
+        """
+        Create an empty index.
+
+        Args:
+            bucket_bits (int): log2 of the points per bucket
+            capacity (int): Buckets to start with (rounded up to a power of two)
+        """
+        self.bucket_bits = bucket_bits
+        self.total = 0
+        self._size = 1
+        while self._size < capacity:
+            self._size *= 2
+        self._tree = [0] * (self._size + 1)   # 1-based Fenwick tree of bucket counts
+        self._counts = [0] * self._size       # Plain bucket counts, for resizing
+        self._scores = {}                      # bucket -> {score: count}
+
+    @classmethod
+    def from_counts(cls, counts, bucket_bits=6):
+        """
+        Build an index from (score, count) pairs in O(n), e.g. from
+        SELECT score, COUNT(*) ... GROUP BY score.
+        """
+        index = cls(bucket_bits)
+        buckets = {}
+        for score, count in counts:
+            bucket = index._bucket(score)
+            buckets[bucket] = buckets.get(bucket, 0) + count
+            scores = index._scores.setdefault(bucket, {})
+            scores[score] = scores.get(score, 0) + count
+            index.total += count
+        if buckets:
+            index._resize(max(buckets) + 1)
+        for bucket, count in buckets.items():
+            index._counts[bucket] = count
+        index._rebuild()
+        return index
+
+    def _bucket(self, score):
+        # Scores below zero share the first bucket and huge scores the last;
+        # their exact scores sort them out
+        return min(max(0, score >> self.bucket_bits), self.MAX_BUCKETS - 1)
+
+    def _resize(self, buckets):
+        size = self._size
+        while size < buckets:
+            size *= 2
+        if size != self._size:
+            self._counts.extend([0] * (size - self._size))
+            self._size = size
+
+    def _rebuild(self):
+        """Recompute the tree from the bucket counts in O(buckets)."""
+        tree = [0] * (self._size + 1)
+        tree[1:] = self._counts
+        for i in range(1, self._size + 1):
+            parent = i + (i & -i)
+            if parent <= self._size:
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def add(self, score, count=1):
+        """Record `count` more scores equal to `score`."""
+        bucket = self._bucket(score)
+        if bucket >= self._size:
+            self._resize(bucket + 1)
+            self._counts[bucket] += count
+            self._rebuild()
+        else:
+            self._counts[bucket] += count
+            i = bucket + 1
+            tree = self._tree
+            while i <= self._size:
+                tree[i] += count
+                i += i & -i
+        scores = self._scores.setdefault(bucket, {})
+        scores[score] = scores.get(score, 0) + count
+        self.total += count
+
+    def _count_through(self, bucket):
+        """Scores in buckets 0..bucket."""
+        total = 0
+        i = min(bucket + 1, self._size)
+        tree = self._tree
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def count_above(self, score):
+        """How many recorded scores are strictly higher than `score`."""
+        bucket = self._bucket(score)
+        if bucket >= self._size:
+            return 0
+        above = self.total - self._count_through(bucket)
+        for other, count in self._scores.get(bucket, {}).items():
+            if other > score:
+                above += count
+        return above
+
+    def rank(self, score):
+        """The leaderboard position `score` would take (1 is the top; ties share a rank)."""
+        return self.count_above(score) + 1
+
+    def items(self):
+        """Yield (score, count) for every distinct score, e.g. to rebuild it elsewhere."""
+        for scores in self._scores.values():
+            yield from scores.items()
+
+    def copy(self):
+        """An independent copy, e.g. for another thread to read while this one changes."""
+        other = RankIndex(self.bucket_bits, self._size)
+        other.total = self.total
+        other._tree = list(self._tree)
+        other._counts = list(self._counts)
+        other._scores = {bucket: dict(scores) for bucket, scores in self._scores.items()}
+        return other
+
+    def __len__(self):
+        return self.total
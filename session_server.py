@@ -0,0 +1,614 @@
+#!/usr/bin/env python3
+# Galactic Defenders - Session Server Module
+# Hosts many headless game sessions per process, spread over worker processes
+#
+# Usage:
+#   python session_server.py --workers 4 --port 8766
+#   python benchmarks/session_load.py --connect 127.0.0.1:8766 --sessions 32
+#
+# Clients speak JSON lines over TCP. Each request is an object with an "op"
+# and an optional "id" that is echoed in the reply:
+#   {"id": 1, "op": "create", "controller": "remote", "name": "Ann"}
+#       -> {"id": 1, "ok": true, "result": "0-1"}
+#   {"id": 2, "op": "input", "session": "0-1", "left": true, "fire": true}
+#   {"id": 3, "op": "state", "session": "0-1"}
+#   {"id": 4, "op": "metrics"}
+#   {"id": 5, "op": "spectate", "session": "0-1"}
+#       -> {"id": 5, "ok": true, "result": {"host": ..., "port": ..., "stream": "0-1"}}
+# Other ops: restart, close, list. See spectate.py for the spectator stream.
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from collections import deque
+
+import gamelog
+
+log = gamelog.get_logger("net")
+
+# Sessions tick at this rate. Each tick advances the game's clock by one
+# tick of real time (1000 / TICK_HZ ms, kept exact over many ticks), so
+# cooldowns and timers run at wall-clock speed. The game loop reschedules
+# itself every 16 ms, so a 60 Hz tick usually runs one frame and now and
+# then two, as the desktop game would on a fast machine.
+TICK_HZ = 60
+
+# Ticks to show the game over screen before a looping session restarts
+RESTART_AFTER_FRAMES = 120
+
+# A tick that starts more than this after its deadline counts as late
+# (asyncio's sleep routinely wakes a fraction of a millisecond past it)
+LATE_MS = 2.0
+
+# Tick times kept per worker for the percentiles in the metrics
+TICK_SAMPLES = 5000
+
+def usable_cpus():
+    """CPU cores this process may run on."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:   # Not on Linux
+        return os.cpu_count() or 1
+
+class RemoteInput:
+    """A controller fed by a client: the last input received is held until the next."""
+
+    def __init__(self):
+        from bot import PlayerInput
+        self.action = PlayerInput()
+
+    def tick(self, game):
+        return self.action
+
+class Session:
+    """
+    One game running on its own headless root, virtual clock and random
+    generator, so sessions in one worker don't affect each other.
+
+    step() moves the game on by one tick, so a session ticked tick_hz times
+    a second plays in real time, and the game logic is the same GameScreen
+    code the desktop game runs.
+    """
+
+    def __init__(self, session_id, controller, name, leaderboard, auto_restart,
+                 tick_hz=TICK_HZ, seed=None):
+        """
+        Start a game.
+
+        Args:
+            session_id (str): "<worker>-<number>"
+            controller: Object with tick(game), see GameScreen.set_controller()
+            name (str): Player name for the leaderboard
+            leaderboard: The worker's shared leaderboard
+            auto_restart (bool): Start a new game a little after game over
+            tick_hz (int): Ticks per second the session is stepped at
+            seed (int): Seed for the game's random numbers (default: random)
+        """
+        import headless
+        import ui
+
+        self.id = session_id
+        self.controller = controller
+        self.auto_restart = auto_restart
+        self.tick_hz = tick_hz
+        self.root = headless.HeadlessRoot()
+        self.game = ui.GameScreen(self.root, name, seed=seed)
+        self.game.leaderboard = leaderboard
+        self.game.set_controller(controller)
+        self.frames = 0
+        self.games = 1
+        self.late = 0       # Ticks that started after their deadline
+        self.dropped = 0    # Ticks skipped to catch up after falling behind
+        self.over_frames = 0
+        self.frame_listeners = []   # Called with the session after every frame
+
+    def step(self):
+        """Play one tick."""
+        if not self.game.game_running and self.auto_restart:
+            self.over_frames += 1
+            if self.over_frames >= RESTART_AFTER_FRAMES:
+                self.restart()
+        self.frames += 1
+        # Round the running total rather than each tick, so no drift builds up
+        self.root.advance(round(self.frames * 1000 / self.tick_hz) - self.root.now_ms)
+        for listener in self.frame_listeners:
+            listener(self)
+
+    def restart(self):
+        """Leave the game over screen for a new game, as the space bar does."""
+        if not self.game.game_running:
+            self.root.event("<space>")
+            self.games += 1
+            self.over_frames = 0
+
+    def status(self):
+        """The session's game state for clients."""
+        game = self.game
+        return {
+            "session": self.id,
+            "player": game.player_name,
+            "running": game.game_running,
+            "score": game.score,
+            "level": game.level,
+            "shields": game.shields,
+            "enemies": len(game.enemies),
+            "frames": self.frames,
+            "games": self.games,
+        }
+
+    def close(self):
+        """Stop the game and drop its timers."""
+        self.game.set_controller(None)
+        self.game.game_running = False
+        self.game.wait_for_results()  # The shared leaderboard may be closed next
+        self.root.destroy()
+
+class SessionWorker:
+    """
+    Runs sessions in one process, each ticking on the same asyncio loop.
+
+    Every session is a task that steps its game and sleeps until its next
+    deadline. A tick that starts late is counted; if a session falls more
+    than a frame behind, the missed ticks are dropped (and counted) rather
+    than run back to back, so an overloaded worker slows its games down
+    instead of bursting.
+
+    Commands arrive from the SessionManager over a multiprocessing pipe
+    as (request id, op, arguments) and are answered with
+    (request id, ok, result).
+    """
+
+    def __init__(self, index, conn, tick_hz=TICK_HZ, db_path=None, spectate_host="127.0.0.1"):
+        self.index = index
+        self.conn = conn
+        self.tick_hz = tick_hz
+        self.db_path = db_path
+        self.spectate_host = spectate_host
+        self.sessions = {}
+        self.next_number = 1
+        self.reset_metrics()
+
+    def run(self):
+        """Serve until the manager stops the worker (blocks)."""
+        asyncio.run(self._main())
+
+    async def _main(self):
+        import headless
+        from leaderboard import LeaderboardManager
+        from spectate import SpectatorServer
+
+        # Several sessions must never share one checkpoint file
+        os.environ.pop("GALACTIC_CHECKPOINT", None)
+        self.loop = asyncio.get_running_loop()
+        self.stopped = asyncio.Event()
+        with headless.headless_tk(headless.HeadlessRoot()), tempfile.TemporaryDirectory() as tmp:
+            self.leaderboard = LeaderboardManager(
+                self.db_path or os.path.join(tmp, f"sessions-{self.index}.db"))
+            # Viewers of this worker's sessions connect here (see op_spectate)
+            self.spectators = SpectatorServer(self.spectate_host, port=0)
+            await self.spectators.start()
+            self.loop.add_reader(self.conn.fileno(), self._on_command)
+            try:
+                await self.stopped.wait()
+            finally:
+                self.loop.remove_reader(self.conn.fileno())
+                for session_id in list(self.sessions):
+                    self.op_close(session_id)
+                await self.spectators.stop()
+                self.leaderboard.close()
+
+    def _on_command(self):
+        while self.conn.poll():
+            try:
+                request_id, op, args = self.conn.recv()
+            except (EOFError, OSError):
+                self.stopped.set()   # The manager went away
+                self.loop.remove_reader(self.conn.fileno())
+                return
+            try:
+                result = getattr(self, "op_" + op)(**args)
+                reply = (request_id, True, result)
+            except Exception as e:
+                reply = (request_id, False, f"{type(e).__name__}: {e}")
+            self.conn.send(reply)
+
+    async def _run_session(self, session):
+        period = 1.0 / self.tick_hz
+        deadline = self.loop.time()
+        while session.id in self.sessions:
+            started = time.perf_counter()
+            try:
+                session.step()
+            except Exception as e:
+                log.error("Session %s failed: %s", session.id, e, exc_info=True)
+                self.op_close(session.id)
+                return
+            self.tick_ms.append((time.perf_counter() - started) * 1000)
+            self.frames += 1
+
+            deadline += period
+            delay = deadline - self.loop.time()
+            if delay < -LATE_MS / 1000:
+                session.late += 1
+                self.late += 1
+            if delay < 0:
+                if delay < -period:
+                    missed = int(-delay / period)
+                    session.dropped += missed
+                    self.dropped += missed
+                    deadline += missed * period
+                await asyncio.sleep(0)   # Let the other sessions run
+            else:
+                await asyncio.sleep(delay)
+
+    def session(self, session_id):
+        try:
+            return self.sessions[session_id]
+        except KeyError:
+            raise KeyError(f"no session {session_id}") from None
+
+    # Commands
+
+    def op_create(self, controller="bot", name="Player", auto_restart=None, seed=None):
+        """Start a session driven by the reference bot or by client input (seed: replay a game)."""
+        if controller == "bot":
+            from bot import ReferenceBot
+            driver = ReferenceBot()
+        elif controller == "remote":
+            driver = RemoteInput()
+        else:
+            raise ValueError(f"unknown controller {controller!r}")
+        if auto_restart is None:
+            auto_restart = controller == "bot"
+        session_id = f"{self.index}-{self.next_number}"
+        self.next_number += 1
+        session = Session(session_id, driver, name, self.leaderboard, auto_restart,
+                          self.tick_hz, seed)
+        self._count_session_time()
+        self.sessions[session_id] = session
+        self.loop.create_task(self._run_session(session))
+        return session_id
+
+    def op_input(self, session, left=False, right=False, fire=False):
+        """Set a remote-controlled session's controls until the next input."""
+        driver = self.session(session).controller
+        if not isinstance(driver, RemoteInput):
+            raise ValueError(f"session {session} is not remote-controlled")
+        from bot import PlayerInput
+        driver.action = PlayerInput(bool(left), bool(right), bool(fire))
+
+    def op_state(self, session):
+        return self.session(session).status()
+
+    def op_restart(self, session):
+        self.session(session).restart()
+
+    def op_close(self, session):
+        self._count_session_time()
+        self.sessions.pop(session).close()
+        self.spectators.remove_stream(session)
+
+    def op_spectate(self, session):
+        """Broadcast a session to viewers. Returns where to connect (see spectate.py)."""
+        watched = self.session(session)
+        if session not in self.spectators.streams:
+            stream = self.spectators.add_stream(session)
+            watched.frame_listeners.append(lambda watched: stream.publish(watched.game))
+        return {"host": self.spectators.host, "port": self.spectators.port, "stream": session}
+
+    def op_list(self):
+        return [session.status() for session in self.sessions.values()]
+
+    def op_metrics(self, reset=False):
+        """Throughput since the last reset (see reset_metrics)."""
+        self._count_session_time()
+        wall = time.perf_counter() - self.started
+        cpu = time.process_time() - self.cpu_started
+        ticks = sorted(self.tick_ms)
+        metrics = {
+            "worker": self.index,
+            "pid": os.getpid(),
+            "sessions": len(self.sessions),
+            "seconds": round(wall, 3),
+            "session_seconds": round(self.session_seconds, 3),
+            "cpu_seconds": round(cpu, 3),
+            "frames": self.frames,
+            "late": self.late,
+            "dropped": self.dropped,
+            "tick_ms_mean": round(sum(ticks) / len(ticks), 3) if ticks else 0.0,
+            "tick_ms_p99": round(ticks[min(len(ticks) - 1, int(0.99 * len(ticks)))], 3) if ticks else 0.0,
+        }
+        if reset:
+            self.reset_metrics()
+        return metrics
+
+    def op_stop(self):
+        self.stopped.set()
+
+    def _count_session_time(self):
+        # Seconds summed over the sessions alive, so the tick rate per
+        # session stays right when sessions come and go mid-measurement
+        now = time.perf_counter()
+        self.session_seconds += len(self.sessions) * (now - self.counted_at)
+        self.counted_at = now
+
+    def reset_metrics(self):
+        self.started = self.counted_at = time.perf_counter()
+        self.session_seconds = 0.0
+        self.cpu_started = time.process_time()
+        self.frames = 0
+        self.late = 0
+        self.dropped = 0
+        self.tick_ms = deque(maxlen=TICK_SAMPLES)
+
+def _worker_main(index, conn, tick_hz, db_path, spectate_host):
+    gamelog.configure()
+    SessionWorker(index, conn, tick_hz, db_path, spectate_host).run()
+
+def summarize_metrics(workers, tick_hz=TICK_HZ):
+    """
+    Combine the workers' metrics into throughput figures.
+
+    Returns:
+        dict: Totals plus the achieved tick rate per session, the share of
+            late ticks, and how many sessions one core could tick at tick_hz
+            (from the CPU time each tick took)
+    """
+    frames = sum(worker["frames"] for worker in workers)
+    cpu = sum(worker["cpu_seconds"] for worker in workers)
+    sessions = sum(worker["sessions"] for worker in workers)
+    seconds = max((worker["seconds"] for worker in workers), default=0.0)
+    session_seconds = sum(worker["session_seconds"] for worker in workers)
+    return {
+        "workers": len(workers),
+        "sessions": sessions,
+        "frames": frames,
+        "seconds": seconds,
+        "tick_hz_per_session": round(frames / session_seconds, 2) if session_seconds else 0.0,
+        "late_fraction": round(sum(w["late"] for w in workers) / frames, 4) if frames else 0.0,
+        "dropped": sum(worker["dropped"] for worker in workers),
+        "cpu_ms_per_tick": round(cpu * 1000 / frames, 3) if frames else 0.0,
+        "sessions_per_core": round(frames / cpu / tick_hz, 1) if cpu else 0.0,
+        "per_worker": workers,
+    }
+
+class SessionManager:
+    """
+    Starts the worker processes and routes session commands to them.
+
+    New sessions go to the worker with the fewest, and a session's id says
+    which worker has it. All methods are coroutines for the asyncio loop the
+    manager was started on.
+
+    Example usage:
+        manager = SessionManager(workers=4)
+        await manager.start()
+        session = await manager.create_session(controller="bot")
+        print(await manager.call_session(session, "state"))
+        await manager.stop()
+    """
+
+    def __init__(self, workers=None, tick_hz=TICK_HZ, db_path=None, spectate_host="127.0.0.1"):
+        """
+        Args:
+            workers (int): Worker processes (default: one per CPU core)
+            tick_hz (int): Ticks per second for every session
+            db_path (str): Leaderboard database the workers share (default:
+                a temporary one per worker)
+            spectate_host (str): Address the workers take spectators on
+        """
+        self.worker_count = workers or usable_cpus()
+        self.tick_hz = tick_hz
+        self.db_path = db_path
+        self.spectate_host = spectate_host
+        self.processes = []
+        self.conns = []
+        self.session_counts = []
+        self._futures = {}
+        self._next_request = 0
+
+    async def start(self):
+        """Start the workers."""
+        self.loop = asyncio.get_running_loop()
+        for index in range(self.worker_count):
+            parent, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_worker_main,
+                args=(index, child, self.tick_hz, self.db_path, self.spectate_host),
+                name=f"session-worker-{index}", daemon=True)
+            process.start()
+            child.close()
+            self.processes.append(process)
+            self.conns.append(parent)
+            self.session_counts.append(0)
+            self.loop.add_reader(parent.fileno(), self._on_reply, index)
+
+    def _on_reply(self, index):
+        conn = self.conns[index]
+        while conn.poll():
+            try:
+                request_id, ok, result = conn.recv()
+            except (EOFError, OSError):
+                self.loop.remove_reader(conn.fileno())
+                error = ConnectionError(f"session worker {index} exited")
+                for future in self._futures.values():
+                    if not future.done():
+                        future.set_exception(error)
+                return
+            future = self._futures.pop(request_id, None)
+            if future is None or future.done():
+                continue
+            if ok:
+                future.set_result(result)
+            else:
+                future.set_exception(RuntimeError(result))
+
+    async def call(self, worker, op, **args):
+        """Run a command on one worker and return its result."""
+        self._next_request += 1
+        request_id = self._next_request
+        future = self.loop.create_future()
+        self._futures[request_id] = future
+        self.conns[worker].send((request_id, op, args))
+        return await future
+
+    def worker_of(self, session_id):
+        try:
+            worker = int(str(session_id).split("-", 1)[0])
+        except ValueError:
+            raise KeyError(f"no session {session_id}") from None
+        if not 0 <= worker < self.worker_count:
+            raise KeyError(f"no session {session_id}")
+        return worker
+
+    async def create_session(self, **options):
+        """Start a session on the least loaded worker. Returns its id."""
+        worker = min(range(self.worker_count), key=self.session_counts.__getitem__)
+        self.session_counts[worker] += 1
+        try:
+            return await self.call(worker, "create", **options)
+        except Exception:
+            self.session_counts[worker] -= 1
+            raise
+
+    async def call_session(self, session_id, op, **args):
+        """Run a session command (input, state, restart, close, spectate) on its worker."""
+        worker = self.worker_of(session_id)
+        result = await self.call(worker, op, session=session_id, **args)
+        if op == "close":
+            self.session_counts[worker] -= 1
+        return result
+
+    async def list_sessions(self):
+        lists = await asyncio.gather(*(self.call(worker, "list")
+                                       for worker in range(self.worker_count)))
+        return [status for statuses in lists for status in statuses]
+
+    async def metrics(self, reset=False):
+        """Throughput over every worker, see summarize_metrics()."""
+        workers = await asyncio.gather(*(self.call(worker, "metrics", reset=reset)
+                                         for worker in range(self.worker_count)))
+        return summarize_metrics(list(workers), self.tick_hz)
+
+    async def stop(self):
+        """Stop the workers and wait for them to exit."""
+        for index, conn in enumerate(self.conns):
+            self.loop.remove_reader(conn.fileno())
+            try:
+                conn.send((0, "stop", {}))
+            except OSError:
+                pass
+        for process in self.processes:
+            await self.loop.run_in_executor(None, process.join, 5)
+            if process.is_alive():
+                process.terminate()
+        for conn in self.conns:
+            conn.close()
+
+class SessionServer:
+    """
+    JSON-lines TCP front end for a SessionManager.
+
+    Example usage:
+        server = SessionServer(manager, port=0)
+        await server.start()
+        print(server.port)
+    """
+
+    # Ops that act on one session and need its "session" id
+    SESSION_OPS = {"input", "state", "restart", "close", "spectate"}
+
+    def __init__(self, manager, host="127.0.0.1", port=8766):
+        self.manager = manager
+        self.host = host
+        self.port = port
+        self.server = None
+
+    async def start(self):
+        """Start listening; port 0 picks a free port (see self.port)."""
+        self.server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _handle_client(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                reply = await self.handle_request(line)
+                writer.write(json.dumps(reply).encode("utf-8") + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def handle_request(self, line):
+        """Run one JSON request line and return the reply object."""
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.pop("id", None)
+            op = request.pop("op")
+            if op == "create":
+                result = await self.manager.create_session(**request)
+            elif op in self.SESSION_OPS:
+                result = await self.manager.call_session(request.pop("session"), op, **request)
+            elif op == "list":
+                result = await self.manager.list_sessions()
+            elif op == "metrics":
+                result = await self.manager.metrics(reset=bool(request.get("reset")))
+            else:
+                raise ValueError(f"unknown op {op!r}")
+        except (KeyError, TypeError, ValueError, RuntimeError) as e:
+            return {"id": request_id, "ok": False, "error": str(e)}
+        return {"id": request_id, "ok": True, "result": result}
+
+async def serve(args):
+    manager = SessionManager(args.workers, args.tick_hz, args.db, spectate_host=args.host)
+    await manager.start()
+    server = SessionServer(manager, args.host, args.port)
+    await server.start()
+    print(f"Session server on {server.host}:{server.port} with {manager.worker_count} workers")
+    for _ in range(args.bots):
+        await manager.create_session(controller="bot", name="Bot")
+    try:
+        while True:
+            await asyncio.sleep(args.report or 3600)
+            if args.report:
+                summary = await manager.metrics(reset=True)
+                print(f"{summary['sessions']} sessions: {summary['tick_hz_per_session']} Hz each, "
+                      f"{summary['late_fraction']:.1%} late, {summary['cpu_ms_per_tick']} ms CPU/tick, "
+                      f"~{summary['sessions_per_core']} sessions/core at {args.tick_hz} Hz")
+    finally:
+        await server.stop()
+        await manager.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description="Galactic Defenders multi-session server")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("--port", type=int, default=8766, help="port to listen on")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: one per CPU core)")
+    parser.add_argument("--tick-hz", type=int, default=TICK_HZ, help="ticks per second per session")
+    parser.add_argument("--db", default=None, help="leaderboard database shared by the workers")
+    parser.add_argument("--bots", type=int, default=0, help="bot sessions to start with")
+    parser.add_argument("--report", type=float, default=0,
+                        help="print throughput every N seconds")
+    args = parser.parse_args()
+    gamelog.configure()
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
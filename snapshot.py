@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# Galactic Defenders - Snapshot Module
+# Compact binary snapshots of a running game, and periodic checkpoints to disk
+
+import os
+import struct
+import threading
+import time
+import zlib
+from array import array
+from gamelog import get_logger
+
+log = get_logger("game")
+
+MAGIC = b"GDSV"
+VERSION = 1
+
+# Header: magic, version, CRC-32 of everything after the header
+_HEADER = struct.Struct("<4sHI")
+
+# Fixed-size fields, in GameState.SCALARS order
+_SCALARS = struct.Struct("<iHhBdbidiiiiHHiddddH")
+
+# Random module state: version, 625 words of Mersenne Twister state, cached gauss
+_RNG = struct.Struct("<B625IBd")
+
+class GameState:
+    """
+    Everything needed to put a game back exactly where it was.
+
+    Canvas items are not stored: the game redraws them from this state.
+    Times are stored as ages (milliseconds before the snapshot), so they
+    stay valid when the snapshot is restored later or on another machine.
+    """
+
+    # Scalar fields, packed with _SCALARS
+    SCALARS = ("score", "level", "shields", "flags", "player_x",
+               "enemy_direction", "enemy_move_timer", "enemy_speed", "enemy_move_delay",
+               "enemy_descent_distance", "max_enemy_bullets_onscreen", "enemy_shot_cooldown",
+               "enemy_rows", "enemy_cols", "enemy_bullet_speed",
+               "last_shot_age", "enemy_last_shot_age", "offset_x", "offset_y",
+               "barrier_count")
+
+    # flags bits
+    PAUSED = 1
+    BETWEEN_LEVELS = 2   # The wave was cleared and the next one hasn't spawned yet
+
+    __slots__ = SCALARS + ("player_name", "enemy_slots", "bullets", "enemy_bullets",
+                           "barrier_health", "rng_state")
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields.get(name))
+
+    def __repr__(self):
+        return (f"GameState(player={self.player_name!r}, score={self.score}, level={self.level}, "
+                f"enemies={len(self.enemy_slots)}, bullets={len(self.bullets) // 4}"
+                f"+{len(self.enemy_bullets) // 4})")
+
+def encode(state):
+    """
+    Pack a GameState into bytes.
+
+    Layout after the header: the scalars, the player name, the alive enemy
+    slots in list order (uint16), player and enemy bullets as (x, y, dx, dy)
+    doubles, one health byte per barrier block, then the RNG state.
+    """
+    name = state.player_name.encode("utf-8")[:255]
+    parts = [
+        _SCALARS.pack(*(getattr(state, field) for field in GameState.SCALARS)),
+        bytes((len(name),)), name,
+        struct.pack("<H", len(state.enemy_slots)), state.enemy_slots.tobytes(),
+        struct.pack("<H", len(state.bullets) // 4), state.bullets.tobytes(),
+        struct.pack("<H", len(state.enemy_bullets) // 4), state.enemy_bullets.tobytes(),
+        bytes(state.barrier_health),
+    ]
+    version, words, gauss = state.rng_state
+    parts.append(_RNG.pack(version, *words, gauss is not None, gauss or 0.0))
+    payload = b"".join(parts)
+    return _HEADER.pack(MAGIC, VERSION, zlib.crc32(payload)) + payload
+
+def decode(data):
+    """
+    Unpack bytes made by encode().
+
+    Raises:
+        ValueError: If the data is not a snapshot, is from another version
+            or is damaged
+    """
+    if len(data) < _HEADER.size:
+        raise ValueError("Snapshot is truncated")
+    magic, version, crc = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a game snapshot")
+    if version != VERSION:
+        raise ValueError(f"Unsupported snapshot version {version}")
+    payload = memoryview(data)[_HEADER.size:]
+    if zlib.crc32(payload) != crc:
+        raise ValueError("Snapshot checksum mismatch")
+
+    try:
+        state = GameState(**dict(zip(GameState.SCALARS, _SCALARS.unpack_from(payload))))
+        offset = _SCALARS.size
+        length = payload[offset]
+        state.player_name = bytes(payload[offset + 1:offset + 1 + length]).decode("utf-8")
+        offset += 1 + length
+
+        def read_array(typecode, count):
+            nonlocal offset
+            values = array(typecode)
+            values.frombytes(payload[offset:offset + count * values.itemsize])
+            offset += count * values.itemsize
+            return values
+
+        (count,) = struct.unpack_from("<H", payload, offset)
+        offset += 2
+        state.enemy_slots = read_array("H", count)
+        for field in ("bullets", "enemy_bullets"):
+            (count,) = struct.unpack_from("<H", payload, offset)
+            offset += 2
+            setattr(state, field, read_array("d", count * 4))
+        state.barrier_health = bytes(payload[offset:offset + state.barrier_count])
+        offset += state.barrier_count
+
+        fields = _RNG.unpack_from(payload, offset)
+        state.rng_state = (fields[0], tuple(fields[1:626]), fields[627] if fields[626] else None)
+    except (struct.error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError(f"Damaged snapshot: {e}") from e
+    return state
+
+def read_checkpoint(path):
+    """
+    Load the game state saved at `path`.
+
+    Returns:
+        GameState: The saved state, or None if there is no usable checkpoint
+    """
+    try:
+        with open(path, "rb") as f:
+            return decode(f.read())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        log.warning("Ignoring checkpoint %s: %s", path, e)
+        return None
+
+class Checkpointer:
+    """
+    Saves the running game to disk every few seconds so it can be resumed.
+
+    tick() is called from the game loop. When a checkpoint is due it
+    captures and encodes the state on the game's thread (well under a
+    millisecond) and hands the bytes to a writer thread, which replaces the
+    file atomically. If the writer falls behind, only the newest snapshot
+    is written.
+
+    Example usage:
+        checkpointer = Checkpointer("checkpoint.bin", interval_ms=2000)
+        # In game loop:
+        checkpointer.tick(game, now_ms)
+        # At game over:
+        checkpointer.discard()
+    """
+
+    def __init__(self, path, interval_ms=2000):
+        """
+        Initialize the checkpointer.
+
+        Args:
+            path (str): Checkpoint file
+            interval_ms (float): Game time between checkpoints
+        """
+        self.path = path
+        self.interval_ms = interval_ms
+        self.last_ms = None
+        self.capture_ms = []       # Recent capture + encode times, for tuning
+        self.written = 0
+        self._pending = None
+        self._discard = False
+        self._closed = False
+        self._wake = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="checkpoint-writer", daemon=True)
+        self._thread.start()
+
+    def tick(self, game, now_ms):
+        """Checkpoint `game` if the interval has passed since the last one."""
+        if self.last_ms is not None and now_ms - self.last_ms < self.interval_ms:
+            return
+        self.last_ms = now_ms
+        self.save(game)
+
+    def save(self, game):
+        """Capture the game now and queue it for writing."""
+        started = time.perf_counter()
+        data = encode(game.capture_state())
+        self.capture_ms.append((time.perf_counter() - started) * 1000)
+        del self.capture_ms[:-100]
+        with self._wake:
+            self._pending = data
+            self._discard = False
+            self._wake.notify()
+
+    def discard(self):
+        """Delete the checkpoint (the game ended, so there is nothing to resume)."""
+        with self._wake:
+            self._pending = None
+            self._discard = True
+            self._wake.notify()
+        self.last_ms = None
+
+    def flush(self, timeout=5.0):
+        """Wait until queued work has been written. Returns False on timeout."""
+        deadline = time.monotonic() + timeout
+        with self._wake:
+            while self._pending is not None or self._discard:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._wake.wait(remaining)
+        return True
+
+    def close(self):
+        """Write anything queued and stop the writer thread."""
+        self.flush()
+        with self._wake:
+            self._closed = True
+            self._wake.notify()
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            with self._wake:
+                while self._pending is None and not self._discard and not self._closed:
+                    self._wake.wait()
+                if self._closed and self._pending is None and not self._discard:
+                    return
+                data, discard = self._pending, self._discard
+            try:
+                if data is not None:
+                    self._write(data)
+                elif discard:
+                    try:
+                        os.remove(self.path)
+                    except FileNotFoundError:
+                        pass
+            except OSError as e:
+                log.warning("Checkpoint %s failed: %s", self.path, e)
+            with self._wake:
+                # Newer work may have been queued while writing
+                if self._pending is data:
+                    self._pending = None
+                if discard and self._pending is None:
+                    self._discard = False
+                self._wake.notify_all()
+
+    def _write(self, data):
+        temp = self.path + ".tmp"
+        with open(temp, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp, self.path)
+        self.written += 1
@@ -2,9 +2,16 @@
 # Galactic Defenders - Space API Module
 # Handles fetching space facts from public APIs
 
-import requests
 import random
 import json
+from gamelog import get_logger
+
+log = get_logger("net")
+
+def _http_get(url):
+    """GET a URL with requests, which is imported on first use because it is slow to import."""
+    import requests
+    return requests.get(url)
 
 class SpaceAPI:
     def __init__(self):
@@ -22,7 +29,7 @@ class SpaceAPI:
         try:
             # Choose a random celestial body
             body = random.choice(self.bodies)
-            response = requests.get(f"{self.base_url}/{body}")
+            response = _http_get(f"{self.base_url}/{body}")
             
             if response.status_code == 200:
                 data = response.json()
@@ -30,13 +37,13 @@ class SpaceAPI:
             else:
                 return self._get_fallback_fact()
         except Exception as e:
-            print(f"Error fetching space fact: {e}")
+            log.warning("Error fetching space fact: %s", e)
             return self._get_fallback_fact()
     
     def get_fact(self, body="mars"):
         """Get a fact about a specific celestial body."""
         try:
-            response = requests.get(f"{self.base_url}/{body}")
+            response = _http_get(f"{self.base_url}/{body}")
             
             if response.status_code == 200:
                 data = response.json()
@@ -44,7 +51,7 @@ class SpaceAPI:
             else:
                 return self._get_fallback_fact(body)
         except Exception as e:
-            print(f"Error fetching space fact: {e}")
+            log.warning("Error fetching space fact: %s", e)
             return self._get_fallback_fact(body)
     
     def _format_fact(self, data):
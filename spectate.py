@@ -0,0 +1,806 @@
+#!/usr/bin/env python3
+# Galactic Defenders - Spectate Module
+# Streams live games to viewers as compact binary deltas, and a Tk viewer for them
+#
+# Usage:
+#   python session_server.py --bots 4                       # games to watch
+#   python spectate.py --server 127.0.0.1:8766              # watch the first one
+#   python spectate.py --server 127.0.0.1:8766 --session 0-2
+#
+# Each tick the world (HUD, player, formation, enemy alive mask, bullets,
+# barrier health) is diffed against the previous tick and only what changed
+# is sent. A keyframe with the whole world, including the layout that
+# rarely changes (formation grid, barrier blocks), goes out every
+# KEYFRAME_EVERY ticks, when the layout changes, and to each viewer that
+# joins or falls behind.
+
+import argparse
+import asyncio
+import json
+import socket
+import struct
+import sys
+import threading
+import time
+from collections import deque
+from gamelog import get_logger
+
+log = get_logger("net")
+
+# Ticks between keyframes (two seconds at 60 Hz)
+KEYFRAME_EVERY = 120
+
+# Message kinds
+KEYFRAME = 1
+DELTA = 2
+
+# Every message: kind, tick
+_MESSAGE = struct.Struct("<BI")
+
+# On the wire each message is preceded by its length
+_LENGTH = struct.Struct("<H")
+
+# Keyframe layout: world width and height, player y, formation rows and
+# columns, barrier block size; then column x, row y, row enemy types and
+# the barrier blocks' top-left corners
+_LAYOUT = struct.Struct("<HHhBBB")
+
+# score, level, shields, flags
+_HUD = struct.Struct("<IHhB")
+_POINT = struct.Struct("<hh")   # Formation offset
+_PLAYER_X = struct.Struct("<h")
+_DELTA_MASK = struct.Struct("<H")
+_BARRIER_CHANGE = struct.Struct("<HB")
+
+# Delta sections, in the order they are written
+HUD = 1 << 0
+OFFSET = 1 << 1
+PLAYER = 1 << 2
+ALIVE = 1 << 3
+BULLETS = 1 << 4              # Player bullets, absolute positions
+BULLETS_MOVED = 1 << 5        # Player bullets, same count, int8 moves
+ENEMY_BULLETS = 1 << 6
+ENEMY_BULLETS_MOVED = 1 << 7
+BARRIERS = 1 << 8             # Changed barrier blocks
+
+# Enemy colors by row type (see GameScreen.get_enemy_types)
+ENEMY_COLORS = ("#00FFFF", "#00FF88", "#0088FF", "#8800FF", "#6666FF")
+
+# Barrier colors by remaining health (see ui.BARRIER_COLORS)
+BARRIER_FILLS = {3: "#44DD44", 2: "#339933", 1: "#228822"}
+
+# Viewers whose unsent data passes this are skipped until it drains, then
+# brought back with a keyframe
+MAX_VIEWER_BUFFER = 64 * 1024
+
+class Layout:
+    """The parts of the world that only change between levels."""
+    __slots__ = ("width", "height", "player_y", "rows", "cols", "block_size",
+                 "col_x", "row_y", "row_types", "blocks")
+
+    def __init__(self, width, height, player_y, rows, cols, block_size,
+                 col_x, row_y, row_types, blocks):
+        self.width = width
+        self.height = height
+        self.player_y = player_y
+        self.rows = rows
+        self.cols = cols
+        self.block_size = block_size
+        self.col_x = col_x            # Column centers, before the formation offset
+        self.row_y = row_y            # Row centers
+        self.row_types = row_types    # Enemy type index per row
+        self.blocks = blocks          # Barrier blocks' top-left corners, x, y, x, y...
+
+    def __eq__(self, other):
+        return isinstance(other, Layout) and all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+class WorldFrame:
+    """
+    What a viewer needs to draw one tick, in whole pixels.
+
+    Bullets are flat (x, y, x, y...) tuples of their top-left corners.
+    """
+
+    # flags bits
+    RUNNING = 1
+    PAUSED = 2
+
+    __slots__ = ("layout", "score", "level", "shields", "flags", "player_x",
+                 "offset_x", "offset_y", "alive", "bullets", "enemy_bullets", "barrier_health")
+
+    def __init__(self, layout, score, level, shields, flags, player_x, offset_x, offset_y,
+                 alive, bullets, enemy_bullets, barrier_health):
+        self.layout = layout
+        self.score = score
+        self.level = level
+        self.shields = shields
+        self.flags = flags
+        self.player_x = player_x
+        self.offset_x = offset_x
+        self.offset_y = offset_y
+        self.alive = alive                    # One byte per formation slot, 1 if alive
+        self.bullets = bullets
+        self.enemy_bullets = enemy_bullets
+        self.barrier_health = barrier_health  # One byte per barrier block
+
+    def __eq__(self, other):
+        return isinstance(other, WorldFrame) and all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        return (f"WorldFrame(score={self.score}, level={self.level}, "
+                f"enemies={sum(self.alive)}, bullets={len(self.bullets) // 2}"
+                f"+{len(self.enemy_bullets) // 2})")
+
+class FrameCapture:
+    """
+    Reads WorldFrames from a running GameScreen.
+
+    The layout is rebuilt only when the formation grid or the barrier
+    blocks change; otherwise every frame shares one Layout object, which
+    also tells the encoder that no keyframe is needed for it.
+    """
+
+    def __init__(self):
+        self.layout = None
+        self._layout_key = None
+
+    def capture(self, game):
+        """Return the game's current WorldFrame."""
+        formation = game.formation
+        canvas = game.canvas
+        blocks = [block for barrier in game.barriers for block in barrier["blocks"]]
+
+        key = (game.width, game.height, game.player_y, formation.rows, formation.cols,
+               tuple(formation.x), tuple(formation.y),
+               bytes(formation.type_index[::formation.cols or 1]),
+               tuple(block.id for block in blocks))
+        if key != self._layout_key:
+            self._layout_key = key
+            self.layout = self._build_layout(game, blocks)
+
+        flags = WorldFrame.RUNNING if game.game_running else 0
+        if game.is_paused:
+            flags |= WorldFrame.PAUSED
+        return WorldFrame(
+            self.layout, game.score, game.level, game.shields, flags, round(game.player_x),
+            round(formation.offset_x), round(formation.offset_y), bytes(formation.alive),
+            self._bullet_corners(canvas, game.bullets),
+            self._bullet_corners(canvas, game.enemy_bullets),
+            bytes([block.health for block in blocks]))   # At most 3 hits each
+
+    @staticmethod
+    def _bullet_corners(canvas, bullets):
+        corners = []
+        for bullet in bullets:
+            coords = canvas.coords(bullet.id)
+            if coords:
+                corners.append(round(coords[0]))
+                corners.append(round(coords[1]))
+        return tuple(corners)
+
+    @staticmethod
+    def _build_layout(game, blocks):
+        formation = game.formation
+        corners = []
+        block_size = 0
+        for block in blocks:
+            x1, y1, x2, _ = game.canvas.coords(block.id)
+            corners.append(round(x1))
+            corners.append(round(y1))
+            block_size = round(x2 - x1)
+        return Layout(
+            game.width, game.height, game.player_y, formation.rows, formation.cols, block_size,
+            tuple(round(x) for x in formation.x), tuple(round(y) for y in formation.y),
+            tuple(formation.type_index[::formation.cols or 1]), tuple(corners))
+
+def _pack_bits(alive):
+    bits = bytearray((len(alive) + 7) // 8)
+    for index, value in enumerate(alive):
+        if value:
+            bits[index >> 3] |= 1 << (index & 7)
+    return bytes(bits)
+
+def _unpack_bits(data, count):
+    return bytes((data[index >> 3] >> (index & 7)) & 1 for index in range(count))
+
+def _pack_points(points, code="h"):
+    return struct.pack(f"<{len(points)}{code}", *points)
+
+def _pack_bullets(bullets):
+    return bytes((len(bullets) // 2,)) + _pack_points(bullets)
+
+def _pack_bullet_moves(previous, bullets):
+    """int8 moves from the previous positions, or None if they don't fit."""
+    if len(previous) != len(bullets):
+        return None
+    moves = [new - old for old, new in zip(previous, bullets)]
+    if moves and (min(moves) < -128 or max(moves) > 127):
+        return None
+    return _pack_points(moves, "b")
+
+class DeltaEncoder:
+    """
+    Turns a stream of WorldFrames into keyframes and deltas.
+
+    A delta starts with a bit mask of the sections that changed since the
+    previous tick (see HUD, OFFSET, ...) followed by those sections. Moving
+    bullets are sent as one signed byte per coordinate when the bullet
+    count hasn't changed, and barriers as (block, health) pairs.
+
+    Example usage:
+        encoder = DeltaEncoder()
+        data = encoder.encode(capture.capture(game))   # Every tick
+    """
+
+    def __init__(self, keyframe_every=KEYFRAME_EVERY):
+        self.keyframe_every = keyframe_every
+        self.tick = 0
+        self.previous = None
+        self.since_keyframe = 0   # Ticks since the last keyframe was sent
+        # Measurements
+        self.messages = 0
+        self.keyframes = 0
+        self.bytes_sent = 0
+        self.encode_ms = deque(maxlen=1000)
+
+    def reset(self):
+        """Make the next message a keyframe."""
+        self.previous = None
+
+    def encode(self, frame):
+        """
+        Encode the next tick.
+
+        Returns:
+            bytes: A keyframe if one is due or the layout changed, else a delta
+        """
+        started = time.perf_counter()
+        self.tick = (self.tick + 1) & 0xFFFFFFFF
+        previous = self.previous
+        if (previous is None or self.since_keyframe + 1 >= self.keyframe_every
+                or (frame.layout is not previous.layout and frame.layout != previous.layout)):
+            data = self.keyframe(frame)
+            self.since_keyframe = 0
+            self.keyframes += 1
+        else:
+            data = self._delta(previous, frame)
+            self.since_keyframe += 1
+        self.previous = frame
+        self.messages += 1
+        self.bytes_sent += len(data)
+        self.encode_ms.append((time.perf_counter() - started) * 1000)
+        return data
+
+    def keyframe(self, frame):
+        """A keyframe for `frame` at the current tick, e.g. for a viewer that just joined."""
+        layout = frame.layout
+        return b"".join((
+            _MESSAGE.pack(KEYFRAME, self.tick),
+            _LAYOUT.pack(layout.width, layout.height, layout.player_y, layout.rows,
+                         layout.cols, layout.block_size),
+            _pack_points(layout.col_x), _pack_points(layout.row_y),
+            _pack_points(layout.row_types, "b"),
+            struct.pack("<H", len(layout.blocks) // 2), _pack_points(layout.blocks),
+            _HUD.pack(frame.score, frame.level, frame.shields, frame.flags),
+            _POINT.pack(frame.offset_x, frame.offset_y),
+            _PLAYER_X.pack(frame.player_x),
+            _pack_bits(frame.alive),
+            _pack_bullets(frame.bullets),
+            _pack_bullets(frame.enemy_bullets),
+            frame.barrier_health,
+        ))
+
+    def _delta(self, previous, frame):
+        mask = 0
+        parts = []
+        if (frame.score, frame.level, frame.shields, frame.flags) != (
+                previous.score, previous.level, previous.shields, previous.flags):
+            mask |= HUD
+            parts.append(_HUD.pack(frame.score, frame.level, frame.shields, frame.flags))
+        if frame.offset_x != previous.offset_x or frame.offset_y != previous.offset_y:
+            mask |= OFFSET
+            parts.append(_POINT.pack(frame.offset_x, frame.offset_y))
+        if frame.player_x != previous.player_x:
+            mask |= PLAYER
+            parts.append(_PLAYER_X.pack(frame.player_x))
+        if frame.alive != previous.alive:
+            mask |= ALIVE
+            parts.append(_pack_bits(frame.alive))
+        for full_bit, moved_bit, old, new in (
+                (BULLETS, BULLETS_MOVED, previous.bullets, frame.bullets),
+                (ENEMY_BULLETS, ENEMY_BULLETS_MOVED, previous.enemy_bullets, frame.enemy_bullets)):
+            if new == old:
+                continue
+            moves = _pack_bullet_moves(old, new)
+            if moves is not None:
+                mask |= moved_bit
+                parts.append(moves)
+            else:
+                mask |= full_bit
+                parts.append(_pack_bullets(new))
+        if frame.barrier_health != previous.barrier_health:
+            changes = [(index, health) for index, (old, health) in
+                       enumerate(zip(previous.barrier_health, frame.barrier_health))
+                       if old != health]
+            if len(changes) > 255:
+                return self.keyframe(frame)
+            mask |= BARRIERS
+            parts.append(bytes((len(changes),)))
+            parts.extend(_BARRIER_CHANGE.pack(index, health) for index, health in changes)
+        return _MESSAGE.pack(DELTA, self.tick) + _DELTA_MASK.pack(mask) + b"".join(parts)
+
+    def stats(self):
+        """Messages, bytes and encode times so far."""
+        times = sorted(self.encode_ms)
+        return {
+            "messages": self.messages,
+            "keyframes": self.keyframes,
+            "bytes": self.bytes_sent,
+            "bytes_per_tick": round(self.bytes_sent / self.messages, 1) if self.messages else 0.0,
+            "encode_ms_mean": round(sum(times) / len(times), 4) if times else 0.0,
+            "encode_ms_p99": round(times[int(0.99 * (len(times) - 1))], 4) if times else 0.0,
+        }
+
+class DeltaDecoder:
+    """
+    Rebuilds WorldFrames from DeltaEncoder messages.
+
+    Deltas only apply to the tick right before them; anything else is
+    rejected until the next keyframe arrives.
+    """
+
+    def __init__(self):
+        self.frame = None
+        self.tick = None
+
+    def decode(self, data):
+        """
+        Apply one message.
+
+        Returns:
+            WorldFrame: The world at the message's tick
+
+        Raises:
+            ValueError: If the message is damaged, or is a delta that doesn't
+                follow the last decoded tick
+        """
+        try:
+            kind, tick = _MESSAGE.unpack_from(data)
+            if kind == KEYFRAME:
+                frame = self._keyframe(data, _MESSAGE.size)
+            elif kind == DELTA:
+                if self.frame is None or tick != (self.tick + 1) & 0xFFFFFFFF:
+                    raise ValueError(f"Delta for tick {tick} does not follow tick {self.tick}")
+                frame = self._delta(data, _MESSAGE.size)
+            else:
+                raise ValueError(f"Unknown message kind {kind}")
+        except (struct.error, IndexError) as e:
+            raise ValueError(f"Damaged message: {e}") from e
+        self.frame = frame
+        self.tick = tick
+        return frame
+
+    @staticmethod
+    def _read_points(data, offset, count, code="h"):
+        values = struct.unpack_from(f"<{count}{code}", data, offset)
+        return values, offset + count * struct.calcsize(code)
+
+    def _read_bullets(self, data, offset):
+        count = data[offset]
+        return self._read_points(data, offset + 1, count * 2)
+
+    def _keyframe(self, data, offset):
+        width, height, player_y, rows, cols, block_size = _LAYOUT.unpack_from(data, offset)
+        offset += _LAYOUT.size
+        col_x, offset = self._read_points(data, offset, cols)
+        row_y, offset = self._read_points(data, offset, rows)
+        row_types, offset = self._read_points(data, offset, rows, "b")
+        (block_count,) = struct.unpack_from("<H", data, offset)
+        blocks, offset = self._read_points(data, offset + 2, block_count * 2)
+        layout = Layout(width, height, player_y, rows, cols, block_size,
+                        col_x, row_y, row_types, blocks)
+        if self.frame is not None and self.frame.layout == layout:
+            layout = self.frame.layout   # Keep one object so viewers can skip redrawing it
+
+        score, level, shields, flags = _HUD.unpack_from(data, offset)
+        offset += _HUD.size
+        offset_x, offset_y = _POINT.unpack_from(data, offset)
+        offset += _POINT.size
+        (player_x,) = _PLAYER_X.unpack_from(data, offset)
+        offset += _PLAYER_X.size
+        slots = rows * cols
+        alive = _unpack_bits(data[offset:offset + (slots + 7) // 8], slots)
+        offset += (slots + 7) // 8
+        bullets, offset = self._read_bullets(data, offset)
+        enemy_bullets, offset = self._read_bullets(data, offset)
+        barrier_health = bytes(data[offset:offset + block_count])
+        if len(barrier_health) != block_count:
+            raise ValueError("Damaged message: barriers truncated")
+        return WorldFrame(layout, score, level, shields, flags, player_x, offset_x, offset_y,
+                          alive, bullets, enemy_bullets, barrier_health)
+
+    def _delta(self, data, offset):
+        old = self.frame
+        layout = old.layout
+        (mask,) = _DELTA_MASK.unpack_from(data, offset)
+        offset += _DELTA_MASK.size
+        frame = WorldFrame(layout, old.score, old.level, old.shields, old.flags, old.player_x,
+                           old.offset_x, old.offset_y, old.alive, old.bullets,
+                           old.enemy_bullets, old.barrier_health)
+        if mask & HUD:
+            frame.score, frame.level, frame.shields, frame.flags = _HUD.unpack_from(data, offset)
+            offset += _HUD.size
+        if mask & OFFSET:
+            frame.offset_x, frame.offset_y = _POINT.unpack_from(data, offset)
+            offset += _POINT.size
+        if mask & PLAYER:
+            (frame.player_x,) = _PLAYER_X.unpack_from(data, offset)
+            offset += _PLAYER_X.size
+        if mask & ALIVE:
+            slots = layout.rows * layout.cols
+            frame.alive = _unpack_bits(data[offset:offset + (slots + 7) // 8], slots)
+            offset += (slots + 7) // 8
+        for full_bit, moved_bit, field in ((BULLETS, BULLETS_MOVED, "bullets"),
+                                           (ENEMY_BULLETS, ENEMY_BULLETS_MOVED, "enemy_bullets")):
+            if mask & full_bit:
+                bullets, offset = self._read_bullets(data, offset)
+                setattr(frame, field, bullets)
+            elif mask & moved_bit:
+                previous = getattr(old, field)
+                moves, offset = self._read_points(data, offset, len(previous), "b")
+                setattr(frame, field, tuple(p + m for p, m in zip(previous, moves)))
+        if mask & BARRIERS:
+            health = bytearray(old.barrier_health)
+            count = data[offset]
+            offset += 1
+            for _ in range(count):
+                index, value = _BARRIER_CHANGE.unpack_from(data, offset)
+                offset += _BARRIER_CHANGE.size
+                health[index] = value
+            frame.barrier_health = bytes(health)
+        if offset != len(data):
+            raise ValueError("Damaged message: unexpected length")
+        return frame
+
+class SpectatorStream:
+    """
+    One game's broadcast: captures and encodes each tick and sends it to every viewer.
+
+    Nothing is captured while nobody is watching; the first tick after
+    that is a keyframe.
+    """
+
+    def __init__(self, name, keyframe_every=KEYFRAME_EVERY):
+        self.name = name
+        self.capture = FrameCapture()
+        self.encoder = DeltaEncoder(keyframe_every)
+        self.viewers = {}   # StreamWriter -> True while it needs a keyframe
+
+    def publish(self, game):
+        """Send the game's current tick to the viewers (call once per frame)."""
+        if not self.viewers:
+            self.encoder.reset()
+            return
+        frame = self.capture.capture(game)
+        data = self.encoder.encode(frame)
+        key = None
+        length = _LENGTH.pack(len(data))
+        for writer, needs_keyframe in list(self.viewers.items()):
+            if writer.is_closing():
+                self.viewers.pop(writer, None)
+                continue
+            if writer.transport.get_write_buffer_size() > MAX_VIEWER_BUFFER:
+                self.viewers[writer] = True   # Too far behind; catch up with a keyframe later
+                continue
+            if needs_keyframe:
+                if key is None:
+                    key = self.encoder.keyframe(frame)
+                writer.write(_LENGTH.pack(len(key)) + key)
+                self.viewers[writer] = False
+            else:
+                writer.write(length + data)
+
+    def close(self):
+        """Disconnect every viewer."""
+        for writer in self.viewers:
+            writer.close()
+        self.viewers.clear()
+
+class SpectatorServer:
+    """
+    TCP endpoint for viewers of any number of streams.
+
+    A viewer connects, sends the stream name and a newline, and then
+    receives length-prefixed messages (uint16 length, then a DeltaEncoder
+    message) until the stream ends.
+
+    Example usage:
+        server = SpectatorServer(port=0)
+        await server.start()
+        stream = server.add_stream("0-1")
+        # Every frame:
+        stream.publish(game)
+    """
+
+    def __init__(self, host="127.0.0.1", port=8767, keyframe_every=KEYFRAME_EVERY):
+        self.host = host
+        self.port = port
+        self.keyframe_every = keyframe_every
+        self.streams = {}
+        self.server = None
+
+    async def start(self):
+        """Start listening; port 0 picks a free port (see self.port)."""
+        self.server = await asyncio.start_server(self._handle_viewer, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        for name in list(self.streams):
+            self.remove_stream(name)
+        self.server.close()
+        await self.server.wait_closed()
+
+    def add_stream(self, name):
+        """Return the stream called `name`, creating it if needed."""
+        if name not in self.streams:
+            self.streams[name] = SpectatorStream(name, self.keyframe_every)
+        return self.streams[name]
+
+    def remove_stream(self, name):
+        stream = self.streams.pop(name, None)
+        if stream is not None:
+            stream.close()
+
+    async def _handle_viewer(self, reader, writer):
+        try:
+            name = (await asyncio.wait_for(reader.readline(), 10)).decode("utf-8").strip()
+        except (asyncio.TimeoutError, ConnectionError, UnicodeDecodeError):
+            writer.close()
+            return
+        stream = self.streams.get(name)
+        if stream is None:
+            log.info("Viewer asked for unknown stream %r", name)
+            writer.close()
+            return
+        stream.viewers[writer] = True
+        try:
+            await reader.read()   # Viewers send nothing more; wait for them to leave
+        except ConnectionError:
+            pass
+        finally:
+            stream.viewers.pop(writer, None)
+            writer.close()
+
+class SpectatorClient:
+    """
+    Receives a stream on a background thread and keeps the latest frame.
+
+    The viewer polls latest() from the Tk loop, so a slow window skips
+    frames rather than falling behind.
+    """
+
+    def __init__(self, host, port, stream):
+        self.address = (host, port)
+        self.stream = stream
+        self.decoder = DeltaDecoder()
+        self.bytes_received = 0
+        self.messages = 0
+        self.closed = False
+        self.error = None
+        self._latest = None
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="spectator", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def latest(self):
+        """The newest frame not yet taken, or None."""
+        with self._lock:
+            frame, self._latest = self._latest, None
+        return frame
+
+    def _run(self):
+        try:
+            with socket.create_connection(self.address, timeout=10) as sock:
+                sock.settimeout(None)
+                sock.sendall(self.stream.encode("utf-8") + b"\n")
+                reader = sock.makefile("rb")
+                while True:
+                    header = reader.read(_LENGTH.size)
+                    if len(header) < _LENGTH.size:
+                        break
+                    (length,) = _LENGTH.unpack(header)
+                    data = reader.read(length)
+                    if len(data) < length:
+                        break
+                    frame = self.decoder.decode(data)
+                    self.bytes_received += _LENGTH.size + length
+                    self.messages += 1
+                    with self._lock:
+                        self._latest = frame
+        except (OSError, ValueError) as e:
+            self.error = e
+            log.warning("Spectator stream %s ended: %s", self.stream, e)
+        finally:
+            self.closed = True
+
+class SpectatorView:
+    """
+    Draws WorldFrames on a Tk canvas.
+
+    Items are created once per layout and then moved, recolored or hidden,
+    so a frame costs about as many canvas calls as things that changed.
+    """
+
+    def __init__(self, master, width=800, height=600):
+        import tkinter as tk
+        self.canvas = tk.Canvas(master, width=width, height=height, bg="black",
+                                highlightthickness=0)
+        self.canvas.pack()
+        self.layout = None
+        self.enemy_items = []
+        self.block_items = []
+        self.bullet_items = []
+        self.enemy_bullet_items = []
+        self.drawn = None   # The last frame drawn
+        self.ship = self.canvas.create_polygon(0, 0, 0, 0, 0, 0, fill="#00FFFF")
+        self.hud = self.canvas.create_text(10, 10, anchor="nw", fill="white",
+                                           font=("Courier", 14, "bold"))
+        self.status = self.canvas.create_text(width // 2, height // 2, fill="white",
+                                              font=("Courier", 28, "bold"),
+                                              text="Waiting for the game...")
+
+    def render(self, frame):
+        """Update the canvas to show `frame`."""
+        canvas = self.canvas
+        if frame.layout is not self.layout:
+            self._build(frame.layout)
+        drawn = self.drawn
+        layout = frame.layout
+
+        if drawn is None or frame.alive != drawn.alive or (
+                frame.offset_x, frame.offset_y) != (drawn.offset_x, drawn.offset_y):
+            for slot, item in enumerate(self.enemy_items):
+                if frame.alive[slot]:
+                    row, col = divmod(slot, layout.cols)
+                    x = layout.col_x[col] + frame.offset_x
+                    y = layout.row_y[row] + frame.offset_y
+                    canvas.coords(item, x - 10, y - 8, x + 10, y + 8)
+                    canvas.itemconfig(item, state="normal")
+                else:
+                    canvas.itemconfig(item, state="hidden")
+
+        if drawn is None or frame.barrier_health != drawn.barrier_health:
+            for item, health, old in zip(self.block_items, frame.barrier_health,
+                                         drawn.barrier_health if drawn else bytes(len(self.block_items))):
+                if drawn is None or health != old:
+                    if health:
+                        canvas.itemconfig(item, state="normal",
+                                          fill=BARRIER_FILLS.get(health, BARRIER_FILLS[3]))
+                    else:
+                        canvas.itemconfig(item, state="hidden")
+
+        self._place_bullets(self.bullet_items, frame.bullets, "#FF0000")
+        self._place_bullets(self.enemy_bullet_items, frame.enemy_bullets, "#6666FF")
+
+        if drawn is None or frame.player_x != drawn.player_x:
+            x, y = frame.player_x, layout.player_y
+            canvas.coords(self.ship, x, y - 30, x - 25, y, x - 15, y - 10, x, y - 15,
+                          x + 15, y - 10, x + 25, y)
+        canvas.itemconfig(self.hud, text=f"SCORE: {frame.score}   LEVEL: {frame.level}   "
+                                         f"SHIELDS: {frame.shields}")
+        if not frame.flags & WorldFrame.RUNNING:
+            status = "GAME OVER"
+        elif frame.flags & WorldFrame.PAUSED:
+            status = "PAUSED"
+        else:
+            status = ""
+        canvas.itemconfig(self.status, text=status)
+        self.drawn = frame
+
+    def _build(self, layout):
+        canvas = self.canvas
+        canvas.delete("layout")
+        self.layout = layout
+        self.drawn = None
+        self.enemy_items = [
+            canvas.create_oval(0, 0, 0, 0, tags=("layout",), state="hidden",
+                               fill=ENEMY_COLORS[layout.row_types[slot // layout.cols] % len(ENEMY_COLORS)])
+            for slot in range(layout.rows * layout.cols)]
+        size = layout.block_size
+        self.block_items = [
+            canvas.create_rectangle(x, y, x + size, y + size, tags=("layout",),
+                                    fill=BARRIER_FILLS[3], outline="")
+            for x, y in zip(layout.blocks[::2], layout.blocks[1::2])]
+        canvas.tag_raise(self.hud)
+        canvas.tag_raise(self.status)
+
+    def _place_bullets(self, items, bullets, color):
+        canvas = self.canvas
+        count = len(bullets) // 2
+        while len(items) < count:
+            items.append(canvas.create_rectangle(0, 0, 0, 0, fill=color, outline=""))
+        for index, item in enumerate(items):
+            if index < count:
+                x, y = bullets[2 * index], bullets[2 * index + 1]
+                canvas.coords(item, x, y, x + 4, y + 10)
+                canvas.itemconfig(item, state="normal")
+            else:
+                canvas.itemconfig(item, state="hidden")
+
+def request_stream(server, session=None):
+    """
+    Ask a session server where to watch a session (the first one if none is given).
+
+    Returns:
+        dict: host, port and stream name for SpectatorClient
+    """
+    host, _, port = server.rpartition(":")
+    with socket.create_connection((host, int(port)), timeout=10) as sock:
+        reader = sock.makefile("rb")
+
+        def call(op, **args):
+            sock.sendall(json.dumps(dict(args, op=op)).encode("utf-8") + b"\n")
+            reply = json.loads(reader.readline())
+            if not reply["ok"]:
+                raise RuntimeError(reply["error"])
+            return reply["result"]
+
+        if session is None:
+            sessions = call("list")
+            if not sessions:
+                raise RuntimeError("The server has no sessions to watch")
+            session = sessions[0]["session"]
+        where = call("spectate", session=session)
+    if where["host"] in ("0.0.0.0", "::", ""):
+        where["host"] = host   # Listening on every address; use the one we reached
+    return where
+
+def main():
+    parser = argparse.ArgumentParser(description="Watch a live Galactic Defenders game")
+    parser.add_argument("--server", default="127.0.0.1:8766",
+                        help="session server to ask for the stream (HOST:PORT)")
+    parser.add_argument("--session", help="session to watch (default: the first one)")
+    parser.add_argument("--connect", metavar="HOST:PORT",
+                        help="connect to a spectator endpoint directly (needs --session)")
+    args = parser.parse_args()
+
+    if args.connect:
+        if not args.session:
+            sys.exit("--connect needs --session")
+        host, _, port = args.connect.rpartition(":")
+        where = {"host": host, "port": int(port), "stream": args.session}
+    else:
+        try:
+            where = request_stream(args.server, args.session)
+        except (OSError, RuntimeError) as e:
+            sys.exit(f"Cannot watch: {e}")
+
+    import tkinter as tk
+    root = tk.Tk()
+    root.title(f"Galactic Defenders - watching {where['stream']}")
+    root.configure(bg="black")
+    view = SpectatorView(root)
+    client = SpectatorClient(where["host"], where["port"], where["stream"])
+    client.start()
+    started = time.perf_counter()
+
+    def refresh():
+        frame = client.latest()
+        if frame is not None:
+            view.render(frame)
+        elif client.closed:
+            view.canvas.itemconfig(view.status, text="STREAM ENDED")
+        seconds = time.perf_counter() - started
+        root.title(f"Galactic Defenders - watching {where['stream']} "
+                   f"({client.bytes_received / seconds / 1024:.1f} KB/s)")
+        root.after(16, refresh)
+
+    refresh()
+    root.mainloop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# Test script for the sound mixer
+
+import os
+import tempfile
+import threading
+import wave
+from audio import SoundMixer, NullSink, WavFileSink, build_samples, SAMPLE_RATE
+
+def test_sound_mixer():
+    """Test triggering, rate limiting, mixing and the WAV sink."""
+    print("Testing sound mixer...")
+
+    samples = build_samples()
+    mixer = SoundMixer(samples, NullSink(), min_interval=0.05, max_per_sound=2)
+
+    # Unknown sounds are ignored and repeated triggers are rate-limited
+    assert not mixer.play("no_such_sound")
+    assert mixer.play("player_shoot")
+    assert not mixer.play("player_shoot")
+    assert mixer.play("enemy_shoot")
+    assert mixer.triggered == 2 and mixer.rate_limited == 1
+
+    # Without a rate limit every trigger is accepted (benchmarks/bench_suite.py times play())
+    mixer.min_interval = 0
+    for _ in range(1000):
+        assert mixer.play("explosion")
+
+    # Only max_per_sound copies of one sound are mixed together
+    block = mixer.mix_block()
+    names = [voice[0] for voice in mixer._voices]
+    assert names.count("explosion") == 2 and "player_shoot" in names
+    assert any(block) and max(block) <= 32767 and min(block) >= -32768
+
+    # Voices finish once their samples run out
+    for _ in range(SAMPLE_RATE // len(block) + 1):
+        mixer.mix_block()
+    assert not mixer._voices
+
+    # The mixer thread writes real-time audio to a WAV file
+    class RecordingSink(WavFileSink):
+        def __init__(self, path):
+            super().__init__(path)
+            self.written = threading.Event()
+
+        def write(self, block):
+            super().write(block)
+            self.written.set()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "mix.wav")
+        sink = RecordingSink(path)
+        mixer = SoundMixer(samples, sink)
+        mixer.play("player_hit")
+        mixer.start()
+        assert sink.written.wait(5)
+        mixer.close()
+        with wave.open(path, "rb") as recording:
+            assert recording.getframerate() == SAMPLE_RATE and recording.getnframes() > 0
+            assert any(recording.readframes(recording.getnframes()))   # Not just silence
+            print(f"Recorded {recording.getnframes()} frames")
+
+    print("Sound mixer tests completed.")
+
+if __name__ == "__main__":
+    test_sound_mixer()
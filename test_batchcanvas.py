@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# Test script for the batching canvas wrapper
+
+import tkinter
+from batchcanvas import BatchingCanvas
+from headless import HeadlessCanvas, HeadlessRoot
+
+class TclLoggingCanvas(HeadlessCanvas):
+    """Headless canvas with a Tcl interpreter whose ".c" command logs its arguments."""
+
+    def __init__(self, master):
+        super().__init__(master)
+        self.tk = tkinter.Tcl().tk
+        self.tk.eval('proc .c {args} { lappend ::log $args }')
+
+    def __str__(self):
+        return ".c"
+
+    def logged(self):
+        """The commands the batched scripts ran, as lists of words."""
+        log = self.tk.eval('if {[info exists ::log]} { set ::log } else { list }')
+        return [list(self.tk.splitlist(command)) for command in self.tk.splitlist(log)]
+
+def test_batching_canvas():
+    """Test queued writes, deduplication, shadow reads and the composed Tcl script."""
+    print("Testing batching canvas...")
+
+    # Updates are replayed on canvases without Tcl; reads come from the shadow copy
+    root = HeadlessRoot()
+    headless = HeadlessCanvas(root)
+    canvas = BatchingCanvas(headless)
+    bullet = canvas.create_rectangle(100, 200, 104, 210, fill="#FF0000", tags="bullet")
+    for _ in range(5):
+        canvas.move(bullet, 0, -10)
+    assert canvas.coords(bullet) == [100, 150, 104, 160]
+    assert headless.coords(bullet) == [100, 200, 104, 210]   # Not sent yet
+    assert canvas.gettags(bullet) == ("bullet",) and canvas.type(bullet) == "rectangle"
+    assert canvas.itemcget(bullet, "fill") == "#FF0000"
+    assert canvas.stats["tk_reads"] == 0
+
+    canvas.flush()
+    assert headless.coords(bullet) == [100, 150, 104, 160]
+    assert canvas.stats["sent"] == 1   # Five moves collapsed into one
+
+    # A tag-wide move flushes first and keeps the shadow copies in step
+    canvas.coords(bullet, 0, 0, 4, 10)
+    canvas.move("bullet", 10, 0)
+    assert headless.coords(bullet) == [10, 0, 14, 10] == canvas.coords(bullet)
+
+    # bbox is cached until the item changes
+    assert canvas.bbox(bullet) == headless.bbox(bullet)
+    reads = canvas.stats["tk_reads"]
+    canvas.bbox(bullet)
+    assert canvas.stats["tk_reads"] == reads
+    canvas.move(bullet, 1, 1)
+    canvas.bbox(bullet)
+    assert canvas.stats["tk_reads"] == reads + 1
+
+    # Items whose shadow tags and coords were forgotten still drop their cached bbox
+    canvas.itemconfig("bullet", tags="shot")   # Forgets the shadow tags
+    canvas.move("shot", 0, 5)                  # ...so the tag move forgets the coords
+    before = canvas.bbox(bullet)
+    canvas.move(bullet, 100, 0)
+    after = canvas.bbox(bullet)
+    canvas.flush()
+    assert after == headless.bbox(bullet)
+    assert after[0] == before[0] + 100 and after[2] == before[2] + 100
+
+    # Deleted items disappear at the next flush; the idle callback flushes too
+    canvas.delete(bullet)
+    assert headless.find_all() == (bullet,)
+    root.advance(0)
+    assert headless.find_all() == ()
+
+    # With Tcl, a frame's updates are one script of correctly quoted commands
+    tcl_canvas = TclLoggingCanvas(root)
+    canvas = BatchingCanvas(tcl_canvas)
+    text = canvas.create_text(10, 10, text="")
+    canvas.move(text, 1, 2)
+    canvas.move(text, 3, 4)
+    canvas.itemconfig(text, text="Score: {10} $x [y]\nnext", fill="#FFFFFF")
+    canvas.itemconfig(text, font=("Courier New", 16, "bold"), state="normal")
+    canvas.delete(99)
+    canvas.flush()
+    commands = tcl_canvas.logged()
+    print(f"Batched commands: {commands}")
+    assert commands == [
+        ["move", str(text), "4", "6"],
+        ["itemconfigure", str(text), "-text", "Score: {10} $x [y]\nnext", "-fill", "#FFFFFF",
+         "-font", "{Courier New} 16 bold", "-state", "normal"],
+        ["delete", "99"],
+    ]
+    assert canvas.stats["flushes"] == 1
+
+    print("Batching canvas tests completed.")
+
+def test_scaled_view():
+    """Test that the world is drawn scaled while reads stay in world units."""
+    print("Testing scaled view...")
+
+    root = HeadlessRoot()
+    headless = HeadlessCanvas(root, width=800, height=600)
+    canvas = BatchingCanvas(headless, world_size=(800, 600))
+    ship = canvas.create_polygon(390, 520, 410, 520, 400, 500, tags="ship")
+    label = canvas.create_text(400, 300, text="LEVEL 2", font=("Courier", 18, "bold"))
+    canvas.fit(800, 600)
+    assert canvas.view_scale == 1.0 and headless.coords(ship) == [390, 520, 410, 520, 400, 500]
+
+    # 1920x1080 is wider than 4:3, so the world is 1.8x with bars on the sides
+    canvas.fit(1920, 1080)
+    assert (canvas.view_scale, canvas.view_x, canvas.view_y) == (1.8, 240.0, 0.0)
+    assert headless.coords(ship) == [942.0, 936.0, 978.0, 936.0, 960.0, 900.0]
+    assert headless.itemcget(label, "font") == "('Courier', 32, 'bold')"
+    assert canvas.to_screen(800, 600) == (1680.0, 1080.0)
+    assert canvas.to_world(1680, 1080) == (800.0, 600.0)
+
+    # Writes are in world units and reads come back in world units
+    canvas.move(ship, 10, 0)
+    canvas.move("ship", 0, -10)
+    bullet = canvas.create_rectangle(0, 0, 10, 10, width=2)
+    canvas.flush()
+    assert canvas.coords(ship) == [400, 510, 420, 510, 410, 490]
+    assert headless.coords(ship) == [960.0, 918.0, 996.0, 918.0, 978.0, 882.0]
+    assert headless.coords(bullet) == [240.0, 0.0, 258.0, 18.0]
+    assert headless.itemcget(bullet, "width") == "3.6"
+    # Tk answers bbox in pixels (padded by a pixel); it is mapped back to world units
+    assert all(abs(a - b) < 1 for a, b in zip(canvas.bbox(bullet), (0, 0, 10, 10)))
+
+    # Going back to the original size restores the original pixels
+    canvas.fit(800, 600)
+    assert headless.coords(ship) == [400, 510, 420, 510, 410, 490]
+    assert headless.itemcget(label, "font") == "('Courier', 18, 'bold')"
+
+    print("Scaled view tests completed.")
+
+if __name__ == "__main__":
+    test_batching_canvas()
+    test_scaled_view()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# Test script for the input-injection API and the reference bot
+
+import os
+import random
+import tempfile
+import headless
+import ui
+from bot import PlayerInput, ReferenceBot, run_headless, summarize
+from entities import Bullet
+from leaderboard import LeaderboardManager
+
+class ScriptedController:
+    """Replays a fixed list of inputs, then does nothing."""
+
+    def __init__(self, inputs):
+        self.inputs = list(inputs)
+
+    def tick(self, game):
+        return self.inputs.pop(0) if self.inputs else None
+
+def make_game(root, tmp):
+    game = ui.GameScreen(root, "Tester")
+    game.leaderboard = LeaderboardManager(os.path.join(tmp, "test.db"))
+    return game
+
+def test_controller_input():
+    """Test that a controller's inputs move the ship and fire."""
+    print("Testing controller input...")
+
+    random.seed(3)
+    root = headless.HeadlessRoot()
+    with headless.headless_tk(root), tempfile.TemporaryDirectory() as tmp:
+        game = make_game(root, tmp)
+        start_x = game.player_x
+        # Wait out the shot cooldown (from time zero), then move and fire
+        game.set_controller(ScriptedController(
+            [None] * 16 + [PlayerInput(right=True)] * 10 + [PlayerInput(fire=True)]))
+        for _ in range(27):
+            root.advance(16)
+        assert game.player_x == start_x + 10 * game.player_speed
+        assert len(game.bullets) == 1
+
+        # Returning None leaves the controls as they were
+        root.advance(16)
+        assert not game.input_right and not game.input_left
+
+        # Keys the player holds still count while the controller steers
+        game.set_controller(ScriptedController([PlayerInput()] * 5 + [PlayerInput(right=True)] * 5))
+        game.set_key_state("left", True)
+        x = game.player_x
+        for _ in range(5):
+            root.advance(16)
+        assert game.player_x == x - 5 * game.player_speed
+        for _ in range(5):
+            root.advance(16)
+        assert game.player_x == x - 5 * game.player_speed   # Left and right cancel out
+        game.set_key_state("left", False)
+        game.set_controller(None)
+        assert game.controller is None and not game.input_right
+        game.leaderboard.close()
+
+    print("Controller input tests completed.")
+
+def test_bot_dodges_and_aims():
+    """Test that the bot steps out of a bullet's path and fires when lined up."""
+    print("Testing bot decisions...")
+
+    random.seed(4)
+    root = headless.HeadlessRoot()
+    with headless.headless_tk(root), tempfile.TemporaryDirectory() as tmp:
+        game = make_game(root, tmp)
+        bot = ReferenceBot()
+        for bullet in game.enemy_bullets:
+            game.canvas.delete(bullet.id)
+        game.enemy_bullets.clear()
+
+        # No threats: head for the target, and fire once lined up with it
+        game.player_x = 30   # Far left of every alien
+        action = bot.tick(game)
+        assert action.right and not action.left and not action.fire
+        target = bot.target_x(game, bot.barrier_cover(game))
+        game.player_x = target
+        assert bot.tick(game).fire or bot.blocked(target, bot.barrier_cover(game))
+
+        # A bullet falling straight onto the ship: the bot has to move
+        x = game.player_x
+        bullet = game.canvas.create_rectangle(x - 2, 490, x + 2, 500, fill="#FFFFFF")
+        game.enemy_bullets.append(Bullet(bullet, 0, 5))
+        action = bot.tick(game)
+        assert action.left or action.right
+        game.leaderboard.close()
+
+    print("Bot decision tests completed.")
+
+def test_run_headless():
+    """Test that the bot plays whole games headless and scores."""
+    print("Testing headless bot games...")
+
+    results = run_headless(games=2, max_frames=1200, seed=5)
+    summary = summarize(results)
+    print(f"Bot summary: {summary}")
+    assert len(results) == 2
+    assert all(result["score"] > 0 for result in results)
+    assert all(0 < result["frames"] <= 1200 for result in results)
+    assert summary["frames_per_second"] > 0
+
+    print("Headless bot tests completed.")
+
+if __name__ == "__main__":
+    test_controller_input()
+    test_bot_dodges_and_aims()
+    test_run_headless()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# Test script for the compact entity types
+
+from entities import Enemy, Bullet, EntityList
+
+def test_entity_list():
+    """Test O(1) membership and swap-remove."""
+    print("Testing entity list...")
+    
+    bullets = EntityList(Bullet(i, 0, -10) for i in range(5))
+    first, middle, last = bullets[0], bullets[2], bullets[4]
+    
+    # Removal moves the last bullet into the hole
+    bullets.remove(middle)
+    assert len(bullets) == 4
+    assert middle not in bullets and middle.index == -1
+    assert bullets[2] is last and last.index == 2
+    assert sorted(bullet.id for bullet in bullets) == [0, 1, 3, 4]
+    
+    # Removing something twice (or something never added) is harmless
+    bullets.remove(middle)
+    bullets.remove(Bullet(99, 0, 0))
+    assert len(bullets) == 4
+    
+    # Membership is by identity, not by equal-looking contents
+    twin = Bullet(first.id, first.dx, first.dy)
+    assert first in bullets and twin not in bullets
+    
+    bullets.remove(last)
+    assert [bullet.id for bullet in bullets] == [0, 1, 3]
+    
+    bullets.clear()
+    assert not bullets and first.index == -1
+    
+    # Entities use __slots__, so there is no per-instance dict
+    enemy = Enemy(1, 0, 0, "alien1", 10)
+    assert not hasattr(enemy, "__dict__")
+    
+    print("Entity list tests completed.")
+
+if __name__ == "__main__":
+    test_entity_list()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# Test script for the enemy formation store
+
+from formation import Formation
+
+def test_formation_bounds():
+    """Test that bounds follow kills and shifts without scanning."""
+    print("Testing formation bounds...")
+    
+    formation = Formation(rows=3, cols=4, origin_x=100, origin_y=80, spacing_x=60, spacing_y=50)
+    assert len(formation) == 12
+    assert (formation.leftmost_x(), formation.rightmost_x(), formation.lowest_y()) == (100, 280, 180)
+    
+    # Moving the formation only changes the shared offset
+    formation.shift(5, 25)
+    assert formation.position(2, 3) == (285, 205)
+    assert formation.lowest_y() == 205
+    
+    # Emptying the rightmost column shrinks the bounds at once
+    for row in range(3):
+        assert formation.kill(row, 3)
+    assert not formation.kill(0, 3)  # Already dead
+    assert formation.rightmost_x() == 225
+    assert formation.leftmost_x() == 105
+    
+    # Emptying the bottom row raises the lowest point
+    for col in range(3):
+        formation.kill(2, col)
+    assert formation.lowest_y() == 155
+    assert not formation.is_alive(2, 0) and formation.is_alive(1, 0)
+    
+    # Killing from the left edge inwards
+    for row in range(2):
+        formation.kill(row, 0)
+    assert formation.leftmost_x() == 165
+    
+    for row in range(2):
+        for col in range(1, 3):
+            formation.kill(row, col)
+    assert len(formation) == 0 and not formation
+    
+    print("Formation tests completed.")
+
+if __name__ == "__main__":
+    test_formation_bounds()
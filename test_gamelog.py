@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# Test script for the game logging layer
+
+import io
+import time
+import gamelog
+
+def test_gamelog():
+    """Test levels, category toggles, rate limiting and the background writer."""
+    print("Testing game logging...")
+
+    stream = io.StringIO()
+    gamelog.configure("warning,collision=debug,audio=off", stream=stream, burst=3, interval=60)
+    game = gamelog.get_logger("game")
+    collision = gamelog.get_logger("collision")
+    audio = gamelog.get_logger("audio")
+
+    # Levels and per-category toggles
+    game.debug("hidden %s", "debug")
+    game.warning("shown %s", "warning")
+    collision.debug("collision debug")
+    audio.error("audio is off")
+
+    # Only `burst` identical errors get through per interval
+    for i in range(10):
+        collision.error("Error in collision detection: %s", i)
+    assert gamelog.suppressed_count() == 7
+
+    # Disabled calls never format their arguments (benchmarks/bench_suite.py times them)
+    class Counted:
+        formatted = 0
+
+        def __str__(self):
+            Counted.formatted += 1
+            return "counted"
+
+    assert not game.is_enabled_for(gamelog.DEBUG)
+    for _ in range(100):
+        game.debug("frame %s", Counted())
+    assert Counted.formatted == 0
+
+    # Records are written by the background listener; shutdown drains it
+    gamelog.shutdown()
+    output = stream.getvalue()
+    print(output)
+    assert "shown warning" in output and "collision debug" in output
+    assert "hidden" not in output and "audio is off" not in output
+    assert output.count("Error in collision detection") == 3
+
+    # After the window, the next error reports how many were dropped
+    gamelog.configure("warning", stream=stream, burst=1, interval=0.01)
+    game.error("busy")
+    game.error("busy")
+    time.sleep(0.02)
+    game.error("busy")
+    gamelog.shutdown()
+    assert "busy (1 similar messages suppressed)" in stream.getvalue()
+
+    print("Game logging tests completed.")
+
+if __name__ == "__main__":
+    test_gamelog()
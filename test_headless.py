@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# Test script for running the game without a display
+
+import os
+import random
+import tempfile
+import socket
+import headless
+import ui
+from leaderboard import LeaderboardManager
+from leaderboard_service import RemoteLeaderboard
+
+def test_headless_game():
+    """Test that a GameScreen plays on the headless canvas and virtual clock."""
+    print("Testing headless game...")
+
+    random.seed(1)
+    root = headless.HeadlessRoot()
+    with headless.headless_tk(root), tempfile.TemporaryDirectory() as tmp:
+        game = ui.GameScreen(root, "Tester")
+        game.leaderboard = LeaderboardManager(os.path.join(tmp, "test.db"))
+        enemies_at_start = len(game.enemies)
+        assert enemies_at_start == game.enemy_rows * game.enemy_cols
+
+        # Hold fire for five simulated seconds
+        for frame in range(300):
+            if frame % 5 == 0:
+                root.event("<space>")
+            root.advance(16)
+
+        print(f"Score {game.score}, {len(game.enemies)} enemies left, "
+              f"{game.canvas.calls} canvas calls in {root.now_ms / 1000:.1f} simulated seconds")
+        assert root.now_ms == 300 * 16
+        assert game.score > 0 and len(game.enemies) < enemies_at_start
+        assert len(game.formation) == len(game.enemies)
+        game.leaderboard.close()
+
+    print("Headless game tests completed.")
+
+def test_restart_reuses_items():
+    """Test that restarting resets the playfield in place instead of redrawing it."""
+    print("Testing restart...")
+
+    random.seed(2)
+    root = headless.HeadlessRoot()
+    with headless.headless_tk(root), tempfile.TemporaryDirectory() as tmp:
+        game = ui.GameScreen(root, "Tester")
+        game.leaderboard = LeaderboardManager(os.path.join(tmp, "test.db"))
+        ship, pause_frame = game.player_ship, game.pause_frame
+        block_count = len(game.barrier_blocks)
+        widgets = root.winfo_children()
+        item_counts = []
+
+        for _ in range(5):
+            # Play a little, damage a barrier block, then lose
+            for frame in range(60):
+                if frame % 5 == 0:
+                    root.event("<space>")
+                root.advance(16)
+            game.barrier_blocks[0].health = 1
+            game.check_bullet_hit_barrier(game.canvas.coords(game.barrier_blocks[0].id))
+            game.game_over()
+            root.advance(16)
+            assert not game.game_running and not game.enemies
+            assert game.canvas.find_withtag("game_over")
+
+            # Space restarts; the game loop resumes after a short delay
+            root.event("<space>")
+            root.advance(100)
+            assert game.game_running and game.score == 0 and game.level == 1
+            assert len(game.enemies) == game.enemy_rows * game.enemy_cols
+            assert len(game.barrier_blocks) == block_count
+            assert all(block.health == 3 for block in game.barrier_blocks)
+            assert not game.canvas.find_withtag("game_over")
+            item_counts.append(len(game.canvas.find_all()))
+
+        # Same ship and widgets, and no canvas items leaked between games
+        assert game.player_ship == ship and game.pause_frame is pause_frame
+        assert root.winfo_children() == widgets
+        assert game.canvas.itemcget(ship, "state") == "normal"
+        print(f"Canvas items after each restart: {item_counts}")
+        assert max(item_counts) - min(item_counts) <= 5   # Bullets in flight
+        game.wait_for_results()
+        game.leaderboard.close()
+
+    print("Restart tests completed.")
+
+def test_resize_keeps_world():
+    """Test that a bigger window scales the drawing but not the game."""
+    print("Testing resize...")
+
+    results = []
+    for size in (None, (1920, 1080)):
+        random.seed(3)
+        root = headless.HeadlessRoot()
+        with headless.headless_tk(root), tempfile.TemporaryDirectory() as tmp:
+            game = ui.GameScreen(root, "Tester")
+            game.leaderboard = LeaderboardManager(os.path.join(tmp, "test.db"))
+            real = game.canvas.canvas
+            if size:
+                real.resize(*size)
+            game.canvas.flush()
+            calls_before = real.calls
+            for frame in range(300):
+                if frame % 5 == 0:
+                    root.event("<space>")
+                game.set_key_state("left", frame % 120 < 60)
+                game.set_key_state("right", frame % 120 >= 60)
+                root.advance(16)
+            game.canvas.flush()
+
+            # The ship is drawn at its world position times the scale
+            scale, x0, y0 = game.canvas.view_scale, game.canvas.view_x, game.canvas.view_y
+            world = game.canvas.coords(game.player_ship)
+            expected = [(x0 if i % 2 == 0 else y0) + value * scale for i, value in enumerate(world)]
+            assert all(abs(a - b) < 1e-6 for a, b in zip(real.coords(game.player_ship), expected))
+            results.append((game.score, game.player_x, len(game.enemies),
+                            real.calls - calls_before))
+            if size:
+                assert scale == 1.8 and game.pause_frame.placed == {"x": 1590, "y": 81}
+            game.leaderboard.close()
+
+    print(f"800x600 vs 1920x1080 (score, x, enemies, canvas calls): {results}")
+    # Same game, and the same canvas calls per frame at either size
+    assert results[0] == results[1]
+
+    print("Resize tests completed.")
+
+def test_game_over_screen():
+    """Test that game over draws its screen without waiting for the leaderboard, even a dead one."""
+    print("Testing game over screen...")
+
+    def game_over_texts(game, root):
+        game.game_over()
+        texts = lambda: [game.canvas.itemcget(item, "text") for item in game.canvas.find_withtag("game_over")]
+        assert "Press SPACE to play again" in texts()
+        game.wait_for_results()
+        root.advance(100)   # The screen is filled in by the next poll
+        return texts()
+
+    # A leaderboard service nobody is running
+    probe = socket.socket()
+    probe.bind(("127.0.0.1", 0))
+    port = probe.getsockname()[1]
+    probe.close()
+
+    root = headless.HeadlessRoot()
+    with headless.headless_tk(root), tempfile.TemporaryDirectory() as tmp:
+        game = ui.GameScreen(root, "Tester")
+        game.leaderboard = LeaderboardManager(os.path.join(tmp, "test.db"))
+        root.advance(16)   # Starts fetching the live rank index
+        game.rank_task.result()
+        root.advance(16)   # ... and picks it up
+        assert game.rank_index is not None
+        game.score = 120
+        texts = game_over_texts(game, root)
+        assert "Rank: #1   Best: 120   Games: 1" in texts
+        assert "1. Tester: 120 pts (Level 1)" in texts
+        local = game.leaderboard
+
+        # The service is down: the screen falls back to the live rank and
+        # the top scores seen last time, and the next game still starts
+        game.leaderboard = RemoteLeaderboard(f"http://127.0.0.1:{port}", timeout=0.5)
+        root.event("<space>")
+        root.advance(100)
+        game.score = 50
+        texts = game_over_texts(game, root)
+        assert "Rank: #2" in texts
+        assert "1. Tester: 120 pts (Level 1)" in texts
+        assert any("unavailable" in text for text in texts)
+        root.event("<space>")
+        root.advance(100)
+        assert game.game_running and not game.canvas.find_withtag("game_over")
+        game.leaderboard._pending.clear()   # Nowhere to send them
+        game.leaderboard.close()
+        local.close()
+
+    print("Game over screen tests completed.")
+
+if __name__ == "__main__":
+    test_headless_game()
+    test_restart_reuses_items()
+    test_resize_keeps_world()
+    test_game_over_screen()
@@ -3,6 +3,9 @@
 
 import tkinter as tk
 import os
+import json
+import sqlite3
+from datetime import datetime
 from leaderboard import LeaderboardManager
 
 def test_leaderboard():
@@ -51,12 +54,243 @@ def test_leaderboard():
         print(f"Random fact: {fact}")
     
     # Clean up test database
+    lm.close()
     if os.path.exists(test_db):
         os.remove(test_db)
         print("\nTest database removed.")
     
     print("Leaderboard tests completed.")
 
+def test_leaderboard_cache():
+    """Test the in-memory top-N cache and rank lookups."""
+    print("Testing leaderboard cache...")
+    
+    test_db = "test_leaderboard_cache.db"
+    if os.path.exists(test_db):
+        os.remove(test_db)
+    
+    lm = LeaderboardManager(test_db, cache_size=3)
+    other = LeaderboardManager(test_db)  # Simulates a second process
+    
+    for name, score, level in [("A", 100, 1), ("B", 300, 2), ("C", 200, 2)]:
+        lm.add_score(name, score, level)
+    
+    # Write-through keeps the cache in score order
+    assert [row[0] for row in lm.get_top_scores(3)] == ["B", "C", "A"]
+    lm.add_score("D", 250, 3)
+    assert [row[0] for row in lm.get_top_scores(3)] == ["B", "D", "C"]
+    assert lm.get_player_rank("D", 250) == 2
+    assert lm.get_player_rank("E", 1000) == 1
+    
+    # Asking for more rows than are cached falls back to the database
+    assert [row[0] for row in lm.get_top_scores(10)] == ["B", "D", "C", "A"]
+    
+    # A write through another connection is picked up via data_version
+    other.add_score("F", 500, 4)
+    assert lm.get_top_scores(1)[0][0] == "F"
+    assert lm.get_player_rank("B", 300) == 2
+    
+    # Clearing invalidates the cache
+    other.clear_leaderboard()
+    assert lm.get_top_scores() == []
+    lm.add_score("G", 50, 1)
+    assert lm.get_player_rank("G", 50) == 1
+    
+    lm.close()
+    other.close()
+    if os.path.exists(test_db):
+        os.remove(test_db)
+    
+    print("Leaderboard cache tests completed.")
+
+def test_leaderboard_import_export():
+    """Test bulk JSON import and streaming export."""
+    print("Testing leaderboard import/export...")
+    
+    test_db = "test_leaderboard_bulk.db"
+    export_path = "test_leaderboard_export.json"
+    for path in (test_db, export_path):
+        if os.path.exists(path):
+            os.remove(path)
+    
+    lm = LeaderboardManager(test_db)
+    lm.add_score("Existing", 100, 2)
+    
+    # Import the bundled leaderboard.json using a tiny chunk size so that
+    # records are split across reads
+    bundled = os.path.join(os.path.dirname(os.path.abspath(__file__)), "leaderboard.json")
+    imported = lm.import_json(bundled, chunk_size=16)
+    print(f"Imported {imported} scores")
+    assert imported == 5
+    assert lm.get_top_scores(1)[0][:2] == ("IlanUzan", 9500)
+    assert lm.get_player_rank("Existing", 100) == 6
+    
+    # Export and re-import into a fresh database
+    exported = lm.export_json(export_path)
+    assert exported == 6
+    lm.clear_leaderboard()
+    assert lm.import_json(export_path) == 6
+    assert [row[1] for row in lm.iter_scores()] == [9500, 8750, 7800, 6950, 5500, 100]
+    assert lm.get_top_scores(6)[-1][:3] == ("Existing", 100, 2)
+    
+    # A malformed record in the middle fails straight away with its position,
+    # and nothing from the file is imported
+    good = '{"name": "Good", "score": 10}, '
+    bad = '{"name": "A", "score": }'
+    with open(export_path, "w") as f:
+        f.write("[" + good * 200 + bad + ", " + good * 5000 + "]")
+    try:
+        lm.import_json(export_path, chunk_size=64)
+        assert False, "a malformed record should be rejected"
+    except ValueError as e:
+        print(f"Malformed record: {e}")
+        assert f"character {1 + len(good) * 200 + len(bad) - 1}" in str(e)
+    assert len(lm.get_top_scores(10)) == 6
+    
+    lm.close()
+    for path in (test_db, export_path):
+        if os.path.exists(path):
+            os.remove(path)
+    
+    print("Leaderboard import/export tests completed.")
+
+def test_leaderboard_write_behind():
+    """Test queued score submissions and the durable flush on close."""
+    print("Testing write-behind mode...")
+    
+    test_db = "test_leaderboard_queue.db"
+    if os.path.exists(test_db):
+        os.remove(test_db)
+    
+    # A long flush interval keeps scores queued until we flush explicitly
+    lm = LeaderboardManager(test_db, write_behind=True, flush_interval=60, batch_size=1000)
+    observer = LeaderboardManager(test_db)
+    
+    assert lm.submit_score("A", 300, 3) == 1
+    assert lm.submit_score("B", 500, 4) == 1
+    assert lm.submit_score("C", 400, 4) == 2
+    
+    # Queued scores are visible locally but not committed yet
+    assert [row[0] for row in lm.get_top_scores(3)] == ["B", "C", "A"]
+    assert observer.get_top_scores() == []
+    
+    lm.flush()
+    assert [row[0] for row in observer.get_top_scores(3)] == ["B", "C", "A"]
+    
+    # Another process writing doesn't lose our queued scores
+    lm.add_score("D", 450, 5)
+    observer.add_score("E", 1000, 9)
+    assert [row[0] for row in lm.get_top_scores(3)] == ["E", "B", "D"]
+    
+    # close() flushes whatever is still queued
+    lm.add_score("F", 50, 1)
+    lm.close()
+    assert observer.get_player_rank("F", 50) == 6
+    
+    observer.close()
+    if os.path.exists(test_db):
+        os.remove(test_db)
+    
+    print("Write-behind tests completed.")
+
+def test_player_stats():
+    """Test the per-player summary table and personal-best queries."""
+    print("Testing player statistics...")
+    
+    test_db = "test_leaderboard_stats.db"
+    if os.path.exists(test_db):
+        os.remove(test_db)
+    
+    lm = LeaderboardManager(test_db)
+    assert lm.get_player_stats("Nobody") is None
+    assert lm.get_personal_best("Nobody") == 0
+    
+    for score, level in [(100, 2), (400, 5), (250, 3)]:
+        lm.add_score("Ace", score, level)
+    lm.add_score("Other", 999, 9)
+    
+    stats = lm.get_player_stats("Ace")
+    print(f"Ace stats: {stats}")
+    assert stats["games_played"] == 3
+    assert stats["best_score"] == 400
+    assert stats["average_score"] == 250
+    assert stats["max_level"] == 5
+    assert [game[0] for game in lm.get_recent_games("Ace", 2)] == [250, 400]
+    
+    # A database that predates player_stats gets backfilled on open
+    lm._conn.execute("DROP TABLE player_stats")
+    lm._conn.commit()
+    lm.close()
+    lm = LeaderboardManager(test_db)
+    assert lm.get_personal_best("Ace") == 400
+    assert lm.get_player_stats("Other")["games_played"] == 1
+    
+    lm.clear_leaderboard()
+    assert lm.get_player_stats("Ace") is None
+    
+    lm.close()
+    if os.path.exists(test_db):
+        os.remove(test_db)
+    
+    print("Player statistics tests completed.")
+
+def test_window_leaderboards():
+    """Test daily, weekly and monthly leaderboards."""
+    print("Testing time-windowed leaderboards...")
+    
+    test_db = "test_leaderboard_windows.db"
+    dump_path = "test_leaderboard_windows.json"
+    for path in (test_db, dump_path):
+        if os.path.exists(path):
+            os.remove(path)
+    
+    # An old-style database without bucket columns gets migrated on open
+    conn = sqlite3.connect(test_db)
+    conn.execute(
+        "CREATE TABLE leaderboard (id INTEGER PRIMARY KEY AUTOINCREMENT, player_name TEXT NOT NULL, "
+        "score INTEGER NOT NULL, level INTEGER NOT NULL, date_time TEXT NOT NULL)"
+    )
+    conn.execute("INSERT INTO leaderboard (player_name, score, level, date_time) "
+                 "VALUES ('Old', 700, 6, '2024-03-01 10:00:00')")
+    conn.commit()
+    conn.close()
+    
+    with open(dump_path, "w") as f:
+        json.dump({"scores": [
+            {"name": "Sun", "score": 500, "timestamp": "2024-03-10 23:59:59"},    # Sunday
+            {"name": "Mon", "score": 300, "timestamp": "2024-03-11 00:00:01"},    # Monday
+            {"name": "Mon2", "score": 400, "timestamp": "2024-03-11 18:30:00"},
+            {"name": "Wed", "score": 200, "timestamp": "2024-03-13 12:00:00"},
+            {"name": "Feb", "score": 900, "timestamp": "2024-02-28 12:00:00"},
+        ]}, f)
+    
+    lm = LeaderboardManager(test_db)
+    lm.import_json(dump_path)
+    when = datetime(2024, 3, 11, 20, 0, 0)
+    
+    def names(rows):
+        return [row[0] for row in rows]
+    
+    assert names(lm.get_window_top_scores("daily", when=when)) == ["Mon2", "Mon"]
+    assert names(lm.get_window_top_scores("weekly", when=when)) == ["Mon2", "Mon", "Wed"]
+    assert names(lm.get_window_top_scores("monthly", when=when)) == ["Old", "Sun", "Mon2", "Mon", "Wed"]
+    assert names(lm.get_window_top_scores("all-time", 1)) == ["Feb"]
+    
+    assert lm.get_window_rank("daily", 350, when=when) == 2
+    assert lm.get_window_rank("weekly", 1000, when=when) == 1
+    assert lm.get_window_rank("monthly", 450, when=when) == 3
+    
+    # Scores added now land in today's board
+    lm.add_score("Today", 10, 1)
+    assert names(lm.get_window_top_scores("daily")) == ["Today"]
+    
+    lm.close()
+    for path in (test_db, dump_path):
+        if os.path.exists(path):
+            os.remove(path)
+    
+    print("Time-windowed leaderboard tests completed.")
+
 def test_game_over_ui():
     """Test the game over UI with leaderboard integration."""
     print("Testing game over UI...")
@@ -185,6 +419,16 @@ if __name__ == "__main__":
     # Run the tests
     test_leaderboard()
     print("\n" + "="*40 + "\n")
+    test_leaderboard_cache()
+    print("\n" + "="*40 + "\n")
+    test_leaderboard_import_export()
+    print("\n" + "="*40 + "\n")
+    test_leaderboard_write_behind()
+    print("\n" + "="*40 + "\n")
+    test_player_stats()
+    print("\n" + "="*40 + "\n")
+    test_window_leaderboards()
+    print("\n" + "="*40 + "\n")
     test_game_over_ui()
     
     print("\nAll tests completed.") 
\ No newline at end of file
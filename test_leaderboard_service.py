@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# Test script for the leaderboard HTTP service and client
+
+import http.client
+import json
+import os
+import socket
+from leaderboard import LeaderboardManager
+from leaderboard_service import LeaderboardServer, RemoteLeaderboard
+
+def test_leaderboard_service():
+    """Run the service and a client against each other on localhost."""
+    print("Testing leaderboard service...")
+    
+    test_db = "test_leaderboard_service.db"
+    if os.path.exists(test_db):
+        os.remove(test_db)
+    
+    manager = LeaderboardManager(test_db)
+    server = LeaderboardServer(manager, port=0).start()
+    client = RemoteLeaderboard(server.url, batch_size=3, cache_ttl=60)
+    print(f"Service running at {server.url}")
+    
+    try:
+        # Scores are batched until the batch is full or a read needs them
+        client.add_score("Player1", 1000, 5)
+        client.add_score("Player2", 1500, 7)
+        assert manager.get_top_scores() == []
+        assert [row[0] for row in client.get_top_scores(5)] == ["Player2", "Player1"]
+        
+        # Submitting returns the rank straight away and refreshes the cache
+        assert client.submit_score("Player3", 1200, 6) == 2
+        assert [row[1] for row in client.get_top_scores(5)] == [1500, 1200, 1000]
+        assert client.get_player_rank("Player4", 1100) == 3
+        
+        # Reads are answered from the local cache within the TTL
+        manager.add_score("Direct", 5000, 10)
+        assert client.get_top_scores(5)[0][0] == "Player2"
+        
+        assert client.get_player_stats("Player1")["games_played"] == 1
+        assert client.get_player_stats("Nobody") is None
+        assert client.get_personal_best("Player2") == 1500
+        assert [row[0] for row in client.get_window_top_scores("daily", 2)] == ["Direct", "Player2"]
+        assert client.get_random_space_fact() in manager.space_facts
+        
+        # The rank index ranks scores locally, without a request per lookup
+        index = client.get_rank_index()
+        assert len(index) == 4 and index.rank(1100) == 4 and index.rank(9000) == 1
+        
+        # Whatever is still batched is sent on close
+        client.add_score("Last", 1, 1)
+        client.close()
+        assert manager.get_player_rank("Last", 1) == 5
+    finally:
+        server.stop()
+        manager.close()
+        if os.path.exists(test_db):
+            os.remove(test_db)
+    
+    print("Leaderboard service tests completed.")
+
+
+def test_failed_flush_keeps_scores():
+    """Test that a batch survives a service that is down, and bad batches store nothing."""
+    print("Testing failed flushes...")
+    
+    test_db = "test_leaderboard_service_retry.db"
+    if os.path.exists(test_db):
+        os.remove(test_db)
+    
+    # A port nothing listens on (yet)
+    probe = socket.socket()
+    probe.bind(("127.0.0.1", 0))
+    port = probe.getsockname()[1]
+    probe.close()
+    
+    manager = LeaderboardManager(test_db)
+    client = RemoteLeaderboard(f"http://127.0.0.1:{port}", batch_size=10, timeout=1.0)
+    server = None
+    try:
+        client.add_score("Player1", 1000, 5)
+        client.add_score("Player2", 1500, 7)
+        try:
+            client.get_player_rank("Player3", 1200)
+            assert False, "the service is down"
+        except OSError:
+            pass
+        assert len(client._pending) == 2
+        
+        # Once the service is up the same batch goes through, once
+        server = LeaderboardServer(manager, port=port).start()
+        assert client.get_player_rank("Player3", 1200) == 2
+        assert client._pending == []
+        assert [row[1] for row in manager.get_top_scores()] == [1500, 1000]
+        
+        # A batch with a bad row is refused as a whole
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1.0)
+        body = json.dumps({"scores": [["Good", 10, 1], ["Bad", "lots", 1]]})
+        conn.request("POST", "/scores", body=body, headers={"Content-Type": "application/json"})
+        assert conn.getresponse().status == 400
+        conn.close()
+        assert len(manager.get_top_scores()) == 2
+        assert manager.get_player_stats("Good") is None
+        
+        # A good batch is stored together, ranked against the whole batch
+        assert manager.submit_scores([("A", 2000, 1), ("B", 3000, 1)]) == [2, 1]
+        assert manager.get_player_stats("B")["games_played"] == 1
+        client.close()
+    finally:
+        if server is not None:
+            server.stop()
+        manager.close()
+        if os.path.exists(test_db):
+            os.remove(test_db)
+    
+    print("Failed flush tests completed.")
+
+if __name__ == "__main__":
+    test_leaderboard_service()
+    test_failed_flush_keeps_scores()
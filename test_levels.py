@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# Test script for the level table and its hot reload
+
+import json
+import os
+import random
+import tempfile
+import headless
+import ui
+from levels import LevelConfig, LevelTable, curve_value, DEFAULT_LEVELS_PATH
+from leaderboard import LeaderboardManager
+
+def test_level_table():
+    """Test the curves, the per-level overrides and the compiled table."""
+    print("Testing level table...")
+
+    assert curve_value({"start": 4, "step": 1, "every": 2, "max": 7}, 1) == 4
+    assert curve_value({"start": 4, "step": 1, "every": 2, "max": 7}, 5) == 6
+    assert curve_value({"start": 4, "step": 1, "every": 2, "max": 7}, 99) == 7
+    assert curve_value({"start": 27, "step": -3, "min": 3}, 20) == 3
+    assert curve_value({"start": 6, "step": 1, "every": 3, "first": 0}, 3) == 7
+
+    table = LevelTable.from_file(DEFAULT_LEVELS_PATH)
+    first = table.settings(1)
+    assert (first.enemy_speed, first.enemy_rows, first.enemy_shot_cooldown) == (3, 5, 1000)
+    assert table.settings(0) is first
+    assert table.settings(10).bonus_shield and not table.settings(9).bonus_shield
+    assert table.settings(6).difficulty == "MEDIUM" and table.settings(16).difficulty == "EXTREME"
+    assert isinstance(table.settings(4).enemy_move_delay, int)
+    assert table.settings(4).enemy_speed == 4.4   # Float noise rounded away
+
+    # Levels past the precompiled ones are compiled on demand
+    compiled = len(table.levels)
+    assert table.settings(compiled + 5).level == compiled + 5
+    assert len(table.levels) == compiled + 5
+
+    with open(DEFAULT_LEVELS_PATH) as f:
+        config = json.load(f)
+    config["levels"]["2"] = {"enemy_rows": 9}
+    assert LevelTable(config).settings(2).enemy_rows == 9
+    config["levels"]["2"] = {"alien_speed": 9}
+    try:
+        LevelTable(config)
+        assert False, "an unknown parameter should be rejected"
+    except ValueError:
+        pass
+
+    print("Level table tests completed.")
+
+def test_hot_reload():
+    """Test that an edited level file is picked up and a broken one ignored."""
+    print("Testing level hot reload...")
+
+    with open(DEFAULT_LEVELS_PATH) as f:
+        config = json.load(f)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "levels.json")
+        with open(path, "w") as f:
+            json.dump(config, f)
+        levels = LevelConfig(path)
+        assert levels.settings(1).enemy_rows == 5
+        assert not levels.reload_if_changed()
+
+        config["levels"]["1"]["enemy_rows"] = 3
+        with open(path, "w") as f:
+            json.dump(config, f, indent=1)   # Different size, so a new stamp
+        assert levels.reload_if_changed()
+        assert levels.settings(1).enemy_rows == 3
+
+        # A half-written file keeps the last good table
+        with open(path, "w") as f:
+            f.write('{"curves": ')
+        assert not levels.reload_if_changed()
+        assert levels.settings(1).enemy_rows == 3
+
+    print("Level hot reload tests completed.")
+
+def test_level_transition():
+    """Test that the game takes each level's settings from the table."""
+    print("Testing level transition...")
+
+    random.seed(6)
+    root = headless.HeadlessRoot()
+    with headless.headless_tk(root), tempfile.TemporaryDirectory() as tmp:
+        game = ui.GameScreen(root, "Tester")
+        game.leaderboard = LeaderboardManager(os.path.join(tmp, "test.db"))
+        for level in (1, 2, 3):
+            settings = game.levels.settings(level)
+            assert game.level == level
+            assert game.enemy_speed == settings.enemy_speed
+            assert game.enemy_bullet_speed == settings.enemy_bullet_speed
+            assert len(game.enemies) == settings.enemy_rows * game.enemy_cols
+            game.level_complete()
+            root.advance(3600)   # The next wave spawns 3.5 s later
+
+        game.update_level(7)
+        assert game.level == 11
+        assert game.enemy_shot_cooldown == game.levels.settings(11).enemy_shot_cooldown
+        game.leaderboard.close()
+
+    print("Level transition tests completed.")
+
+if __name__ == "__main__":
+    test_level_table()
+    test_hot_reload()
+    test_level_transition()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# Test script for the particle engine
+
+from particles import ParticleEngine
+
+class RecordingCanvas:
+    """Just enough of a canvas to count the items the engine creates."""
+    def __init__(self):
+        self.created = 0
+        self.hidden = set()
+        
+    def create_oval(self, *coords, **options):
+        self.created += 1
+        return self.created
+        
+    def coords(self, item, *coords):
+        pass
+        
+    def itemconfig(self, item, **options):
+        if options.get("state") == "hidden":
+            self.hidden.add(item)
+        else:
+            self.hidden.discard(item)
+
+def test_particle_budget_and_pooling():
+    """Test that particles expire, ovals are reused and the budget holds."""
+    print("Testing particle engine...")
+    
+    canvas = RecordingCanvas()
+    engine = ParticleEngine(canvas, budget=20)
+    
+    engine.emit_burst(100, 100, count=8, colors=["#FFFFFF"], speed=5, life=10)
+    assert len(engine) == 8 and canvas.created == 8
+    for _ in range(10):
+        engine.update()
+    assert len(engine) == 0 and len(canvas.hidden) == 8
+    
+    # The next burst reuses the pooled ovals
+    engine.emit_burst(200, 200, count=8, colors=["#FFFFFF"], speed=5, life=10)
+    assert canvas.created == 8 and not canvas.hidden
+    
+    # A storm larger than the budget is trimmed instead of piling up
+    for _ in range(10):
+        engine.emit_random(300, 300, 15, ["#CCCCFF"], 5, (3, 8), 20)
+    assert len(engine) == 20 and canvas.created == 20
+    assert engine.dropped > 0
+    
+    # Lower density emits fewer particles per effect
+    engine.clear()
+    engine.density = 0.5
+    engine.emit_burst(0, 0, count=8, colors=["#FFFFFF"], speed=5, life=10)
+    assert len(engine) == 4
+    
+    print("Particle engine tests completed.")
+
+if __name__ == "__main__":
+    test_particle_budget_and_pooling()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# Test script for the adaptive quality governor
+
+import os
+import tempfile
+import time
+import headless
+import ui
+from leaderboard import LeaderboardManager
+from quality import QualityGovernor, QUALITY_TIERS
+
+class SteppedClock:
+    """Stands in for ui's time module with a perf_counter() the test moves by hand."""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def perf_counter(self):
+        return self.now
+    
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+def test_quality_governor():
+    """Test that quality drops under pressure and recovers with headroom."""
+    print("Testing quality governor...")
+    
+    changes = []
+    governor = QualityGovernor(frame_budget_ms=16, degrade_frames=5, restore_frames=10,
+                               smoothing=1.0, on_change=lambda g: changes.append(g.tier))
+    
+    # Comfortable frames keep full quality
+    for _ in range(50):
+        governor.record_frame(4)
+    assert governor.tier == 0 and governor.settings["flash_style"] == "stipple"
+    
+    # Sustained slow frames shed effects one tier at a time
+    for _ in range(5):
+        governor.record_frame(30)
+    assert governor.tier == 1
+    for _ in range(100):
+        governor.record_frame(30)
+    assert governor.tier == len(QUALITY_TIERS) - 1
+    assert governor.settings["flash_style"] == "none"
+    
+    # Frames in between the thresholds don't change anything
+    for _ in range(100):
+        governor.record_frame(12)
+    assert governor.tier == len(QUALITY_TIERS) - 1
+    
+    # Headroom restores quality
+    for _ in range(10):
+        governor.record_frame(2)
+    assert governor.tier == len(QUALITY_TIERS) - 2
+    
+    info = governor.debug_info()
+    print(f"Debug info: {info['name']} after {len(info['transitions'])} transitions")
+    assert info["transitions"][-1][1:3] == (3, 2)
+    assert changes == [1, 2, 3, 2]
+    
+    # A locked tier ignores frame times
+    governor.set_tier(0, lock=True)
+    for _ in range(100):
+        governor.record_frame(50)
+    assert governor.tier == 0
+    
+    print("Quality governor tests completed.")
+
+def test_game_loop_measures_frame_period():
+    """Test that slow frames lower the tier even when the game loop's own work is cheap."""
+    print("Testing frame period measurement...")
+    
+    root = headless.HeadlessRoot()
+    clock = SteppedClock()
+    
+    def frame(period_ms):
+        # The next frame starts period_ms after the last, however cheap its own work
+        clock.now += period_ms / 1000.0
+        root.advance(16)
+    
+    ui.time = clock
+    try:
+        with headless.headless_tk(root), tempfile.TemporaryDirectory() as tmp:
+            game = ui.GameScreen(root, "Tester")
+            game.leaderboard = LeaderboardManager(os.path.join(tmp, "test.db"))
+            game.quality.degrade_frames = 5
+            game.quality.smoothing = 0.5
+            
+            # Back-to-back frames leave plenty of headroom
+            for _ in range(20):
+                frame(16)
+            assert game.quality.tier == 0 and game.quality.average_ms < 8
+            
+            # Frames arrive 40 ms apart - as when Tk spends the time drawing between them
+            for _ in range(20):
+                frame(40)
+            print(f"Smoothed frame time {game.quality.average_ms:.1f} ms, tier {game.quality.tier}")
+            assert game.quality.tier > 0
+            
+            # A pause doesn't count as one long frame
+            game.quality.set_tier(0)
+            game.toggle_pause()
+            frame(200)
+            game.toggle_pause()
+            for _ in range(3):
+                frame(16)
+            assert game.quality.tier == 0 and game.quality.average_ms < 40
+            game.leaderboard.close()
+    finally:
+        ui.time = time
+    
+    print("Frame period tests completed.")
+
+if __name__ == "__main__":
+    test_quality_governor()
+    test_game_loop_measures_frame_period()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# Test script for the rank index and the live rank HUD
+
+import os
+import random
+import tempfile
+from bisect import bisect_right
+import headless
+import ui
+from leaderboard import LeaderboardManager
+from rankindex import RankIndex
+
+def test_rank_index():
+    """Test the index against a sorted list, including growth and odd scores."""
+    print("Testing rank index...")
+    
+    random.seed(5)
+    index = RankIndex(capacity=4)
+    scores = []
+    for _ in range(3000):
+        # Mostly game-like multiples of 10, plus negatives and huge scores
+        score = random.choice([random.randrange(0, 5000, 10), random.randint(-50, 50),
+                               random.randint(0, 10 ** 7)])
+        index.add(score)
+        scores.append(score)
+    scores.sort()
+    
+    for probe in [-100, -1, 0, 5, 10, 63, 64, 4990, 10 ** 7, 10 ** 8] + scores[::97]:
+        expected = len(scores) - bisect_right(scores, probe)
+        assert index.count_above(probe) == expected, probe
+        assert index.rank(probe) == expected + 1
+    assert len(index) == len(scores)
+    
+    # Rebuilt from its counts, and copied, it answers the same
+    rebuilt = RankIndex.from_counts(index.items())
+    copy = index.copy()
+    index.add(10 ** 9)
+    for probe in scores[::211]:
+        assert rebuilt.rank(probe) == copy.rank(probe) == index.rank(probe) - 1
+    assert RankIndex().rank(100) == 1
+    
+    # Huge scores share the last bucket instead of growing the tree to reach them
+    huge = RankIndex.from_counts([(100, 1), (2 ** 30, 1)])
+    huge.add(2 ** 40)
+    huge.add(2 ** 40 - 1)
+    assert len(huge._tree) <= RankIndex.MAX_BUCKETS + 1
+    assert [huge.rank(score) for score in (2 ** 41, 2 ** 40, 2 ** 35, 2 ** 30, 100)] == [1, 1, 3, 3, 4]
+    
+    print("Rank index tests completed.")
+
+def test_live_rank_hud():
+    """Test that the HUD shows the rank the score climbs to, and keeps it across games."""
+    print("Testing live rank HUD...")
+    
+    root = headless.HeadlessRoot()
+    with headless.headless_tk(root), tempfile.TemporaryDirectory() as tmp:
+        game = ui.GameScreen(root, "Tester")
+        game.leaderboard = LeaderboardManager(os.path.join(tmp, "test.db"))
+        for score in (100, 200, 300):
+            game.leaderboard.add_score("Rival", score, 1)
+        
+        def advance_until_index():
+            for _ in range(100):
+                root.advance(16)
+                if game.rank_task is None and game.rank_index is not None:
+                    return
+            assert False, "rank index never arrived"
+        
+        advance_until_index()
+        assert game.canvas.itemcget(game.rank_text, "text") == ""
+        for score, rank in ((150, 3), (250, 2), (260, 2), (1000, 1)):
+            game.score = score
+            root.advance(16)
+            assert game.canvas.itemcget(game.rank_text, "text") == f"You are now #{rank}"
+        
+        # The finished game counts toward the next one's ranks
+        game.game_over()
+        game.restart_game_safe()
+        root.advance(100)
+        game.score = 500
+        root.advance(16)
+        assert game.canvas.itemcget(game.rank_text, "text") == "You are now #2"
+        
+        # One absurd score doesn't break ranking for everybody else
+        game.wait_for_results()
+        game.leaderboard.add_score("Cheater", 2 ** 40, 1)
+        assert game.leaderboard.get_player_rank("Tester", 500) == 3
+        assert game.leaderboard.get_rank_index().rank(2 ** 41) == 1
+        game.leaderboard.close()
+    
+    print("Live rank HUD tests completed.")
+
+if __name__ == "__main__":
+    test_rank_index()
+    test_live_rank_hud()
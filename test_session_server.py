@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# Test script for the multi-session server
+
+import asyncio
+import json
+import os
+import tempfile
+import headless
+import session_server
+from bot import ReferenceBot
+from leaderboard import LeaderboardManager
+
+def test_sessions_share_a_process():
+    """Test that sessions in one process keep their own clocks and games."""
+    print("Testing sessions in one process...")
+
+    with headless.headless_tk(headless.HeadlessRoot()), tempfile.TemporaryDirectory() as tmp:
+        leaderboard = LeaderboardManager(os.path.join(tmp, "test.db"))
+        bot = session_server.Session("0-1", ReferenceBot(), "Bot", leaderboard, auto_restart=True)
+        idle = session_server.Session("0-2", session_server.RemoteInput(), "Idle",
+                                      leaderboard, auto_restart=False)
+        for _ in range(300):
+            bot.step()
+        idle.step()
+        assert bot.root.now_ms == 5000   # 300 ticks at 60 Hz are 5 seconds of game time
+        assert idle.root.now_ms == 17
+        assert bot.status()["score"] > 0 and idle.status()["score"] == 0
+
+        # Sessions are independent: a seeded game plays the same whether it
+        # runs alone or interleaved with others
+        def play(sessions):
+            for _ in range(600):
+                for session in sessions:
+                    session.step()
+            return [(s.game.score, s.game.player_x, len(s.game.enemies), s.game.shields)
+                    for s in sessions]
+
+        alone = session_server.Session("0-3", ReferenceBot(), "Bot", leaderboard, False, seed=5)
+        expected = play([alone])[0]
+        busy = [session_server.Session(f"0-{n}", ReferenceBot(), "Bot", leaderboard, False, seed=seed)
+                for n, seed in ((4, 9), (5, 5), (6, 11))]
+        assert play(busy)[1] == expected
+        for session in [alone] + busy:
+            session.close()
+
+        # A looping session starts a new game a while after game over
+        bot.game.game_over()
+        for _ in range(session_server.RESTART_AFTER_FRAMES + 1):
+            bot.step()
+        assert bot.game.game_running and bot.games == 2
+        bot.close()
+        idle.close()
+        leaderboard.close()
+
+    print("Session tests completed.")
+
+def test_manager_and_server():
+    """Test sessions on a worker process, driven over the TCP protocol."""
+    print("Testing session manager and server...")
+
+    async def request(reader, writer, **message):
+        writer.write(json.dumps(message).encode("utf-8") + b"\n")
+        return json.loads(await reader.readline())
+
+    async def scenario():
+        manager = session_server.SessionManager(workers=1)
+        await manager.start()
+        server = session_server.SessionServer(manager, port=0)
+        await server.start()
+        try:
+            bot = await manager.create_session(controller="bot")
+            reader, writer = await asyncio.open_connection(server.host, server.port)
+            reply = await request(reader, writer, id=1, op="create", controller="remote", name="Ann")
+            assert reply["id"] == 1 and reply["ok"]
+            remote = reply["result"]
+            reply = await request(reader, writer, id=2, op="input", session=remote, left=True)
+            assert reply["ok"]
+
+            await manager.metrics(reset=True)
+            await asyncio.sleep(1.0)
+            summary = await manager.metrics()
+            assert summary["sessions"] == 2 and summary["frames"] > 0
+            print(f"Ticked {summary['tick_hz_per_session']} Hz per session, "
+                  f"{summary['cpu_ms_per_tick']} ms CPU per tick")
+
+            reply = await request(reader, writer, id=3, op="state", session=remote)
+            assert reply["result"]["player"] == "Ann" and reply["result"]["frames"] > 0
+            assert (await manager.call_session(bot, "state"))["running"]
+
+            # Errors come back as replies, not dropped connections
+            for bad in ({"op": "input", "session": bot, "fire": True},
+                        {"op": "state", "session": "0-99"},
+                        {"op": "teleport"}):
+                reply = await request(reader, writer, id=4, **bad)
+                assert reply["id"] == 4 and not reply["ok"] and reply["error"], bad
+
+            reply = await request(reader, writer, id=5, op="close", session=remote)
+            assert reply["ok"]
+            assert [status["session"] for status in await manager.list_sessions()] == [bot]
+            writer.close()
+        finally:
+            await server.stop()
+            await manager.stop()
+        assert not any(process.is_alive() for process in manager.processes)
+
+    asyncio.run(scenario())
+    print("Session manager tests completed.")
+
+if __name__ == "__main__":
+    test_sessions_share_a_process()
+    test_manager_and_server()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# Test script for game snapshots and checkpoints
+
+import os
+import random
+import tempfile
+import headless
+import snapshot
+import ui
+from bot import ReferenceBot
+from leaderboard import LeaderboardManager
+
+def make_game(root, tmp, seed):
+    random.seed(seed)
+    game = ui.GameScreen(root, "Tester")
+    game.leaderboard = LeaderboardManager(os.path.join(tmp, "test.db"))
+    game.set_controller(ReferenceBot())
+    return game
+
+def signature(game):
+    """What two games in the same state agree on."""
+    return (game.score, game.level, game.shields, game.player_x, len(game.enemies),
+            len(game.barrier_blocks), game.formation.offset_x, game.formation.offset_y,
+            [game.canvas.coords(bullet.id) for bullet in game.bullets],
+            [game.canvas.coords(bullet.id) for bullet in game.enemy_bullets])
+
+def test_encode_decode():
+    """Test that a state survives encoding and that damage is detected."""
+    print("Testing snapshot encoding...")
+
+    root = headless.HeadlessRoot()
+    with headless.headless_tk(root), tempfile.TemporaryDirectory() as tmp:
+        game = make_game(root, tmp, 7)
+        root.advance(16 * 600)
+        state = game.capture_state()
+        data = snapshot.encode(state)
+        print(f"{state}: {len(data)} bytes")
+        copy = snapshot.decode(data)
+        for field in snapshot.GameState.__slots__:
+            assert getattr(copy, field) == getattr(state, field), field
+
+        damaged = bytearray(data)
+        damaged[40] ^= 1
+        for bad in (bytes(damaged), data[:-10], b"nonsense"):
+            try:
+                snapshot.decode(bad)
+                assert False, "damaged data should be rejected"
+            except ValueError:
+                pass
+        game.leaderboard.close()
+
+    print("Snapshot encoding tests completed.")
+
+def test_restore_continues_game():
+    """Test that a restored game plays on exactly as the original did."""
+    print("Testing snapshot restore...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        original = headless.HeadlessRoot()
+        with headless.headless_tk(original):
+            game = make_game(original, tmp, 1)
+            original.advance(16 * 900)
+            data = snapshot.encode(game.capture_state())
+            original.advance(16 * 400)
+            expected = signature(game)
+            game.leaderboard.close()
+
+        # Another game at another time: restoring replaces its state entirely
+        resumed = headless.HeadlessRoot()
+        resumed.advance(123456)
+        with headless.headless_tk(resumed):
+            game = make_game(resumed, tmp, 2)
+            resumed.advance(16 * 50)
+            before = random.getstate()
+            game.restore_state(snapshot.decode(data))
+            assert random.getstate() == before   # Only the game's own generator is restored
+
+            # Other users of the random module don't change how the game plays
+            for _ in range(400):
+                random.random()
+                resumed.advance(16)
+            assert signature(game) == expected
+            game.leaderboard.close()
+
+    print("Snapshot restore tests completed.")
+
+def test_checkpoints():
+    """Test periodic checkpoints, resuming between levels, and discarding at game over."""
+    print("Testing checkpoints...")
+
+    root = headless.HeadlessRoot()
+    with headless.headless_tk(root), tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "checkpoint.bin")
+        game = make_game(root, tmp, 3)
+        game.checkpointer = snapshot.Checkpointer(path, interval_ms=1000)
+        root.advance(16 * 200)
+        assert game.checkpointer.flush()
+        assert 3 <= game.checkpointer.written <= 4
+        print(f"Checkpoint capture times (ms): max {max(game.checkpointer.capture_ms):.3f}")
+
+        # Clear the wave and checkpoint while the next one is on its way
+        while game.enemies:
+            bullet = ui.Bullet(game.create_player_bullet_item(0, 0), 0, -10)
+            game.bullets.append(bullet)
+            game.handle_enemy_hit(game.enemies[0], bullet)
+        game.checkpointer.save(game)
+        assert game.checkpointer.flush()
+        state = snapshot.read_checkpoint(path)
+        assert state.flags & snapshot.GameState.BETWEEN_LEVELS and state.level == 2
+
+        game.restore_state(state)
+        root.advance(1500)
+        assert game.level == 2 and game.formation.rows == game.enemy_rows and game.enemies
+
+        game.game_over()
+        assert game.checkpointer.flush()
+        assert not os.path.exists(path) and snapshot.read_checkpoint(path) is None
+        game.checkpointer.close()
+        game.leaderboard.close()
+
+    print("Checkpoint tests completed.")
+
+if __name__ == "__main__":
+    test_encode_decode()
+    test_restore_continues_game()
+    test_checkpoints()
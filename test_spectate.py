@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# Test script for the spectator delta stream
+
+import asyncio
+import os
+import random
+import struct
+import tempfile
+import headless
+import session_server
+import spectate
+import ui
+from bot import ReferenceBot
+from leaderboard import LeaderboardManager
+
+def test_delta_round_trip():
+    """Test that keyframes and deltas rebuild every tick exactly, and stay small."""
+    print("Testing spectator encoding...")
+
+    random.seed(11)
+    root = headless.HeadlessRoot()
+    with headless.headless_tk(root), tempfile.TemporaryDirectory() as tmp:
+        game = ui.GameScreen(root, "Tester")
+        game.leaderboard = LeaderboardManager(os.path.join(tmp, "test.db"))
+        game.set_controller(ReferenceBot())
+        capture = spectate.FrameCapture()
+        encoder = spectate.DeltaEncoder(keyframe_every=60)
+        decoder = spectate.DeltaDecoder()
+        deltas = []
+        for tick in range(900):
+            root.advance(16)
+            frame = capture.capture(game)
+            data = encoder.encode(frame)
+            assert decoder.decode(data) == frame, tick
+            if data[0] == spectate.DELTA:
+                deltas.append(len(data))
+        assert game.score > 0 and game.barrier_blocks
+        assert encoder.keyframes == 15
+        print(f"Deltas: {sum(deltas) / len(deltas):.1f} bytes mean, {max(deltas)} max")
+        assert sum(deltas) / len(deltas) < 40
+
+        # A new level changes the layout, which forces a keyframe
+        game.level_complete()
+        root.advance(3600)
+        assert encoder.encode(capture.capture(game))[0] == spectate.KEYFRAME
+
+        # A delta that doesn't follow the last tick is refused
+        encoder.encode(capture.capture(game))
+        late = encoder.encode(capture.capture(game))
+        try:
+            decoder.decode(late)
+            assert False, "a delta after a gap should be rejected"
+        except ValueError:
+            pass
+        decoder = spectate.DeltaDecoder()
+        try:
+            decoder.decode(late)
+            assert False, "a delta before any keyframe should be rejected"
+        except ValueError:
+            pass
+        game.leaderboard.close()
+
+    print("Spectator encoding tests completed.")
+
+def test_viewer_render():
+    """Test that the viewer draws a decoded frame."""
+    print("Testing spectator viewer...")
+
+    root = headless.HeadlessRoot()
+    with headless.headless_tk(root), tempfile.TemporaryDirectory() as tmp:
+        game = ui.GameScreen(root, "Tester")
+        game.leaderboard = LeaderboardManager(os.path.join(tmp, "test.db"))
+        root.advance(16 * 10)
+        frame = spectate.FrameCapture().capture(game)
+
+        view = spectate.SpectatorView(headless.HeadlessWidget())
+        view.render(frame)
+        canvas = view.canvas
+        visible = [item for item in view.enemy_items if canvas.itemcget(item, "state") != "hidden"]
+        assert len(visible) == len(game.enemies)
+        assert len(view.block_items) == len(frame.barrier_health)
+        assert f"SCORE: {game.score}" in canvas.itemcget(view.hud, "text")
+        assert canvas.coords(view.ship)[0] == frame.player_x
+        game.leaderboard.close()
+
+    print("Spectator viewer tests completed.")
+
+def test_stream_to_viewers():
+    """Test a session streamed through a worker to two viewers, one joining late."""
+    print("Testing spectator stream...")
+
+    async def read_message(reader):
+        (length,) = struct.unpack("<H", await reader.readexactly(2))
+        return await reader.readexactly(length)
+
+    async def watch(where, messages):
+        reader, writer = await asyncio.open_connection(where["host"], where["port"])
+        writer.write(where["stream"].encode("utf-8") + b"\n")
+        decoder = spectate.DeltaDecoder()
+        first = await read_message(reader)
+        assert first[0] == spectate.KEYFRAME   # Every viewer starts from a keyframe
+        frames = [decoder.decode(first)]
+        for _ in range(messages - 1):
+            frames.append(decoder.decode(await read_message(reader)))
+        writer.close()
+        return frames
+
+    async def scenario():
+        manager = session_server.SessionManager(workers=1)
+        await manager.start()
+        try:
+            session = await manager.create_session(controller="bot")
+            where = await manager.call_session(session, "spectate")
+            assert where["stream"] == session
+            early = asyncio.ensure_future(watch(where, 60))
+            await asyncio.sleep(0.3)
+            late = await watch(where, 20)
+            early = await early
+            assert early[-1].score >= early[0].score
+            assert late[0].layout == early[0].layout
+
+            # Unknown streams are refused
+            reader, writer = await asyncio.open_connection(where["host"], where["port"])
+            writer.write(b"9-9\n")
+            assert await reader.read() == b""
+            writer.close()
+        finally:
+            await manager.stop()
+
+    asyncio.run(scenario())
+    print("Spectator stream tests completed.")
+
+if __name__ == "__main__":
+    test_delta_round_trip()
+    test_viewer_render()
+    test_stream_to_viewers()
@@ -3,23 +3,79 @@
 # Handles UI, canvas, and game loop
 
 import tkinter as tk
+import os
 import random
 import time
+from array import array
 from functools import partial
 import math
-from leaderboard import LeaderboardManager
+from utils import BackgroundTask
+from batchcanvas import BatchingCanvas
+from entities import Enemy, Bullet, BarrierBlock, EntityList
+from formation import Formation
+from particles import ParticleEngine
+from quality import QualityGovernor
+from levels import get_level_config
+from snapshot import Checkpointer, GameState
+from gamelog import get_logger
+
+# Loggers are silent below WARNING unless enabled with $GALACTIC_LOG
+log = get_logger("game")
+collision_log = get_logger("collision")
+
+# Size of the game world. All positions are in world units; the canvas
+# scales the world to whatever size the window is (see BatchingCanvas.fit)
+WORLD_WIDTH = 800
+WORLD_HEIGHT = 600
+
+# Delay the game loop waits between frames (approx. 60 FPS)
+FRAME_DELAY_MS = 16
+
+# Barrier block (fill, outline) colors by hits left
+BARRIER_COLORS = {
+    3: ("#44DD44", "#339933"),  # Intact
+    2: ("#339933", "#228822"),  # Slightly damaged
+    1: ("#228822", "#117711"),  # Heavily damaged
+}
+
+def open_leaderboard():
+    """
+    Open the leaderboard the game should use.
+    
+    The leaderboard modules (sqlite3, http.client, ...) are imported here
+    rather than at the top of this file so they don't slow down startup.
+    """
+    from leaderboard_service import connect_leaderboard
+    return connect_leaderboard()
+
+def open_audio():
+    """
+    Return the shared sound mixer, synthesizing the samples on first use.
+    
+    Imported lazily for the same reason as open_leaderboard().
+    """
+    from audio import get_mixer
+    return get_mixer()
 
 class SplashScreen:
     def __init__(self, master):
         """Initialize the splash screen with ASCII art and rainbow effect."""
         self.master = master
         
+        self.width = WORLD_WIDTH
+        self.height = WORLD_HEIGHT
+        
         # Remove any existing canvas
         for widget in master.winfo_children():
             widget.destroy()
             
-        self.canvas = tk.Canvas(master, width=800, height=600, bg='black')
+        # Item updates are batched into one Tcl script per frame, and the
+        # world is scaled to the window size
+        self.canvas = BatchingCanvas(
+            tk.Canvas(master, width=self.width, height=self.height, bg='black', highlightthickness=0),
+            world_size=(self.width, self.height))
         self.canvas.pack(fill="both", expand=True)
+        self.canvas.bind("<Configure>", lambda event: self.canvas.fit(event.width, event.height))
         
         # Create starfield background
         self.create_starfield()
@@ -40,7 +96,7 @@ class SplashScreen:
         
         # Add "Made by Ilan Uzan" text
         self.canvas.create_text(
-            400, 350, 
+            self.width // 2, 350, 
             text="Made by Ilan Uzan", 
             fill="white", 
             font=("Courier", 16)
@@ -48,7 +104,7 @@ class SplashScreen:
         
         # Add "Press SPACE to start" text
         self.space_text = self.canvas.create_text(
-            400, 450, 
+            self.width // 2, 450, 
             text="Press SPACE to start", 
             fill="white", 
             font=("Courier", 20, "bold")
@@ -61,12 +117,21 @@ class SplashScreen:
         self.blink_space_prompt()
         self.cycle_colors()
         
+        # Open the leaderboard in the background once the first frame is
+        # drawn, so it is ready by the time the player needs it
+        self.leaderboard_task = BackgroundTask(open_leaderboard, name="leaderboard-init")
+        self.master.after_idle(self.leaderboard_task.start)
+        
+        # Likewise prepare the sound samples and start the mixer thread
+        self.audio_task = BackgroundTask(open_audio, name="audio-init")
+        self.master.after_idle(self.audio_task.start)
+        
     def create_starfield(self):
         """Create a starfield background with stars of different sizes."""
         self.stars = []
         for _ in range(100):
-            x = random.randint(0, 800)
-            y = random.randint(0, 600)
+            x = random.randint(0, self.width)
+            y = random.randint(0, self.height)
             size = random.choice([1, 1, 1, 2, 2, 3])
             color = random.choice(['white', '#CCCCCC', '#999999', '#6666FF', '#9999FF'])
             star = self.canvas.create_oval(x, y, x+size, y+size, fill=color, outline="")
@@ -74,8 +139,8 @@ class SplashScreen:
         
         # Create a few larger "distant galaxies"
         for _ in range(5):
-            x = random.randint(50, 750)
-            y = random.randint(50, 550)
+            x = random.randint(50, self.width - 50)
+            y = random.randint(50, self.height - 50)
             size = random.randint(3, 6)
             color = random.choice(['#6666FF', '#9966FF', '#CC66FF'])
             self.canvas.create_oval(x, y, x+size, y+size, fill=color, outline="")
@@ -85,7 +150,7 @@ class SplashScreen:
         y_pos = 120
         for line in self.ascii_title:
             text = self.canvas.create_text(
-                400, y_pos, 
+                self.width // 2, y_pos, 
                 text=line, 
                 fill="white", 
                 font=("Courier", 12)
@@ -140,7 +205,7 @@ class SplashScreen:
         
         # Add prompt text
         self.canvas.create_text(
-            400, 200, 
+            self.width // 2, 200, 
             text="Enter your name:", 
             fill="white", 
             font=("Courier", 24, "bold")
@@ -161,7 +226,7 @@ class SplashScreen:
         
         # Place entry field on canvas
         self.name_entry_window = self.canvas.create_window(
-            400, 250,
+            self.width // 2, 250,
             window=name_entry
         )
         
@@ -181,7 +246,7 @@ class SplashScreen:
         
         # Place button on canvas
         self.canvas.create_window(
-            400, 320,
+            self.width // 2, 320,
             window=submit_button
         )
         
@@ -199,7 +264,7 @@ class SplashScreen:
         if not player_name.isalnum() or len(player_name) < 3 or len(player_name) > 15:
             # Show error message
             self.canvas.create_text(
-                400, 380,
+                self.width // 2, 380,
                 text="Name must be 3-15 alphanumeric characters",
                 fill="red",
                 font=("Courier", 14)
@@ -223,19 +288,41 @@ class SplashScreen:
             widget.destroy()
             
         # Create the game screen
-        game_screen = GameScreen(self.master, player_name)
+        game_screen = GameScreen(self.master, player_name, leaderboard_task=self.leaderboard_task,
+                                 audio_task=self.audio_task)
 
 
 class GameScreen:
-    def __init__(self, master, player_name):
-        """Initialize the main game screen."""
+    def __init__(self, master, player_name, leaderboard_task=None, audio_task=None, seed=None):
+        """
+        Initialize the main game screen.
+        
+        Args:
+            seed (int): Seed for this game's random numbers (default: drawn
+                from the random module, so random.seed() still reproduces a game)
+        """
         self.master = master
         self.player_name = player_name
-        self.width = 800
-        self.height = 600
+        self.width = WORLD_WIDTH
+        self.height = WORLD_HEIGHT
+        
+        # Game time: the wall clock, or a headless root's virtual clock (each
+        # root has its own, so games sharing a process keep their own time)
+        self.clock = getattr(master, "clock", time)
+        
+        # Enemy fire, bullet spread, particles and stars draw from this game's
+        # own generator, so games sharing a process don't disturb each other
+        # and a snapshot can carry it
+        self.rng = random.Random(seed if seed is not None else random.getrandbits(64))
         
-        # Initialize leaderboard manager
-        self.leaderboard = LeaderboardManager()
+        # The leaderboard (local database, or the shared service when
+        # GALACTIC_LEADERBOARD_URL is set) is only needed at game over, so it
+        # is opened lazily - usually by the splash screen's background task
+        self._leaderboard = None
+        self._leaderboard_task = leaderboard_task
+        
+        # Sounds are mixed on the mixer's own thread; play_sound() only queues them
+        self.sound = audio_task.result() if audio_task is not None else open_audio()
         
         # Clear existing widgets and bindings
         for widget in master.winfo_children():
@@ -252,45 +339,75 @@ class GameScreen:
         self.level = 1
         self.shields = 3
         
+        # Live "You are now #N": a copy of the leaderboard's rank index,
+        # fetched in the background and re-fetched at every new level
+        self.rank_index = None
+        self.rank_task = None
+        self.rank_index_wanted = True
+        self.ranked_score = None  # Score the rank text was last worked out for
+        self.live_rank = None
+        
+        # Game over screen: leaderboard reads run in the background
+        self.results_task = None
+        self.last_top_scores = []  # Shown if the leaderboard is unreachable
+        
         # Player related variables
         self.player_ship = None
-        self.player_x = 400  # Start in middle of screen
-        self.player_y = 550  # Near bottom of screen
+        self.player_x = self.width // 2  # Start in middle of screen
+        self.player_y = self.height - 50  # Near bottom of screen
         self.player_speed = 8  # Increased player speed for better control
         self.move_left = False
         self.move_right = False
+        self.controller = None  # Optional programmatic input, see set_controller()
+        self.input_left = False   # The controller's flags, kept apart from the keys
+        self.input_right = False
+        
+        # Periodic checkpoints for resuming after a reboot ($GALACTIC_CHECKPOINT)
+        checkpoint_path = os.environ.get("GALACTIC_CHECKPOINT")
+        self.checkpointer = Checkpointer(checkpoint_path) if checkpoint_path else None
         
         # Bullet related variables
-        self.bullets = []
+        self.bullets = EntityList()
         self.last_shot_time = 0
         self.shot_cooldown = 250  # Faster shooting for player
         self.player_bullet_speed = 10  # Faster bullets
         
         # Enemy related variables
-        self.enemies = []
-        self.enemy_rows = 5
+        self.enemies = EntityList()
+        self.formation = Formation()  # Grid positions, alive mask and bounds
+        self.enemy_pool = {}  # (row, col) -> Enemy whose canvas items each wave reuses
         self.enemy_cols = 10
         self.enemy_spacing_x = 60
         self.enemy_spacing_y = 50
-        self.enemy_speed = 3  # Initial enemy speed (faster)
         self.enemy_direction = 1  # 1 for right, -1 for left
         self.enemy_move_timer = 0
-        self.enemy_move_delay = 25  # Lower delay = faster movement
-        self.enemy_descent_distance = 25  # Larger descent distance
         
         # Enemy bullets
-        self.enemy_bullets = []
-        self.enemy_bullet_speed = 6  # Faster enemy bullets
-        self.enemy_shot_cooldown = 1000  # Shorter cooldown - shoot more often
+        self.enemy_bullets = EntityList()
         self.enemy_last_shot_time = 0
-        self.max_enemy_bullets_onscreen = 8  # More enemy bullets at once
         
-        # Particles list for special effects
-        self.particles = []
+        # Per-level difficulty (enemy speed, rows, fire rate, bullet speed)
+        # comes from the level table in levels.json
+        self.levels = get_level_config()
+        self.apply_level_settings(self.levels.settings(self.level))
         
         # Create new canvas
-        self.canvas = tk.Canvas(master, width=800, height=600, bg='black')
+        # Item updates are batched into one Tcl script per frame. The game
+        # works in world units and the canvas scales them to the window
+        # size, so nothing here depends on the display resolution.
+        self.canvas = BatchingCanvas(
+            tk.Canvas(master, width=self.width, height=self.height, bg='black', highlightthickness=0),
+            world_size=(self.width, self.height))
         self.canvas.pack(fill="both", expand=True)
+        self.canvas.bind("<Configure>", self.on_resize)
+        
+        # Particle engine for special effects (ticked from the game loop)
+        self.particles = ParticleEngine(self.canvas, budget=200, rng=self.rng)
+        
+        # Quality governor - sheds effects when frames take too long
+        self.quality = QualityGovernor(frame_budget_ms=16, on_change=self.apply_quality_settings)
+        self._last_frame_start = None  # perf_counter() at the previous running frame
+        self.outline_anim_counter = 0
         
         # Create the starfield background
         self.create_galaxy_background()
@@ -319,10 +436,24 @@ class GameScreen:
         # Start the game loop
         self.update_game()
         
-        # Debug info - print to console to confirm object creation
-        print(f"Player ship created at x={self.player_x}")
-        print(f"Game running state: {self.game_running}")
-        print(f"Spawned {len(self.enemies)} enemies")
+        # Debug info to confirm object creation
+        log.debug("Player ship created at x=%s", self.player_x)
+        log.debug("Game running state: %s", self.game_running)
+        log.debug("Spawned %d enemies", len(self.enemies))
+        
+    @property
+    def leaderboard(self):
+        """The leaderboard, opened on first use."""
+        if self._leaderboard is None:
+            if self._leaderboard_task is not None:
+                self._leaderboard = self._leaderboard_task.result()
+            else:
+                self._leaderboard = open_leaderboard()
+        return self._leaderboard
+    
+    @leaderboard.setter
+    def leaderboard(self, value):
+        self._leaderboard = value
         
     def create_galaxy_background(self):
         """Create a galaxy-style starfield background."""
@@ -332,10 +463,10 @@ class GameScreen:
         # Create stars of different sizes
         self.stars = []
         for _ in range(200):  # More stars for a richer background
-            x = random.randint(0, 800)
-            y = random.randint(0, 600)
-            size = random.choice([1, 1, 1, 2, 2, 3])
-            color = random.choice(['white', '#CCCCCC', '#999999', '#6666FF', '#9999FF', '#DDDDFF'])
+            x = self.rng.randint(0, self.width)
+            y = self.rng.randint(0, self.height)
+            size = self.rng.choice([1, 1, 1, 2, 2, 3])
+            color = self.rng.choice(['white', '#CCCCCC', '#999999', '#6666FF', '#9999FF', '#DDDDFF'])
             star = self.canvas.create_oval(x, y, x+size, y+size, fill=color, outline="")
             self.stars.append(star)
         
@@ -347,16 +478,18 @@ class GameScreen:
             text=f"Score: {self.score}",
             fill="#FFFFFF",
             font=("Courier", 14),
-            anchor="nw"  # Northwest anchor to align at top-left
+            anchor="nw",  # Northwest anchor to align at top-left
+            tags="hud"
         )
         
         # Create level display
         self.level_text = self.canvas.create_text(
-            400, 10,  # Position: top-center
+            self.width // 2, 10,  # Position: top-center
             text=f"Level: {self.level}",
             fill="#FFFFFF",
             font=("Courier", 14),
-            anchor="n"  # North anchor to align at top-center
+            anchor="n",  # North anchor to align at top-center
+            tags="hud"
         )
         
         # Create shields display
@@ -365,18 +498,31 @@ class GameScreen:
             text=f"Shields: {self.shields}",
             fill="#FFFFFF",
             font=("Courier", 14),
-            anchor="ne"  # Northeast anchor to align at top-right
+            anchor="ne",  # Northeast anchor to align at top-right
+            tags="hud"
+        )
+        
+        # Create live rank display (empty until the first points are scored)
+        self.rank_text = self.canvas.create_text(
+            10, 32,  # Position: below the score
+            text="",
+            fill="#00FFAA",
+            font=("Courier", 12),
+            anchor="nw",
+            tags="hud"
         )
+        self.ranked_score = None
+        self.live_rank = None
         
     def create_pause_play_buttons(self):
         """Create pause and play buttons."""
-        # Create pause button frame
-        pause_frame = tk.Frame(self.master, bg='black', bd=0, highlightthickness=0)
-        pause_frame.place(x=750, y=45)
+        # Create pause button frame (created once and kept across restarts)
+        self.pause_frame = tk.Frame(self.master, bg='black', bd=0, highlightthickness=0)
+        self.place_pause_frame()
         
         # Create pause button
         self.pause_button = tk.Button(
-            pause_frame,
+            self.pause_frame,
             text="⏸️",  # Unicode pause symbol
             command=self.toggle_pause,
             font=("Arial", 12),
@@ -393,7 +539,7 @@ class GameScreen:
         
         # Create play button (initially hidden)
         self.play_button = tk.Button(
-            pause_frame,
+            self.pause_frame,
             text="▶️",  # Unicode play symbol
             command=self.toggle_pause,
             font=("Arial", 12),
@@ -413,7 +559,7 @@ class GameScreen:
         self.master.bind('P', lambda event: self.toggle_pause())
         
         # Ensure the buttons are visible by bringing the frame to the front
-        pause_frame.lift()
+        self.pause_frame.lift()
         
     def toggle_pause(self):
         """Toggle the pause state of the game."""
@@ -425,7 +571,7 @@ class GameScreen:
         if self.is_paused:
             # Display "PAUSED" text
             self.pause_text = self.canvas.create_text(
-                400, 300,
+                self.width // 2, 300,
                 text="PAUSED",
                 fill="#FF0000",
                 font=("Courier", 36, "bold")
@@ -440,20 +586,37 @@ class GameScreen:
             self.play_button.pack_forget()
             self.pause_button.pack()
             
-    def create_player_ship(self):
-        """Create the player's spaceship."""
+    def place_pause_frame(self):
+        """Put the pause button at the top right of the (scaled) playfield."""
+        x, y = self.canvas.to_screen(self.width - 50, 45)
+        self.pause_frame.place(x=round(x), y=round(y))
+    
+    def on_resize(self, event):
+        """Scale the playfield to the new canvas size."""
+        self.canvas.fit(event.width, event.height)
+        if getattr(self, "pause_frame", None) is not None:
+            self.place_pause_frame()
+    
+    def player_ship_coords(self):
+        """Return the polygon points of the player's spaceship at player_x."""
         # Ship coordinates - centered at bottom of screen
-        ship_y = 550  # Position from top (near bottom of screen)
+        ship_y = self.player_y  # Position from top (near bottom of screen)
         
-        # Create a sleek, modern spaceship using polygon
-        # The design is inspired by classic arcade shooters but with a more refined look
-        self.player_ship = self.canvas.create_polygon(
+        # A sleek, modern spaceship - the design is inspired by classic
+        # arcade shooters but with a more refined look
+        return [
             self.player_x, ship_y - 30,  # Top point
             self.player_x - 25, ship_y,  # Bottom left
             self.player_x - 15, ship_y - 10,  # Inner left
             self.player_x, ship_y - 15,  # Inner bottom
             self.player_x + 15, ship_y - 10,  # Inner right
             self.player_x + 25, ship_y,  # Bottom right
+        ]
+    
+    def create_player_ship(self):
+        """Create the player's spaceship."""
+        self.player_ship = self.canvas.create_polygon(
+            *self.player_ship_coords(),
             fill="#00FFAA",  # Cyan-green
             outline="#FFFFFF",  # White outline
             width=1
@@ -461,9 +624,9 @@ class GameScreen:
         
         # Check if object was created successfully
         if not self.player_ship:
-            print("WARNING: Failed to create player ship object!")
+            log.warning("Failed to create player ship object!")
         else:
-            print("Player ship object created successfully")
+            log.debug("Player ship object created successfully")
     
     def setup_controls(self):
         """Set up keyboard controls for the player ship."""
@@ -483,8 +646,37 @@ class GameScreen:
         self.master.bind("<KeyRelease-d>", lambda event: self.set_key_state("right", False))
         self.master.bind("<KeyRelease-D>", lambda event: self.set_key_state("right", False))
         
-        # Bind space key for shooting
-        self.master.bind("<space>", self.shoot)
+        # Bind space key for shooting (and for restarting after game over)
+        self.master.bind("<space>", self.handle_space)
+    
+    def handle_space(self, event=None):
+        """Shoot while playing, or start a new game from the game over screen."""
+        if self.game_running:
+            self.shoot(event)
+        else:
+            self.restart_game_safe(event)
+    
+    def set_controller(self, controller):
+        """
+        Drive the player from code, e.g. with a bot.ReferenceBot.
+        
+        Every frame the game loop calls controller.tick(game), which returns
+        an object with left, right and fire flags (or None to leave the
+        controls as they are). The keyboard keeps working alongside it: the
+        ship moves if either the keys or the controller say so.
+        
+        Args:
+            controller: Object with a tick(game) method, or None to detach
+        """
+        self.controller = controller
+        self.input_left = self.input_right = False
+    
+    def apply_input(self, left=False, right=False, fire=False):
+        """Set the controller's controls for this frame (combined with the keys)."""
+        self.input_left = left
+        self.input_right = right
+        if fire:
+            self.shoot()
     
     def set_key_state(self, key, is_pressed):
         """Update the state of a key (pressed or released)."""
@@ -499,69 +691,32 @@ class GameScreen:
         if self.is_paused:
             return
             
-        # Calculate movement based on key states
+        # Calculate movement based on key states and the controller's input
         dx = 0
-        if self.move_left:
+        if self.move_left or self.input_left:
             dx -= self.player_speed
-        if self.move_right:
+        if self.move_right or self.input_right:
             dx += self.player_speed
             
         # Apply movement with screen boundary check
         new_x = self.player_x + dx
         
         # Screen boundaries with padding (half the ship width)
-        if new_x - 25 > 0 and new_x + 25 < 800:
+        if new_x - 25 > 0 and new_x + 25 < self.width:
             self.player_x = new_x
             
             # Update ship position
-            ship_coords = self.canvas.coords(self.player_ship)
-            
-            # Translate all coordinates by dx
-            for i in range(0, len(ship_coords), 2):
-                ship_coords[i] += dx
-                
-            # Update ship polygon
-            self.canvas.coords(self.player_ship, *ship_coords)
-    
-    def update_game(self):
-        """Update the game state and schedule the next update."""
-        try:
-            if self.game_running and not self.is_paused:
-                # Clean up any stray dots or lines that might be showing
-                self.clean_unwanted_items()
-                
-                # Update player position based on controls
-                self.update_player_position()
-                
-                # Update bullet positions
-                self.update_bullets()
-                
-                # Update enemy positions
-                self.update_enemies()
-                
-                # Check for collisions
-                self.check_collisions()
-                
-                # Handle enemy shooting
-                self.enemy_shoot()
-                
-                # Update enemy bullets
-                self.update_enemy_bullets()
-                
-                # Update special effects
-                self._update_special_effects()
-        except Exception as e:
-            print(f"Error in game loop: {e}")
-            
-        # Schedule the next update (approx. 60 FPS)
-        if hasattr(self, 'master') and self.master:
-            self.master.after(16, self.update_game)
+            self.canvas.move(self.player_ship, dx, 0)
     
     def clean_unwanted_items(self):
         """Remove any stray dots or lines that might be visible."""
         # Find all items in the canvas
         all_items = self.canvas.find_all()
         
+        # Ids of tracked game objects, gathered once instead of per item
+        tracked_ids = {bullet.id for bullet in self.enemy_bullets}
+        tracked_ids.update(bullet.id for bullet in self.bullets)
+        
         for item_id in all_items:
             # Check item type
             item_type = self.canvas.type(item_id)
@@ -577,29 +732,16 @@ class GameScreen:
             if self.player_ship and item_id == self.player_ship:
                 continue
                 
-            if 'barrier' in item_tags:
-                continue
-                
-            # Check enemy bullets more safely
-            enemy_bullet_ids = [b.get('id', -1) for b in self.enemy_bullets]
-            if 'enemy_bullet' in item_tags or item_id in enemy_bullet_ids:
+            if 'barrier' in item_tags or 'particle' in item_tags or 'enemy' in item_tags:
                 continue
                 
-            if item_id in self.bullets:
+            # Skip bullets
+            if 'enemy_bullet' in item_tags or item_id in tracked_ids:
                 continue
                 
             if item_id in self.stars:
                 continue
                 
-            # Check for enemies more safely
-            skip = False
-            for enemy in self.enemies:
-                if enemy.get('id', -1) == item_id:
-                    skip = True
-                    break
-            if skip:
-                continue
-                
             # Check for HUD elements
             if hasattr(self, 'score_text') and item_id in [self.score_text, self.level_text, self.shields_text]:
                 continue
@@ -636,13 +778,30 @@ class GameScreen:
             self.game_over()
     
     def update_level(self, value=1):
-        """Update the game level."""
+        """
+        Change the game level and apply its difficulty settings.
+        
+        The new settings take effect straight away; the formation size
+        (enemy_rows) changes with the next wave.
+        """
         self.level += value
         self.update_hud()
-        
-        # Increase difficulty with level
-        self.alien_speed = min(10, 1 + self.level * 0.5)
-        self.alien_spawn_rate = max(1000, 5000 - self.level * 400)
+        self.apply_level_settings(self.levels.settings(self.level))
+    
+    def apply_level_settings(self, settings):
+        """
+        Set the difficulty parameters for a level.
+        
+        Args:
+            settings (LevelSettings): A row of the level table
+        """
+        self.enemy_speed = settings.enemy_speed
+        self.enemy_move_delay = settings.enemy_move_delay  # Lower delay = faster movement
+        self.enemy_descent_distance = settings.enemy_descent_distance
+        self.max_enemy_bullets_onscreen = settings.max_enemy_bullets_onscreen
+        self.enemy_shot_cooldown = settings.enemy_shot_cooldown
+        self.enemy_rows = settings.enemy_rows
+        self.enemy_bullet_speed = settings.enemy_bullet_speed
     
     def shoot(self, event=None):
         """Create a bullet at the player's position."""
@@ -651,7 +810,7 @@ class GameScreen:
             return
             
         # Check if enough time has passed since the last shot (cooldown)
-        current_time = time.time() * 1000  # Convert to milliseconds
+        current_time = self.clock.time() * 1000  # Convert to milliseconds
         if current_time - self.last_shot_time < self.shot_cooldown:
             return  # Still on cooldown
         
@@ -673,31 +832,45 @@ class GameScreen:
         
         # Create the bullet
         try:
-            bullet = self.canvas.create_rectangle(
-                bullet_x - 2, bullet_y - 10,
-                bullet_x + 2, bullet_y,
-                fill="#FF0000",  # Red color
-                outline="#FF5555"  # Lighter red outline
-            )
+            bullet = self.create_player_bullet_item(bullet_x - 2, bullet_y - 10)
             
             # Add bullet to the tracking list
-            self.bullets.append(bullet)
+            self.bullets.append(Bullet(bullet, 0, -self.player_bullet_speed))
             
             # Play sound effect
             self.play_sound("player_shoot")
             
-            # Optional: Add a small flash at the top of the ship
-            flash = self.canvas.create_oval(
-                bullet_x - 5, bullet_y - 5,
-                bullet_x + 5, bullet_y + 5,
-                fill="#FFFF00",  # Yellow flash
-                outline=""
-            )
-            
-            # Remove the flash after a short time
-            self.master.after(50, lambda: self.canvas.delete(flash))
+            # Optional: Add a small flash at the top of the ship (skipped at
+            # lower quality tiers)
+            if self.quality.settings["muzzle_flash"]:
+                flash = self.canvas.create_oval(
+                    bullet_x - 5, bullet_y - 5,
+                    bullet_x + 5, bullet_y + 5,
+                    fill="#FFFF00",  # Yellow flash
+                    outline=""
+                )
+                
+                # Remove the flash after a short time
+                self.master.after(50, lambda: self.canvas.delete(flash))
         except Exception as e:
-            print(f"Error creating bullet: {e}")
+            log.error("Error creating bullet: %s", e)
+    
+    def create_player_bullet_item(self, x1, y1):
+        """Draw a player bullet with its top-left corner at (x1, y1)."""
+        return self.canvas.create_rectangle(
+            x1, y1, x1 + 4, y1 + 10,
+            fill="#FF0000",  # Red color
+            outline="#FF5555"  # Lighter red outline
+        )
+    
+    def create_enemy_bullet_item(self, x1, y1):
+        """Draw an enemy bullet with its top-left corner at (x1, y1)."""
+        return self.canvas.create_rectangle(
+            x1, y1, x1 + 4, y1 + 10,
+            fill="#6666FF",  # Blue color (was red)
+            outline="#99AAFF",  # Lighter blue outline (was light red)
+            tags=["enemy_bullet"]
+        )
     
     def update_bullets(self):
         """Update the position of all bullets and remove those off screen."""
@@ -707,10 +880,10 @@ class GameScreen:
         for bullet in list(self.bullets):
             try:
                 # Move bullet upward
-                self.canvas.move(bullet, 0, -self.player_bullet_speed)
+                self.canvas.move(bullet.id, bullet.dx, bullet.dy)
                 
                 # Get the current bullet position
-                bullet_coords = self.canvas.coords(bullet)
+                bullet_coords = self.canvas.coords(bullet.id)
                 
                 # Check if bullet is off screen (has moved beyond the top of the canvas)
                 if not bullet_coords or bullet_coords[3] < 0:
@@ -729,19 +902,16 @@ class GameScreen:
         # Remove bullets that are off screen or have hit barriers
         for bullet in bullets_to_remove:
             try:
-                self.canvas.delete(bullet)
-                if bullet in self.bullets:
-                    self.bullets.remove(bullet)
+                self.canvas.delete(bullet.id)
+                self.bullets.remove(bullet)
             except:
                 # Just continue if bullet was already removed
                 pass
     
     def spawn_enemies(self):
-        """Spawn the initial grid of enemies."""
-        # Clear any existing enemies
-        for enemy in self.enemies:
-            self.canvas.delete(enemy["id"])
-        self.enemies = []
+        """Spawn the grid of enemies, reusing pooled canvas items where possible."""
+        # Survivors of the previous wave go back to the pool
+        self.enemies.clear()
         
         # Get enemy types
         enemy_types = self.get_enemy_types()
@@ -749,42 +919,64 @@ class GameScreen:
         # Start enemies from the top of the screen
         starting_y = 80
         
+        # Reset the formation grid that tracks positions and bounds
+        self.formation.reset(
+            self.enemy_rows, self.enemy_cols,
+            100, starting_y,
+            self.enemy_spacing_x, self.enemy_spacing_y,
+            type_indexes=[row % len(enemy_types) for row in range(self.enemy_rows)]
+        )
+        
         for row in range(self.enemy_rows):
             enemy_type = enemy_types[row % len(enemy_types)]
             
             for col in range(self.enemy_cols):
                 # Calculate position
-                x = 100 + col * self.enemy_spacing_x
-                y = starting_y + row * self.enemy_spacing_y
+                x, y = self.formation.position(row, col)
                 
-                # Create enemy based on its shape
-                enemy_id = self.create_enemy(x, y, enemy_type)
+                # Reuse the alien last drawn for this grid cell if it has the
+                # same shape, otherwise draw a new one
+                enemy = self.enemy_pool.get((row, col))
+                if enemy is not None and enemy.type == enemy_type["shape"]:
+                    self.place_enemy(enemy, x, y, enemy_type)
+                    enemy.points = enemy_type["points"]
+                else:
+                    if enemy is not None:
+                        self.canvas.delete(enemy.id, *enemy.parts)
+                    enemy_id, parts = self.create_enemy(x, y, enemy_type)
+                    enemy = Enemy(
+                        enemy_id, row, col,
+                        enemy_type["shape"],
+                        enemy_type["points"],
+                        parts
+                    )
+                    self.enemy_pool[(row, col)] = enemy
                 
-                # Store enemy with its position data for tracking
-                self.enemies.append({
-                    "id": enemy_id,
-                    "x": x,
-                    "y": y,
-                    "row": row,
-                    "col": col,
-                    "type": enemy_type["shape"],
-                    "points": enemy_type["points"]
-                })
+                # Track the enemy with its grid cell
+                self.enemies.append(enemy)
+        
+        # Pooled aliens outside this wave's formation stay hidden
+        for enemy in self.enemy_pool.values():
+            if enemy not in self.enemies:
+                self.hide_enemy(enemy)
     
-    def create_enemy(self, x, y, enemy_type):
-        """Create a Space Invaders style alien enemy."""
+    def enemy_shape(self, x, y, enemy_type):
+        """
+        Work out the canvas items that draw an alien centred on (x, y).
+        
+        Returns:
+            tuple: (body item type, body coords, list of (item type, coords, fill)
+                for the detail items drawn on top of the body)
+        """
         size = enemy_type["size"]
         shape = enemy_type["shape"]
-        fill = enemy_type["fill"]
-        outline = enemy_type["outline"]
         
         # Base size for all aliens
         width = size * 2.5
         height = size * 2
         
         if shape == "alien1":  # Classic space invader with antennas
-            # Create classic space invader shape
-            enemy = self.canvas.create_polygon(
+            return "polygon", [
                 # Left side
                 x - width/2, y - height/4,
                 x - width/3, y - height/4,
@@ -810,13 +1002,10 @@ class GameScreen:
                 x - width/3, y + height/4,
                 x - width/3, y,
                 x - width/2, y,
-                fill=fill,
-                outline=outline,
-                width=1
-            )
+            ], []
             
-        elif shape == "alien2":  # Crab-like alien
-            enemy = self.canvas.create_polygon(
+        if shape == "alien2":  # Crab-like alien
+            return "polygon", [
                 # Top left antenna
                 x - width/2, y - height/2,
                 x - width/3, y - height/4,
@@ -840,13 +1029,10 @@ class GameScreen:
                 x - width/2, y,
                 x - width/3, y - height/6,
                 x - width/2, y - height/3,
-                fill=fill,
-                outline=outline,
-                width=1
-            )
+            ], []
             
-        elif shape == "alien3":  # Squid-like alien
-            enemy = self.canvas.create_polygon(
+        if shape == "alien3":  # Squid-like alien
+            return "polygon", [
                 # Head
                 x, y - height/2,
                 # Right head side
@@ -869,14 +1055,10 @@ class GameScreen:
                 # Left head side
                 x - width/3, y - height/4,
                 x - width/6, y - height/3,
-                fill=fill,
-                outline=outline,
-                width=1
-            )
+            ], []
             
-        elif shape == "alien4":  # Boss alien
-            # Create main body
-            enemy = self.canvas.create_polygon(
+        if shape == "alien4":  # Boss alien
+            return "polygon", [
                 # Top of head
                 x - width/3, y - height/2,
                 x + width/3, y - height/2,
@@ -892,51 +1074,70 @@ class GameScreen:
                 # Left side
                 x - width/3, y,
                 x - width/2, y - height/3,
-                fill=fill,
-                outline=outline,
-                width=1
-            )
-            # Add eyes
-            self.canvas.create_oval(
-                x - width/6, y - height/4,
-                x - width/12, y - height/6,
-                fill="#FFFFFF",
-                outline=outline
-            )
-            self.canvas.create_oval(
-                x + width/12, y - height/4,
-                x + width/6, y - height/6,
-                fill="#FFFFFF",
-                outline=outline
-            )
+            ], [
+                # Eyes
+                ("oval", [x - width/6, y - height/4, x - width/12, y - height/6], "#FFFFFF"),
+                ("oval", [x + width/12, y - height/4, x + width/6, y - height/6], "#FFFFFF"),
+            ]
             
-        elif shape == "alien5":  # UFO mothership - simplified without lights
-            # Create oval for UFO body
-            enemy = self.canvas.create_oval(
+        if shape == "alien5":  # UFO mothership - simplified without lights
+            return "oval", [
                 x - width/1.5, y - height/3,
                 x + width/1.5, y + height/3,
-                fill=fill,
-                outline=outline,
-                width=1
-            )
-            # Add a small ridge on top for detail without cockpit
-            self.canvas.create_rectangle(
-                x - width/4, y - height/3 - 2,
-                x + width/4, y - height/3,
-                fill=fill,
-                outline=outline
-            )
-        else:
-            # Default to a simple rectangular alien if shape not recognized
-            enemy = self.canvas.create_rectangle(
-                x - width/2, y - height/2,
-                x + width/2, y + height/2,
-                fill=fill,
-                outline=outline,
-                width=1
-            )
+            ], [
+                # A small ridge on top for detail without cockpit
+                ("rectangle", [x - width/4, y - height/3 - 2, x + width/4, y - height/3],
+                 enemy_type["fill"]),
+            ]
             
-        return enemy
+        # Default to a simple rectangular alien if shape not recognized
+        return "rectangle", [
+            x - width/2, y - height/2,
+            x + width/2, y + height/2,
+        ], []
+    
+    def create_enemy(self, x, y, enemy_type):
+        """
+        Create a Space Invaders style alien enemy.
+        
+        Returns:
+            tuple: (body item id, tuple of detail item ids)
+        """
+        body_type, body_coords, parts = self.enemy_shape(x, y, enemy_type)
+        outline = enemy_type["outline"]
+        
+        # Details are tagged "enemy" too, so they move with the formation
+        enemy = getattr(self.canvas, "create_" + body_type)(
+            *body_coords,
+            fill=enemy_type["fill"],
+            outline=outline,
+            width=1,
+            tags="enemy"
+        )
+        part_ids = tuple(
+            getattr(self.canvas, "create_" + part_type)(
+                *coords, fill=fill, outline=outline, tags="enemy"
+            )
+            for part_type, coords, fill in parts
+        )
+        return enemy, part_ids
+    
+    def place_enemy(self, enemy, x, y, enemy_type):
+        """Move a pooled alien's items to (x, y) and show them again."""
+        body_type, body_coords, parts = self.enemy_shape(x, y, enemy_type)
+        outline = enemy_type["outline"]
+        
+        self.canvas.coords(enemy.id, *body_coords)
+        self.canvas.itemconfig(enemy.id, fill=enemy_type["fill"], outline=outline, state="normal")
+        for part_id, (part_type, coords, fill) in zip(enemy.parts, parts):
+            self.canvas.coords(part_id, *coords)
+            self.canvas.itemconfig(part_id, fill=fill, outline=outline, state="normal")
+    
+    def hide_enemy(self, enemy):
+        """Hide an alien's items, keeping them in the pool for the next wave."""
+        self.canvas.itemconfig(enemy.id, state="hidden")
+        for part_id in enemy.parts:
+            self.canvas.itemconfig(part_id, state="hidden")
     
     def update_enemies(self):
         """Update the enemy positions using Space Invaders style movement."""
@@ -952,18 +1153,17 @@ class GameScreen:
         # Reset the timer
         self.enemy_move_timer = 0
         
-        # Check if any enemies have reached the edges
-        try:
-            leftmost_x = min(enemy["x"] for enemy in self.enemies if enemy.get("x") is not None)
-            rightmost_x = max(enemy["x"] for enemy in self.enemies if enemy.get("x") is not None)
-            lowest_y = max(enemy["y"] for enemy in self.enemies if enemy.get("y") is not None)
-        except ValueError:
-            # No valid enemies with coordinates found
+        # Check if any enemies have reached the edges (the formation keeps
+        # its bounds up to date as enemies die, so no scan is needed)
+        if not self.formation:
             return
+        leftmost_x = self.formation.leftmost_x()
+        rightmost_x = self.formation.rightmost_x()
+        lowest_y = self.formation.lowest_y()
         
         # Check for edge collision and game over
         hit_edge = False
-        if (self.enemy_direction > 0 and rightmost_x + 20 >= 800) or \
+        if (self.enemy_direction > 0 and rightmost_x + 20 >= self.width) or \
            (self.enemy_direction < 0 and leftmost_x - 20 <= 0):
             hit_edge = True
         
@@ -976,16 +1176,9 @@ class GameScreen:
         if hit_edge:
             self.enemy_direction *= -1
             
-            # Move all enemies down
-            enemies_to_update = list(self.enemies)  # Make a copy for safe iteration
-            for enemy in enemies_to_update:
-                try:
-                    if "y" in enemy and "id" in enemy:
-                        enemy["y"] += self.enemy_descent_distance
-                        self.canvas.move(enemy["id"], 0, self.enemy_descent_distance)
-                except Exception as e:
-                    # If enemy causes error, just skip it
-                    continue
+            # Move all enemies down (one canvas call for the whole "enemy" tag)
+            self.formation.shift(0, self.enemy_descent_distance)
+            self.canvas.move("enemy", 0, self.enemy_descent_distance)
                 
             # Play sound
             self.play_sound("enemy_descend")
@@ -995,22 +1188,20 @@ class GameScreen:
         else:
             # Move horizontally in current direction
             dx = self.enemy_speed * self.enemy_direction
-            enemies_to_update = list(self.enemies)  # Make a copy for safe iteration
-            for enemy in enemies_to_update:
-                try:
-                    if "x" in enemy and "id" in enemy:
-                        enemy["x"] += dx
-                        self.canvas.move(enemy["id"], dx, 0)
-                except Exception as e:
-                    # If enemy causes error, just skip it
-                    continue
-        
-        # Animate aliens (toggle between shapes for a classic Space Invaders effect)
+            self.formation.shift(dx, 0)
+            self.canvas.move("enemy", dx, 0)
+        
+        # Animate aliens (toggle between shapes for a classic Space Invaders
+        # effect) - less often, or not at all, at lower quality tiers
+        anim_every = self.quality.settings["outline_anim_every"]
+        self.outline_anim_counter += 1
+        if not anim_every or self.outline_anim_counter % anim_every:
+            return
         enemies_to_animate = list(self.enemies)  # Make a copy for safe iteration
         for enemy in enemies_to_animate:
             try:
                 # Get current outline color
-                outline_color = self.canvas.itemcget(enemy["id"], "outline")
+                outline_color = self.canvas.itemcget(enemy.id, "outline")
                 
                 # Toggle between normal and brighter outline
                 if "88" in outline_color:  # If it's already bright
@@ -1018,7 +1209,7 @@ class GameScreen:
                 else:  # If it's dim
                     new_color = outline_color.replace("FF", "88")
                     
-                self.canvas.itemconfig(enemy["id"], outline=new_color)
+                self.canvas.itemconfig(enemy.id, outline=new_color)
             except Exception as e:
                 # If enemy causes error, just skip it
                 continue
@@ -1035,7 +1226,7 @@ class GameScreen:
                 
             # Get bullet position
             try:
-                bullet_coords = self.canvas.coords(bullet)
+                bullet_coords = self.canvas.coords(bullet.id)
                 if not bullet_coords:  # Skip if bullet was deleted
                     continue
                     
@@ -1048,7 +1239,7 @@ class GameScreen:
                         continue
                         
                     # Get enemy bounding box
-                    enemy_coords = self.canvas.bbox(enemy["id"])
+                    enemy_coords = self.canvas.bbox(enemy.id)
                     if not enemy_coords:  # Skip if enemy was deleted
                         continue
                     
@@ -1061,28 +1252,31 @@ class GameScreen:
                         break
             except Exception as e:
                 # Skip problematic bullets
-                print(f"Error in collision detection: {e}")
+                collision_log.error("Error in collision detection: %s", e)
                 continue
     
     def handle_enemy_hit(self, enemy, bullet):
         """Handle what happens when an enemy is hit by a bullet."""
-        # No explosion effect as requested by user
+        # No explosion effect as requested by user, just the sound
+        self.play_sound("explosion")
         
         # Increment score based on enemy type
-        points = enemy["points"]
+        points = enemy.points
         
         # Update score
         self.score += points
         self.canvas.itemconfig(self.score_text, text=f"Score: {self.score}")
         
-        # Remove enemy from canvas and list
-        self.canvas.delete(enemy["id"])
+        # Hide the enemy (its items stay pooled for the next wave), remove it
+        # from the list (O(1) swap-remove) and mark its grid cell dead so the
+        # formation bounds shrink
+        self.hide_enemy(enemy)
         self.enemies.remove(enemy)
+        self.formation.kill(enemy.row, enemy.col)
         
         # Remove bullet from canvas and list
-        self.canvas.delete(bullet)
-        if bullet in self.bullets:
-            self.bullets.remove(bullet)
+        self.canvas.delete(bullet.id)
+        self.bullets.remove(bullet)
             
         # Check if all enemies are defeated
         if not self.enemies:
@@ -1090,60 +1284,12 @@ class GameScreen:
     
     def create_explosion(self, x, y):
         """Create a visual explosion effect."""
-        # Create multiple explosion particles
-        particles = []
         # Use only white/blue colors to avoid red/yellow
         colors = ["#FFFFFF", "#CCCCFF", "#8888FF", "#6666FF"]  # White to blue colors
         
-        # Create 8 particles in different directions
-        for i in range(8):
-            angle = math.radians(i * 45)  # 8 directions (0, 45, 90, 135, etc.)
-            dx = math.cos(angle) * 5
-            dy = math.sin(angle) * 5
-            color = random.choice(colors)
-            
-            # Create small circle for particle
-            particle = self.canvas.create_oval(
-                x - 3, y - 3, 
-                x + 3, y + 3, 
-                fill=color, outline=""
-            )
-            
-            particles.append({"id": particle, "dx": dx, "dy": dy, "life": 10})
-        
-        # Animate the explosion
-        self.animate_explosion(particles)
-    
-    def animate_explosion(self, particles, frame=0):
-        """Animate the explosion particles."""
-        still_alive = False
-        
-        for p in particles:
-            if p["life"] > 0:
-                # Move particle
-                self.canvas.move(p["id"], p["dx"], p["dy"])
-                
-                # Fade particle (reduce opacity)
-                p["life"] -= 1
-                opacity = int(p["life"] * 25.5)  # 255 * (life/10)
-                color = self.canvas.itemcget(p["id"], "fill")
-                
-                # Reduce size slightly
-                coords = self.canvas.coords(p["id"])
-                new_coords = [
-                    coords[0] + 0.2, coords[1] + 0.2,
-                    coords[2] - 0.2, coords[3] - 0.2
-                ]
-                self.canvas.coords(p["id"], *new_coords)
-                
-                still_alive = True
-            else:
-                # Remove dead particles
-                self.canvas.delete(p["id"])
-        
-        # Continue animation if particles still exist
-        if still_alive and frame < 10 and self.game_running:
-            self.master.after(20, lambda: self.animate_explosion(particles, frame + 1))
+        # 8 particles in different directions (0, 45, 90, 135, etc.) that
+        # shrink as they fly; the particle engine animates them
+        self.particles.emit_burst(x, y, count=8, colors=colors, speed=5, life=10, size=3, shrink=0.2)
     
     def level_complete(self):
         """Handle level completion."""
@@ -1155,7 +1301,7 @@ class GameScreen:
         
         # Display level completion message
         level_msg = self.canvas.create_text(
-            400, 300,  # Center of screen
+            self.width // 2, 300,  # Center of screen
             text=f"LEVEL {self.level-1} COMPLETE!",
             font=("Courier", 30, "bold"),
             fill="#00FF00",
@@ -1164,7 +1310,7 @@ class GameScreen:
         
         # Show next level message
         next_msg = self.canvas.create_text(
-            400, 350,
+            self.width // 2, 350,
             text=f"PREPARE FOR LEVEL {self.level}",
             font=("Courier", 20),
             fill="#FFFFFF",
@@ -1181,30 +1327,22 @@ class GameScreen:
     
     def spawn_new_level(self):
         """Spawn enemies for the new level with increased difficulty."""
-        # Increase difficulty with level - more aggressive aliens in higher levels
-        self.enemy_speed = min(2 + self.level * 0.6, 10)  # Faster movement in higher levels (up to 10)
-        self.enemy_move_delay = max(30 - self.level * 3, 3)  # Much quicker movement at higher levels
-        
-        # Increase enemy bullets as levels progress
-        self.max_enemy_bullets_onscreen = min(5 + self.level, 20)  # More bullets at once
-        
-        # Decrease enemy shot cooldown (much more frequent shots at higher levels)
-        self.enemy_shot_cooldown = max(1000 - (self.level * 60), 200)  # Down to 200ms cooldown
-        
-        # Add more enemy rows every 2 levels (up to 7)
-        self.enemy_rows = min(4 + (self.level - 1) // 2, 7)
+        # Pick up any edits to the level file, then look up this level's
+        # speeds, rows and fire rate (more aggressive aliens in higher levels)
+        self.levels.reload_if_changed()
+        settings = self.levels.settings(self.level)
+        self.apply_level_settings(settings)
         
-        # Every 3 levels, increase enemy bullet speed
-        if self.level % 3 == 0:
-            self.enemy_bullet_speed += 1
+        # Pick up scores other players have posted since the last level
+        self.rank_index_wanted = True
         
-        # Award bonus shield every 10 levels
-        if self.level % 10 == 0:
+        # Award bonus shield (every 10 levels by default)
+        if settings.bonus_shield:
             self.shields += 1
             self.update_hud()
             # Show bonus life message
             bonus_msg = self.canvas.create_text(
-                400, 350,
+                self.width // 2, 350,
                 text="BONUS SHIELD AWARDED!",
                 fill="#00FF00",
                 font=("Courier", 20, "bold"),
@@ -1219,10 +1357,9 @@ class GameScreen:
         self.spawn_enemies()
         
         # Display level message with difficulty indicator
-        level_difficulty = "EXTREME" if self.level > 15 else "HARD" if self.level > 10 else "MEDIUM" if self.level > 5 else "NORMAL"
         level_msg = self.canvas.create_text(
-            400, 300,
-            text=f"LEVEL {self.level} - {level_difficulty} DIFFICULTY",
+            self.width // 2, 300,
+            text=f"LEVEL {self.level} - {settings.difficulty} DIFFICULTY",
             fill="#FFFFFF",
             font=("Courier", 18, "bold"),
             tags="level_msg"
@@ -1230,48 +1367,46 @@ class GameScreen:
         self.master.after(2000, lambda: self.canvas.delete(level_msg))
     
     def regenerate_barriers(self):
-        """Clear and recreate the protective barriers."""
-        # Remove existing barriers
-        for block in self.barrier_blocks:
-            self.canvas.delete(block["id"])
-        
-        self.barriers = []
-        self.barrier_blocks = []
-        
-        # Create new barriers
-        self.create_barriers()
+        """Restore every barrier block to full health, reusing its canvas item."""
+        fill, outline = BARRIER_COLORS[3]
+        self.barrier_blocks.clear()
+        for barrier in self.barriers:
+            for block in barrier["blocks"]:
+                # Only damaged or destroyed blocks need recoloring
+                if block.health != 3:
+                    block.health = 3
+                    self.canvas.itemconfig(block.id, fill=fill, outline=outline)
+                self.barrier_blocks.append(block)
+        
+        # Show destroyed blocks again (one canvas call for the whole tag)
+        self.canvas.itemconfig("barrier", state="normal")
     
     def game_over(self, invasion=False):
         """Handle game over state."""
         # Set game running to false
         self.game_running = False
         
-        # Save score to leaderboard
-        self.leaderboard.add_score(self.player_name, self.score, self.level)
+        # A finished game can't be resumed
+        if self.checkpointer is not None:
+            self.checkpointer.discard()
         
-        # Get player rank
-        player_rank = self.leaderboard.get_player_rank(self.player_name, self.score)
+        # Saving the score and reading the rank, stats, fact and top scores
+        # can take a while (or fail) with a remote leaderboard, so they run in
+        # the background; the screen is drawn now and filled in afterwards
+        player_name, score, level = self.player_name, self.score, self.level
+        self.results_task = BackgroundTask(
+            lambda: self.fetch_game_over_results(player_name, score, level),
+            name="game-over"
+        ).start()
+        if self.rank_index is not None:
+            self.rank_index.add(self.score)  # So the next game ranks against it too
         
-        # Get a random space fact
-        space_fact = self.leaderboard.get_random_space_fact()
+        # Cancel pending level transitions, flashes and warnings
+        self.cancel_scheduled_callbacks()
         
-        # Get top 5 scores
-        top_scores = self.leaderboard.get_top_scores(5)
-        
-        # Cancel any scheduled animations/updates
-        if hasattr(self, 'game_update_id'):
-            self.master.after_cancel(self.game_update_id)
-        
-        # Start with a fresh canvas to avoid any issues
-        self.canvas.delete("all")
-        
-        # Recreate the galaxy background for the game over screen
-        self.create_galaxy_background()
-        
-        # Reset data structures
-        self.bullets = []
-        self.enemy_bullets = []
-        self.enemies = []
+        # Clear the playfield for the game over screen (the starfield stays;
+        # the ship, HUD, barriers and enemies are hidden for reuse)
+        self.clear_playfield()
         
         # Different message based on how game ended
         game_over_msg = "GAME OVER"
@@ -1280,193 +1415,431 @@ class GameScreen:
         
         # Show game over message with blue instead of red
         self.canvas.create_text(
-            400, 150,
+            self.width // 2, 150,
             text=game_over_msg,
             fill="#6666FF",  # Blue text instead of red
-            font=("Courier", 36, "bold")
+            font=("Courier", 36, "bold"),
+            tags="game_over"
         )
         
         # Show player score
         self.canvas.create_text(
-            400, 200,
+            self.width // 2, 200,
             text=f"Final Score: {self.score}",
             fill="#FFFFFF",
-            font=("Courier", 24)
+            font=("Courier", 24),
+            tags="game_over"
         )
         
-        # Show player rank
-        self.canvas.create_text(
-            400, 230,
-            text=f"Rank: #{player_rank}",
+        # Player rank and personal best (filled in by show_game_over_results)
+        self.rank_line_text = self.canvas.create_text(
+            self.width // 2, 230,
+            text="Saving score...",
             fill="#00FFAA",
-            font=("Courier", 18)
+            font=("Courier", 18),
+            tags="game_over"
         )
         
         # Show space fact header
         self.canvas.create_text(
-            400, 270,
+            self.width // 2, 270,
             text="SPACE FACT:",
             fill="#00FFFF",
-            font=("Courier", 14, "bold")
+            font=("Courier", 14, "bold"),
+            tags="game_over"
         )
         
-        # Show space fact
-        fact_text = self.canvas.create_text(
-            400, 295,
-            text=space_fact,
+        # Space fact
+        self.fact_text = self.canvas.create_text(
+            self.width // 2, 295,
+            text="",
             fill="#CCCCFF",
             font=("Courier", 12),
             width=600,  # Wrap text if needed
-            justify=tk.CENTER
+            justify=tk.CENTER,
+            tags="game_over"
         )
         
         # Draw a separator line
-        self.canvas.create_line(200, 320, 600, 320, fill="#444444", width=2)
+        self.canvas.create_line(200, 320, 600, 320, fill="#444444", width=2, tags="game_over")
         
         # Leaderboard title
         self.canvas.create_text(
-            400, 340,
+            self.width // 2, 340,
             text="TOP SCORES",
             fill="#00FF88",
-            font=("Courier", 16, "bold")
+            font=("Courier", 16, "bold"),
+            tags="game_over"
         )
         
+        # Play again prompt
+        self.canvas.create_text(
+            self.width // 2, 550,
+            text="Press SPACE to play again",
+            fill="#00FF00",
+            font=("Courier", 16),
+            tags="game_over"
+        )
+        
+        # Space now restarts the game (see handle_space)
+        self.master.after(50, self.show_game_over_results)
+    
+    def fetch_game_over_results(self, player_name, score, level):
+        """
+        Save the score and read what the game over screen shows.
+        
+        Runs on a background thread (see game_over).
+        
+        Returns:
+            dict: rank, stats, fact and top_scores
+        """
+        leaderboard = self.leaderboard
+        leaderboard.add_score(player_name, score, level)
+        return {
+            "rank": leaderboard.get_player_rank(player_name, score),
+            # The player's own record (includes the game just saved)
+            "stats": leaderboard.get_player_stats(player_name),
+            "fact": leaderboard.get_random_space_fact(),
+            "top_scores": leaderboard.get_top_scores(5),
+        }
+    
+    def wait_for_results(self):
+        """Wait until the last game's score is saved, e.g. before closing the leaderboard."""
+        if self.results_task is not None:
+            try:
+                self.results_task.result()
+            except Exception as e:
+                log.error("Score not saved: %s", e)
+    
+    def show_game_over_results(self):
+        """Fill in the game over screen once the leaderboard has answered."""
+        task = self.results_task
+        if not task.done():
+            self.master.after(50, self.show_game_over_results)
+            return
+        
+        try:
+            results = task.result()
+            self.last_top_scores = results["top_scores"]
+        except Exception as e:
+            # Leaderboard down: rank against the live rank index if there is
+            # one, and show the last top scores we saw
+            log.error("Leaderboard unavailable at game over: %s", e)
+            results = {
+                "rank": self.rank_index.rank(self.score) if self.rank_index is not None else None,
+                "stats": None,
+                "fact": "Leaderboard unavailable - your score will be sent when it's back.",
+                "top_scores": self.last_top_scores,
+            }
+        
+        # Show player rank and personal best
+        player_stats = results["stats"]
+        rank_line = f"Rank: #{results['rank']}" if results["rank"] is not None else ""
+        if player_stats:
+            rank_line += f"   Best: {player_stats['best_score']}   Games: {player_stats['games_played']}"
+        self.canvas.itemconfig(self.rank_line_text, text=rank_line)
+        self.canvas.itemconfig(self.fact_text, text=results["fact"])
+        
         # Display leaderboard entries
         y_pos = 370
-        for i, (name, score, level, date) in enumerate(top_scores):
-            # Highlight the current player's score
-            is_player = name == self.player_name and score == self.score
+        highlighted = False
+        for i, (name, score, level, date) in enumerate(results["top_scores"]):
+            # Highlight the current player's score (only once if it is tied)
+            is_player = not highlighted and name == self.player_name and score == self.score
+            highlighted = highlighted or is_player
             color = "#FFFF00" if is_player else "#FFFFFF"
             
             # Format the leaderboard entry
             entry_text = f"{i+1}. {name}: {score} pts (Level {level})"
             
             self.canvas.create_text(
-                400, y_pos,
+                self.width // 2, y_pos,
                 text=entry_text,
                 fill=color,
-                font=("Courier", 14)
+                font=("Courier", 14),
+                tags="game_over"
             )
             y_pos += 25
+    
+    def restart_game_safe(self, event=None):
+        """
+        Start a new game on the same screen.
         
-        # Play again prompt
-        self.canvas.create_text(
-            400, 550,
-            text="Press SPACE to play again",
-            fill="#00FF00",
-            font=("Courier", 16)
-        )
+        Nothing is torn down: the player ship, HUD, barriers and pooled enemy
+        items are reset in place and the pause buttons are reused, so a
+        restart takes a few milliseconds and memory stays flat however many
+        games are played.
+        """
+        # Cancel any scheduled animations or updates to avoid stacking game loops
+        self.cancel_scheduled_callbacks()
         
-        # Make sure the spaceship and barriers don't remain
-        self.player_ship = None
-        self.barrier_blocks = []
+        # Remove the game over screen
+        self.canvas.delete("game_over")
+        
+        # Reset game state
+        self.game_running = True
+        self.is_paused = False
+        self.is_flashing = False
+        self.score = 0
+        self.level = 1
+        self.shields = 3
+        
+        # Reset player position
+        self.player_x = self.width // 2
+        self.player_y = self.height - 50
+        
+        # Reset movement flags
+        self.move_left = False
+        self.move_right = False
+        self.input_left = self.input_right = False
+        
+        # Reset player speed to initial value
+        self.player_speed = 8
+        
+        # Reset the player's bullet speed and shot cooldown to initial values
+        self.player_bullet_speed = 10
+        self.shot_cooldown = 250
+        self.last_shot_time = 0
+        self.enemy_last_shot_time = 0
+        
+        # Reset enemy movement; level 1 difficulty comes from the level
+        # table (reloaded first, in case it was edited since the last game)
+        self.enemy_direction = 1
+        self.enemy_move_timer = 0
+        self.enemy_cols = 10
+        self.levels.reload_if_changed()
+        self.apply_level_settings(self.levels.settings(self.level))
+        
+        # Reset timing variables
+        self.level_up_time = self.clock.time()
         
-        # Bind space to restart with a more reliable approach
-        self.master.bind("<space>", self.restart_game_safe)
-    
-    def restart_game_safe(self, event=None):
-        """A safer version of restart_game to avoid freezing."""
         try:
-            # Cancel any scheduled animations or updates to avoid stacking game loops
-            for after_id in self.master.tk.call('after', 'info'):
-                try:
-                    self.master.after_cancel(after_id)
-                except:
-                    pass
-            
-            # Try to completely reset the game UI
-            self.canvas.delete("all")
-            
-            # Store the player name and leaderboard for reuse
-            player_name = self.player_name
-            leaderboard = self.leaderboard
-            
-            # Reset game state
-            self.game_running = True
-            self.is_paused = False
-            self.score = 0
-            self.level = 1
-            self.shields = 3
-            
-            # Reset player position
-            self.player_x = 400
-            self.player_y = 550
-            
-            # Reset movement flags
-            self.move_left = False
-            self.move_right = False
-            
-            # Reset player speed to initial value
-            self.player_speed = 8
-            
-            # Reset bullet speeds to initial values
-            self.player_bullet_speed = 10
-            self.enemy_bullet_speed = 6
-            
-            # Reset shot cooldown times
-            self.shot_cooldown = 250
-            self.enemy_shot_cooldown = 1000
-            self.last_shot_time = 0
-            self.enemy_last_shot_time = 0
-            
-            # Reset all game elements
-            self.bullets = []
-            self.enemy_bullets = []
-            self.enemies = []
-            
-            # Reset enemy movement parameters
-            self.enemy_speed = 3
-            self.enemy_direction = 1
-            self.enemy_move_timer = 0
-            self.enemy_move_delay = 25
-            self.enemy_descent_distance = 25
-            self.enemy_rows = 5
-            self.enemy_cols = 10
-            
-            # Reset other elements
-            self.stars = []
-            self.barriers = []
-            self.barrier_blocks = []
-            self.particles = []
-            
-            # Reset timing variables
-            self.level_up_time = time.time()
-            
-            # Restore player name and leaderboard
-            self.player_name = player_name
-            self.leaderboard = leaderboard
-            
-            # Clear any scheduled 'after' events
-            if hasattr(self, 'game_update_id') and self.game_update_id:
-                try:
-                    self.master.after_cancel(self.game_update_id)
-                except:
-                    pass
-            
-            # Recreate the game elements
-            self.create_galaxy_background()
-            self.initialize_hud()
-            self.update_hud()
-            self.create_player_ship()
-            self.create_barriers()
-            self.spawn_enemies()
-            self.create_pause_play_buttons()
-            
-            # Set up controls again
-            self.setup_controls()
-            
-            # Reset any flashing state
-            self.is_flashing = False
-            
-            # Small delay before starting the game loop to ensure everything is initialized
-            self.master.after(50, self.start_fresh_game_loop)
-            
+            self.reset_playfield()
         except Exception as e:
-            # Fallback if anything goes wrong
-            print(f"Error during restart: {e}")
-            # Create a new game screen as a last resort
-            self.master.after(100, lambda: GameScreen(self.master, self.player_name))
+            # Fall back to redrawing the playfield from scratch
+            log.error("Error during restart: %s", e, exc_info=True)
+            self.rebuild_playfield()
+        
+        # Show the pause button again
+        self.play_button.pack_forget()
+        self.pause_button.pack()
+        
+        # Small delay before starting the game loop to ensure everything is initialized
+        self.master.after(50, self.start_fresh_game_loop)
+    
+    def cancel_scheduled_callbacks(self):
+        """Cancel every pending after() callback (game loop, level transitions, effects)."""
+        # Send queued canvas updates first - their idle flush is cancelled too
+        self.canvas.flush()
+        for after_id in self.master.tk.call('after', 'info'):
+            try:
+                self.master.after_cancel(after_id)
+            except:
+                pass
+    
+    def clear_playfield(self):
+        """
+        Clear the playfield without deleting the items a new game reuses.
+        
+        The player ship, HUD, barrier blocks and pooled enemies are hidden;
+        bullets, messages, flash overlays and any other short-lived items are
+        deleted. The starfield and the particle engine's ovals are kept.
+        """
+        for enemy in self.enemies:
+            self.hide_enemy(enemy)
+        self.enemies.clear()
+        self.formation.clear()
+        self.bullets.clear()
+        self.enemy_bullets.clear()
+        self.particles.clear()
+        
+        # Everything the next game reuses
+        keep = set(self.stars)
+        keep.update(self.particles.items)
+        keep.update((self.score_text, self.level_text, self.shields_text, self.rank_text,
+                     self.player_ship))
+        keep.update(block.id for barrier in self.barriers for block in barrier["blocks"])
+        for enemy in self.enemy_pool.values():
+            keep.add(enemy.id)
+            keep.update(enemy.parts)
+        
+        transient = [item for item in self.canvas.find_all() if item not in keep]
+        if transient:
+            self.canvas.delete(*transient)
+        
+        self.canvas.itemconfig("hud", state="hidden")
+        self.canvas.itemconfig("barrier", state="hidden")
+        self.canvas.itemconfig(self.player_ship, state="hidden")
+    
+    def reset_playfield(self):
+        """Put the playfield's reused items back in place for a new game."""
+        # Player ship back at the start position, in its normal colors
+        self.canvas.coords(self.player_ship, *self.player_ship_coords())
+        self.canvas.itemconfig(self.player_ship, fill="#00FFAA", state="normal")
+        
+        # HUD
+        self.canvas.itemconfig("hud", state="normal")
+        self.update_hud()
+        
+        # Barriers at full health and a fresh formation from the enemy pool
+        self.regenerate_barriers()
+        self.spawn_enemies()
+    
+    def rebuild_playfield(self):
+        """Delete every canvas item and draw the playfield from scratch."""
+        self.canvas.delete("all")
+        self.particles.reset()
+        self.enemy_pool.clear()
+        self.enemies.clear()
+        self.formation.clear()
+        self.bullets.clear()
+        self.enemy_bullets.clear()
+        
+        self.create_galaxy_background()
+        self.initialize_hud()
+        self.update_hud()
+        self.create_player_ship()
+        self.create_barriers()
+        self.spawn_enemies()
             
+    def capture_state(self):
+        """
+        Capture the game for a snapshot (see snapshot.py).
+        
+        Returns:
+            GameState: Score, level, formation, bullets, barriers, cooldowns
+                and the random number generator's state
+        """
+        now = self.clock.time() * 1000
+        bullets = array("d")
+        for bullet in self.bullets:
+            coords = self.canvas.coords(bullet.id)
+            bullets.extend((coords[0], coords[1], bullet.dx, bullet.dy))
+        enemy_bullets = array("d")
+        for bullet in self.enemy_bullets:
+            coords = self.canvas.coords(bullet.id)
+            enemy_bullets.extend((coords[0], coords[1], bullet.dx, bullet.dy))
+        
+        # Alive enemies as grid slots, in list order (the order enemy shooters are picked in)
+        cols = self.formation.cols
+        enemy_slots = array("H", [enemy.row * cols + enemy.col for enemy in self.enemies])
+        barrier_health = bytes(min(block.health, 255) for barrier in self.barriers
+                               for block in barrier["blocks"])
+        
+        flags = GameState.PAUSED if self.is_paused else 0
+        if not self.enemies:
+            flags |= GameState.BETWEEN_LEVELS
+        return GameState(
+            player_name=self.player_name, score=self.score, level=self.level,
+            shields=self.shields, flags=flags, player_x=self.player_x,
+            enemy_direction=self.enemy_direction, enemy_move_timer=self.enemy_move_timer,
+            enemy_speed=self.enemy_speed, enemy_move_delay=self.enemy_move_delay,
+            enemy_descent_distance=self.enemy_descent_distance,
+            max_enemy_bullets_onscreen=self.max_enemy_bullets_onscreen,
+            enemy_shot_cooldown=self.enemy_shot_cooldown,
+            enemy_rows=self.formation.rows or self.enemy_rows, enemy_cols=cols or self.enemy_cols,
+            enemy_bullet_speed=self.enemy_bullet_speed,
+            last_shot_age=now - self.last_shot_time,
+            enemy_last_shot_age=now - self.enemy_last_shot_time,
+            offset_x=self.formation.offset_x, offset_y=self.formation.offset_y,
+            barrier_count=len(barrier_health), barrier_health=barrier_health,
+            enemy_slots=enemy_slots, bullets=bullets, enemy_bullets=enemy_bullets,
+            rng_state=self.rng.getstate(),
+        )
+    
+    def restore_state(self, state):
+        """
+        Put the game back where a snapshot left it, reusing the canvas items.
+        
+        Works from any screen (playing, paused or game over); the game loop
+        runs again on the next frame.
+        
+        Args:
+            state (GameState): A state from capture_state() or snapshot.decode()
+        """
+        self.cancel_scheduled_callbacks()
+        if self.is_paused:
+            self.canvas.delete(self.pause_text)
+        self.canvas.delete("game_over", "level_msg", "overlay", "danger_warning")
+        for bullet in list(self.bullets) + list(self.enemy_bullets):
+            self.canvas.delete(bullet.id)
+        self.bullets.clear()
+        self.enemy_bullets.clear()
+        self.particles.reset()
+        
+        # Game state, then this level's settings as they were when captured
+        self.player_name = state.player_name
+        self.game_running = True
+        self.is_paused = False
+        self.is_flashing = False
+        self.score = state.score
+        self.level = state.level
+        self.shields = state.shields
+        self.player_x = state.player_x
+        self.move_left = self.move_right = False
+        self.input_left = self.input_right = False
+        self.enemy_direction = state.enemy_direction
+        self.enemy_move_timer = state.enemy_move_timer
+        self.enemy_speed = state.enemy_speed
+        self.enemy_move_delay = state.enemy_move_delay
+        self.enemy_descent_distance = state.enemy_descent_distance
+        self.max_enemy_bullets_onscreen = state.max_enemy_bullets_onscreen
+        self.enemy_shot_cooldown = state.enemy_shot_cooldown
+        self.enemy_rows = state.enemy_rows
+        self.enemy_cols = state.enemy_cols
+        self.enemy_bullet_speed = state.enemy_bullet_speed
+        now = self.clock.time() * 1000
+        self.last_shot_time = now - state.last_shot_age
+        self.enemy_last_shot_time = now - state.enemy_last_shot_age
+        
+        # Ship, HUD, full barriers and a fresh formation, then the differences
+        self.reset_playfield()
+        
+        blocks = [block for barrier in self.barriers for block in barrier["blocks"]]
+        if len(blocks) == state.barrier_count:
+            for block, health in zip(blocks, state.barrier_health):
+                if health == block.health:
+                    continue
+                block.health = health
+                if health <= 0:
+                    self.canvas.itemconfig(block.id, state="hidden")
+                    self.barrier_blocks.remove(block)
+                elif health in BARRIER_COLORS:
+                    fill, outline = BARRIER_COLORS[health]
+                    self.canvas.itemconfig(block.id, fill=fill, outline=outline)
+        else:
+            log.warning("Snapshot has %d barrier blocks, the playfield %d; barriers left intact",
+                        state.barrier_count, len(blocks))
+        
+        self.formation.shift(state.offset_x, state.offset_y)
+        self.canvas.move("enemy", state.offset_x, state.offset_y)
+        alive = set(state.enemy_slots)
+        cols = self.formation.cols
+        for enemy in list(self.enemies):
+            if enemy.row * cols + enemy.col not in alive:
+                self.hide_enemy(enemy)
+                self.formation.kill(enemy.row, enemy.col)
+        self.enemies.clear()
+        self.enemies.extend(self.enemy_pool[divmod(slot, cols)] for slot in state.enemy_slots)
+        
+        for values, bullets, draw in ((state.bullets, self.bullets, self.create_player_bullet_item),
+                                      (state.enemy_bullets, self.enemy_bullets,
+                                       self.create_enemy_bullet_item)):
+            for i in range(0, len(values), 4):
+                x1, y1, dx, dy = values[i:i + 4]
+                bullets.append(Bullet(draw(x1, y1), dx, dy))
+        
+        self.rng.setstate(state.rng_state)
+        
+        self.play_button.pack_forget()
+        self.pause_button.pack()
+        if state.flags & GameState.BETWEEN_LEVELS:
+            # The wave was already cleared; bring on the next one
+            self.master.after(1000, self.spawn_new_level)
+        if state.flags & GameState.PAUSED:
+            self.toggle_pause()
+        self.start_fresh_game_loop()
+    
     def start_fresh_game_loop(self):
         """Start a fresh game loop with proper timing."""
         # Ensure we don't have stacked game loops
@@ -1477,16 +1850,27 @@ class GameScreen:
                 pass
                 
         # Start the game loop with a fresh timer
-        self.last_update_time = time.time()
-        self.game_update_id = self.master.after(16, self.update_game)
+        self.last_update_time = self.clock.time()
+        self._last_frame_start = None
+        self.game_update_id = self.master.after(FRAME_DELAY_MS, self.update_game)
         
     def update_game(self):
         """Update the game state and schedule the next update."""
+        frame_start = time.perf_counter()
+        last_frame_start, self._last_frame_start = self._last_frame_start, None
         try:
             if self.game_running and not self.is_paused:
+                self._last_frame_start = frame_start
+                
                 # Clean up any stray dots or lines that might be showing
                 self.clean_unwanted_items()
                 
+                # Let a programmatic controller steer before the player moves
+                if self.controller is not None:
+                    action = self.controller.tick(self)
+                    if action is not None:
+                        self.apply_input(action.left, action.right, action.fire)
+                
                 # Update player position based on controls
                 self.update_player_position()
                 
@@ -1499,6 +1883,9 @@ class GameScreen:
                 # Check for collisions
                 self.check_collisions()
                 
+                # Show where the score now places on the leaderboard
+                self.update_live_rank()
+                
                 # Handle enemy shooting
                 self.enemy_shoot()
                 
@@ -1507,12 +1894,27 @@ class GameScreen:
                 
                 # Update special effects
                 self._update_special_effects()
+                
+                # Send this frame's canvas updates to Tk in one go
+                self.canvas.flush()
+                
+                # Let the quality governor react to how long the last frame
+                # really took: the time since it started, less the after()
+                # delay, covers our work, Tk drawing it once idle, and any
+                # event-loop lag (timing just this callback would miss drawing)
+                if last_frame_start is not None:
+                    frame_ms = (frame_start - last_frame_start) * 1000 - FRAME_DELAY_MS
+                    self.quality.record_frame(max(0.0, frame_ms))
+                
+                # Save a checkpoint every few seconds
+                if self.checkpointer is not None:
+                    self.checkpointer.tick(self, self.clock.time() * 1000)
         except Exception as e:
-            print(f"Error in game loop: {e}")
+            log.error("Error in game loop: %s", e, exc_info=True)
             
         # Schedule the next update (approx. 60 FPS)
         if hasattr(self, 'master') and self.master:
-            self.game_update_id = self.master.after(16, self.update_game)
+            self.game_update_id = self.master.after(FRAME_DELAY_MS, self.update_game)
     
     def enemy_shoot(self):
         """Randomly select enemies to shoot."""
@@ -1532,10 +1934,7 @@ class GameScreen:
         enemy_columns = {}
         for enemy in self.enemies:
             try:
-                if 'id' not in enemy:
-                    continue
-                    
-                coords = self.canvas.coords(enemy['id'])
+                coords = self.canvas.coords(enemy.id)
                 if not coords:
                     continue
                     
@@ -1543,23 +1942,23 @@ class GameScreen:
                 if len(coords) >= 4:  # Rectangle or oval
                     x1, y1, x2, y2 = coords[0], coords[1], coords[2], coords[3]
                 else:  # Polygon - use bounding box
-                    bbox = self.canvas.bbox(enemy['id'])
+                    bbox = self.canvas.bbox(enemy.id)
                     if bbox:
                         x1, y1, x2, y2 = bbox
                 
                 center_x = (x1 + x2) / 2
                 column = int(center_x / 50)  # Group into columns
                 
-                if column not in enemy_columns or y2 > self.canvas.coords(enemy_columns[column]['id'])[3]:
+                if column not in enemy_columns or y2 > self.canvas.coords(enemy_columns[column].id)[3]:
                     enemy_columns[column] = enemy
             except Exception as e:
                 continue
                 
         # Randomly select columns to shoot from
         for enemy in enemy_columns.values():
-            if random.random() < 0.02:  # 2% chance per column per frame
+            if self.rng.random() < 0.02:  # 2% chance per column per frame
                 try:
-                    coords = self.canvas.coords(enemy['id'])
+                    coords = self.canvas.coords(enemy.id)
                     if not coords:
                         continue
                         
@@ -1567,7 +1966,7 @@ class GameScreen:
                     if len(coords) >= 4:  # Rectangle or oval
                         x1, y1, x2, y2 = coords[0], coords[1], coords[2], coords[3]
                     else:  # Polygon - use bounding box
-                        bbox = self.canvas.bbox(enemy['id'])
+                        bbox = self.canvas.bbox(enemy.id)
                         if bbox:
                             x1, y1, x2, y2 = bbox
                     
@@ -1587,13 +1986,13 @@ class GameScreen:
         for bullet in list(self.enemy_bullets):
             try:
                 # Move bullet with its velocity components
-                self.canvas.move(bullet["id"], bullet["dx"], bullet["dy"])
+                self.canvas.move(bullet.id, bullet.dx, bullet.dy)
                 
                 # Get bullet position
-                bullet_coords = self.canvas.coords(bullet["id"])
+                bullet_coords = self.canvas.coords(bullet.id)
                 
                 # Check if bullet has gone off screen
-                if not bullet_coords or bullet_coords[1] > 600 or bullet_coords[0] < 0 or bullet_coords[2] > 800:
+                if not bullet_coords or bullet_coords[1] > self.height or bullet_coords[0] < 0 or bullet_coords[2] > self.width:
                     bullets_to_remove.append(bullet)
                     continue
                     
@@ -1612,9 +2011,8 @@ class GameScreen:
         # Remove bullets
         for bullet in bullets_to_remove:
             try:
-                if bullet in self.enemy_bullets:
-                    self.enemy_bullets.remove(bullet)
-                self.canvas.delete(bullet["id"])
+                self.enemy_bullets.remove(bullet)
+                self.canvas.delete(bullet.id)
             except:
                 # Just continue if already removed
                 pass
@@ -1651,6 +2049,7 @@ class GameScreen:
             
         # Flash screen blue if taking damage (was red)
         self.flash_screen("#6666FF")
+        self.play_sound("player_hit")
         
         # Decrease shields
         self.shields -= 1
@@ -1668,13 +2067,13 @@ class GameScreen:
     def flash_player(self):
         """Flash the player ship to indicate it was hit."""
         self.is_flashing = True
-        flash_start_time = time.time()
+        flash_start_time = self.clock.time()
         flash_duration = 1.5  # seconds
         flash_count = 6
         
         def do_flash():
             # Calculate how far we are into the flash sequence
-            elapsed = time.time() - flash_start_time
+            elapsed = self.clock.time() - flash_start_time
             if elapsed >= flash_duration:
                 # End of flash sequence - restore normal color
                 self.canvas.itemconfig(self.player_ship, fill="#00FF00")
@@ -1701,21 +2100,55 @@ class GameScreen:
         self.canvas.itemconfig(self.score_text, text=f"Score: {self.score}")
         self.canvas.itemconfig(self.level_text, text=f"Level: {self.level}")
         self.canvas.itemconfig(self.shields_text, text=f"Shields: {self.shields}")
+        self.update_live_rank()
     
-    def level_up(self):
-        """Increase the game level and difficulty."""
-        self.level += 1
-        self.update_hud()
+    def update_live_rank(self):
+        """
+        Show the leaderboard position the current score would take.
+        
+        Called every frame: the rank is only looked up (O(log n) in the
+        rank index, no database query) when the score has changed, and the
+        text only changes when the rank does.
+        """
+        task = self.rank_task
+        if task is not None and task.done():
+            self.rank_task = None
+            try:
+                self.rank_index = task.result()
+                self.ranked_score = None  # Rank again against the new scores
+            except Exception as e:
+                log.warning("Live rank unavailable: %s", e)
+        if self.rank_index_wanted and self.rank_task is None:
+            self.fetch_rank_index()
         
-        # Increase enemy spawn rate and speed with level
-        self.enemy_spawn_delay = max(500, 2000 - (self.level * 100))
-        self.enemy_speed += 0.5
+        if self.rank_index is None or self.score == self.ranked_score:
+            return
+        self.ranked_score = self.score
+        rank = self.rank_index.rank(self.score) if self.score > 0 else None
+        if rank != self.live_rank:
+            self.live_rank = rank
+            self.canvas.itemconfig(self.rank_text, text=f"You are now #{rank}" if rank else "")
+    
+    def fetch_rank_index(self):
+        """Start copying the leaderboard's rank index on a background thread."""
+        # Don't open the leaderboard here - wait for the splash screen's task
+        # (or whoever sets it) so the first frames never block on it
+        if self._leaderboard is None:
+            if self._leaderboard_task is None or not self._leaderboard_task.done():
+                return
+        self.rank_index_wanted = False
+        try:
+            leaderboard = self.leaderboard
+        except Exception as e:
+            log.warning("Live rank unavailable: %s", e)
+            return
+        self.rank_task = BackgroundTask(leaderboard.get_rank_index, name="rank-index").start()
     
     def create_barriers(self):
         """Create Space Invaders style protective barriers."""
         # Barrier properties
         self.barriers = []
-        self.barrier_blocks = []
+        self.barrier_blocks = EntityList()
         num_barriers = 4
         barrier_width = 70
         barrier_height = 50
@@ -1723,7 +2156,7 @@ class GameScreen:
         
         # Calculate spacing
         total_width = num_barriers * barrier_width
-        spacing = (800 - total_width) / (num_barriers + 1)
+        spacing = (self.width - total_width) / (num_barriers + 1)
         
         # Block size
         block_size = 8
@@ -1758,18 +2191,18 @@ class GameScreen:
                         block = self.canvas.create_rectangle(
                             block_x, block_y,
                             block_x + block_size, block_y + block_size,
-                            fill="#44DD44",  # Green blocks
-                            outline="#339933",
+                            fill=BARRIER_COLORS[3][0],  # Green blocks
+                            outline=BARRIER_COLORS[3][1],
                             tags="barrier"
                         )
                         
                         # Store block with position data
-                        barrier_blocks.append({
-                            "id": block,
-                            "x": block_x + block_size/2,
-                            "y": block_y + block_size/2,
-                            "health": 3  # Each block can take 3 hits
-                        })
+                        barrier_blocks.append(BarrierBlock(
+                            block,
+                            block_x + block_size/2,
+                            block_y + block_size/2,
+                            health=3  # Each block can take 3 hits
+                        ))
             
             # Add barrier to list
             self.barriers.append({
@@ -1795,14 +2228,11 @@ class GameScreen:
         for block in blocks_to_check:
             try:
                 # Skip destroyed blocks
-                if block.get("health", 0) <= 0:
+                if block.health <= 0:
                     continue
                     
                 # Get block position
-                if "id" not in block:
-                    continue
-                    
-                block_coords = self.canvas.coords(block["id"])
+                block_coords = self.canvas.coords(block.id)
                 if not block_coords:
                     continue  # Skip if block no longer exists
                     
@@ -1810,20 +2240,17 @@ class GameScreen:
                 if (bullet_x >= block_coords[0] and bullet_x <= block_coords[2] and
                     bullet_y >= block_coords[1] and bullet_y <= block_coords[3]):
                     # Hit! Reduce block health
-                    block["health"] -= 1
+                    block.health -= 1
                     
                     # Update block appearance based on health
-                    if block["health"] <= 0:
-                        # Destroy block
-                        self.canvas.delete(block["id"])
-                        if block in self.barrier_blocks:
-                            self.barrier_blocks.remove(block)
-                    elif block["health"] == 2:
-                        # Slightly damaged
-                        self.canvas.itemconfig(block["id"], fill="#339933", outline="#228822")
-                    elif block["health"] == 1:
-                        # Heavily damaged
-                        self.canvas.itemconfig(block["id"], fill="#228822", outline="#117711")
+                    if block.health <= 0:
+                        # Destroy block (its item is hidden and reused next level)
+                        self.canvas.itemconfig(block.id, state="hidden")
+                        self.barrier_blocks.remove(block)
+                    elif block.health in BARRIER_COLORS:
+                        # Darken the block as it takes damage
+                        fill, outline = BARRIER_COLORS[block.health]
+                        self.canvas.itemconfig(block.id, fill=fill, outline=outline)
                     
                     return True  # Collision detected
             except Exception as e:
@@ -1834,17 +2261,38 @@ class GameScreen:
 
     def flash_screen(self, color="#6666FF"):
         """Flash the screen a specific color."""
-        # Create a semi-transparent overlay
-        overlay = self.canvas.create_rectangle(
-            0, 0, 800, 600,  # Fixed hard-coded dimensions instead of self.width/height
-            fill=color,
-            stipple="gray50",  # Makes it semi-transparent
-            tags=["overlay"]
-        )
+        flash_style = self.quality.settings["flash_style"]
+        if flash_style == "none":
+            return
+        
+        if flash_style == "stipple":
+            # Create a semi-transparent overlay
+            overlay = self.canvas.create_rectangle(
+                0, 0, self.width, self.height,
+                fill=color,
+                stipple="gray50",  # Makes it semi-transparent
+                tags=["overlay"]
+            )
+        else:
+            # Just a thick border - much cheaper to rasterize than a stipple
+            overlay = self.canvas.create_rectangle(
+                3, 3, self.width - 3, self.height - 3,
+                outline=color,
+                width=6,
+                tags=["overlay"]
+            )
         
         # Schedule removal after a short delay
         self.master.after(100, lambda: self.canvas.delete(overlay))
         
+    def apply_quality_settings(self, governor=None):
+        """Apply the quality governor's current tier to the effect systems."""
+        self.particles.density = self.quality.settings["particle_density"]
+        
+    def get_quality_debug(self):
+        """Return the quality governor's tier, settings and recent decisions (for debugging)."""
+        return self.quality.debug_info()
+        
     def get_enemy_types(self):
         """Return different enemy types."""
         # Define different enemy types with more vibrant colors, no red or yellow dots
@@ -1860,31 +2308,22 @@ class GameScreen:
         """Create a bullet fired by an enemy."""
         try:
             # Create enemy bullet (blue instead of red)
-            bullet = self.canvas.create_rectangle(
-                x - 2, y, x + 2, y + 10,
-                fill="#6666FF",  # Blue color (was red)
-                outline="#99AAFF",  # Lighter blue outline (was light red)
-                tags=["enemy_bullet"]
-            )
+            bullet = self.create_enemy_bullet_item(x - 2, y)
             
             # Add slight random angle to bullet trajectory
-            angle = random.uniform(-0.2, 0.2)  # Small random angle
+            angle = self.rng.uniform(-0.2, 0.2)  # Small random angle
             speed = self.enemy_bullet_speed
             dx = math.sin(angle) * speed
             dy = math.cos(angle) * speed
             
             # Store bullet with its velocity components
-            self.enemy_bullets.append({
-                "id": bullet,
-                "dx": dx,
-                "dy": dy
-            })
+            self.enemy_bullets.append(Bullet(bullet, dx, dy))
             
             # Play sound effect
             self.play_sound("enemy_shoot")
             return True
         except Exception as e:
-            print(f"Error creating enemy bullet: {e}")
+            log.error("Error creating enemy bullet: %s", e)
             return False
 
     def draw_danger_warning(self, enemy_x, enemy_y):
@@ -1916,29 +2355,8 @@ class GameScreen:
             size_range = (2, 5)
             life = 15
             
-        # Create particles
-        for _ in range(count):
-            size = random.randint(*size_range)
-            color = random.choice(colors)
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(1, max_speed)
-            
-            dx = math.cos(angle) * speed
-            dy = math.sin(angle) * speed
-            
-            particle = {
-                'shape': self.canvas.create_oval(
-                    x-size, y-size, x+size, y+size,
-                    fill=color, outline=""
-                ),
-                'dx': dx,
-                'dy': dy,
-                'life': life,
-                'max_life': life,
-                'size': size
-            }
-            
-            self.particles.append(particle)
+        # Create particles (animated by the particle engine each frame)
+        self.particles.emit_random(x, y, count, colors, max_speed, size_range, life)
             
     # Color constants for the rainbow effect
     def get_rainbow_colors(self):
@@ -1955,10 +2373,13 @@ class GameScreen:
         if hasattr(self, 'title_text') and self.title_text:
             # Use blue-based rainbow colors instead of full spectrum with red
             rainbow_colors = self.get_rainbow_colors()
-            current_time = time.time()
+            current_time = self.clock.time()
             color_index = int((current_time * 5) % len(rainbow_colors))
             self.canvas.itemconfig(self.title_text, fill=rainbow_colors[color_index])
             
+        # Animate particles
+        self.particles.update()
+        
         # Implement other special effects as needed 
 
     def _check_condition_and_highlight(self, condition, widget_id):
@@ -1983,9 +2404,8 @@ class GameScreen:
             return False
             
     def play_sound(self, sound_type):
-        """Play sound effects (stub method - would connect to actual sound system)."""
-        # In a real implementation, this would play actual sounds
-        print(f"Playing sound: {sound_type}")
+        """Queue a sound effect for the mixer thread (rate-limited, never blocks)."""
+        self.sound.play(sound_type)
         
     def _pulse_warning(self, warning_id, pulse_count):
         """Pulse a warning message."""
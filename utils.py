@@ -3,6 +3,7 @@
 # Helper functions for collision detection, bullet cooldown, etc.
 
 import math
+import threading
 import time
 
 def check_collision(obj1, obj2):
@@ -137,4 +138,67 @@ def get_elapsed_time_formatted(start_time):
     elapsed = time.time() - start_time
     minutes = int(elapsed // 60)
     seconds = int(elapsed % 60)
-    return f"{minutes:02d}:{seconds:02d}" 
\ No newline at end of file
+    return f"{minutes:02d}:{seconds:02d}"
+
+class BackgroundTask:
+    """
+    Runs a function on a daemon thread so slow setup work can happen while
+    the UI keeps animating.
+    
+    Example usage:
+        task = BackgroundTask(open_database)
+        task.start()
+        # ... later, when the result is actually needed:
+        db = task.result()  # Waits if the work hasn't finished yet
+    """
+    def __init__(self, function, name=None):
+        """
+        Initialize the task.
+        
+        Args:
+            function: Callable taking no arguments
+            name (str): Thread name, for debugging
+        """
+        self.function = function
+        self.name = name
+        self._thread = None
+        self._done = False
+        self._value = None
+        self._error = None
+    
+    def start(self):
+        """Start running the function in the background (no-op if already started)."""
+        if self._thread is None and not self._done:
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+        return self
+    
+    def _run(self):
+        try:
+            self._value = self.function()
+        except Exception as e:
+            self._error = e
+        self._done = True
+    
+    def done(self):
+        """Return True once the function has finished (or failed)."""
+        return self._done
+    
+    def result(self):
+        """
+        Return the function's result, waiting for it if needed.
+        
+        If the task was never started, the function runs on the calling thread.
+        Exceptions raised by the function are re-raised here.
+        
+        Returns:
+            Whatever the function returned
+        """
+        if self._thread is None and not self._done:
+            self._run()
+        elif self._thread is not None:
+            self._thread.join()
+        
+        if self._error is not None:
+            raise self._error
+        return self._value